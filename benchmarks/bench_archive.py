@@ -0,0 +1,84 @@
+"""Benchmark: SQLite vs. memory-mapped archive range reads of tick buckets.
+
+Fills a temporary database with a year of 1m BTC buckets, compacts them into
+the archive, and times reading the closes for the last N days both ways.
+
+Usage:
+    python benchmarks/bench_archive.py [--days 30 365] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+from crypto_price_tracker import db
+from crypto_price_tracker.tick_archive import compact, read_archive
+from crypto_price_tracker.ticks_db import get_tick_buckets
+
+MINUTE = 60_000
+DAY = 86_400_000
+T0 = 20_000 * DAY  # a UTC midnight
+
+
+def fill(db_path: Path, days: int) -> None:
+    rng = np.random.default_rng(42)
+    timestamps = T0 + np.arange(days * DAY // MINUTE, dtype=np.int64) * MINUTE
+    closes = 50_000.0 + np.cumsum(rng.normal(0, 10, len(timestamps)))
+    with db.connection(db_path) as conn:
+        with conn:
+            conn.executemany(
+                "INSERT INTO tick_buckets VALUES ('BTC', 'bitvavo', '1m', ?, ?, ?, ?, ?, 1e6, 1)",
+                ((int(t), c, c, c, c) for t, c in zip(timestamps, closes.tolist())),
+            )
+
+
+def best_of(fn: Callable[[], object], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, nargs="+", default=[30, 365])
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (default: 3)")
+    args = parser.parse_args()
+
+    total_days = max(args.days)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        fill(db_path, total_days)
+        compact(now=T0 + total_days * DAY, db_path=db_path)
+        end = T0 + total_days * DAY - 1
+
+        print(f"{'days':>6}  {'buckets':>9}  {'sqlite':>10}  {'archive':>10}  {'speedup':>8}")
+        for days in args.days:
+            start = end + 1 - days * DAY
+
+            def from_sqlite():
+                return get_tick_buckets("BTC", "bitvavo", "1m", start=start, end=end, limit=None, db_path=db_path).close
+
+            def from_archive():
+                return read_archive("BTC", "bitvavo", "1m", start=start, end=end, db_path=db_path).close
+
+            assert np.array_equal(from_sqlite(), from_archive())
+            t_sqlite = best_of(from_sqlite, args.repeat)
+            t_archive = best_of(from_archive, args.repeat)
+            print(
+                f"{days:>6}  {len(from_archive()):>9,}  {t_sqlite * 1e3:>8.2f}ms  "
+                f"{t_archive * 1e3:>8.2f}ms  {t_sqlite / t_archive:>7.0f}x"
+            )
+        db.close_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Benchmark: object vs. columnar portfolio aggregation.
+
+Compares ``aggregate_portfolio`` (grouping Holding objects) with
+``aggregate_portfolio_columns`` (bincount over ``HoldingColumns``) on
+synthetic portfolios, and checks both produce the same summary.
+
+Usage:
+    python benchmarks/bench_portfolio.py [--sizes 1000 100000 1000000] [--symbols 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Callable
+
+from crypto_price_tracker.models import CoinData, Holding, HoldingColumns
+from crypto_price_tracker.portfolio import aggregate_portfolio, aggregate_portfolio_columns
+
+
+def make_holdings(n: int, num_symbols: int, seed: int = 42) -> list[Holding]:
+    rng = random.Random(seed)
+    symbols = [f"C{i:04d}" for i in range(num_symbols)]
+    return [
+        Holding(
+            id=i + 1,
+            symbol=rng.choice(symbols),
+            amount=rng.uniform(0.01, 100.0),
+            buy_price=rng.uniform(0.1, 50000.0),
+            buy_date="2026-01-01",
+        )
+        for i in range(n)
+    ]
+
+
+def make_prices(num_symbols: int, seed: int = 7) -> dict[str, CoinData]:
+    """Prices for 90% of the symbols, so both priced and unpriced rows are exercised."""
+    rng = random.Random(seed)
+    return {
+        f"C{i:04d}": CoinData(f"C{i:04d}", f"Coin {i}", rng.uniform(0.1, 60000.0), 0.0, 0.0, 0.0)
+        for i in range(num_symbols)
+        if i % 10
+    }
+
+
+def best_of(fn: Callable[[], object], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--symbols", type=int, default=200, help="Distinct symbols (default: 200)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (default: 3)")
+    args = parser.parse_args()
+
+    prices = make_prices(args.symbols)
+    print(f"{'lots':>10}  {'objects':>10}  {'columns':>10}  {'+ build':>10}  {'speedup':>8}")
+    for n in args.sizes:
+        holdings = make_holdings(n, args.symbols)
+        columns = HoldingColumns.from_holdings(holdings)
+
+        expected = aggregate_portfolio(holdings, prices)
+        actual = aggregate_portfolio_columns(columns, prices)
+        assert [r.symbol for r in actual.rows] == [r.symbol for r in expected.rows]
+        assert abs(actual.total_value - expected.total_value) <= 0.01 * len(expected.rows)
+
+        t_objects = best_of(lambda: aggregate_portfolio(holdings, prices), args.repeat)
+        t_columns = best_of(lambda: aggregate_portfolio_columns(columns, prices), args.repeat)
+        t_build = best_of(lambda: HoldingColumns.from_holdings(holdings), args.repeat)
+        print(
+            f"{n:>10,}  {t_objects * 1e3:>8.2f}ms  {t_columns * 1e3:>8.2f}ms  "
+            f"{t_build * 1e3:>8.2f}ms  {t_objects / t_columns:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
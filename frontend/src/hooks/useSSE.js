@@ -1,18 +1,50 @@
 import { useEffect, useRef, useState, useCallback } from 'react';
 
+// Patch a full `prices` payload with a `delta` event (see PriceTick.delta_frame)
+function applyDelta(data, delta) {
+  const bySymbol = new Map(data.coins.map((coin) => [coin.symbol, coin]));
+  for (const symbol of delta.removed ?? []) {
+    bySymbol.delete(symbol);
+  }
+  for (const [symbol, fields] of Object.entries(delta.coins)) {
+    bySymbol.set(symbol, { ...bySymbol.get(symbol), ...fields });
+  }
+  const order = delta.order ?? data.coins.map((coin) => coin.symbol).filter((symbol) => bySymbol.has(symbol));
+  return {
+    coins: order.map((symbol) => bySymbol.get(symbol)),
+    triggered_alerts: delta.triggered_alerts,
+    exchange: delta.exchange,
+  };
+}
+
 export function useSSE(url) {
   const [data, setData] = useState(null);
   const [connected, setConnected] = useState(false);
   const esRef = useRef(null);
+  const seqRef = useRef(null);
 
   const connect = useCallback(() => {
     const es = new EventSource(url);
     esRef.current = es;
+    seqRef.current = null;
 
     es.addEventListener('prices', (event) => {
+      seqRef.current = Number(event.lastEventId);
       setData(JSON.parse(event.data));
     });
 
+    es.addEventListener('delta', (event) => {
+      const delta = JSON.parse(event.data);
+      if (delta.base !== seqRef.current) {
+        // Missed an event: reconnect, which starts with a full keyframe
+        es.close();
+        connect();
+        return;
+      }
+      seqRef.current = Number(event.lastEventId);
+      setData((prev) => applyDelta(prev, delta));
+    });
+
     es.onopen = () => setConnected(true);
 
     es.onerror = () => {
@@ -28,9 +60,9 @@ export function useSSE(url) {
   }, [url]);
 
   useEffect(() => {
-    const es = connect();
+    connect();
     return () => {
-      es.close();
+      esRef.current?.close();
       esRef.current = null;
     };
   }, [connect]);
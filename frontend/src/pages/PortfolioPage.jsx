@@ -5,6 +5,21 @@ import AddHoldingForm from '../components/AddHoldingForm';
 import DownloadReport from '../components/DownloadReport';
 import PortfolioTable from '../components/PortfolioTable';
 
+// Same order as the server: priced rows by value desc, then unpriced by cost desc
+function compareRows(a, b) {
+  const aPriced = a.current_value !== null;
+  const bPriced = b.current_value !== null;
+  if (aPriced !== bPriced) return aPriced ? -1 : 1;
+  return aPriced ? b.current_value - a.current_value : b.total_cost - a.total_cost;
+}
+
+// A delta carries fresh totals and only the rows that moved
+function applyDelta(portfolio, delta) {
+  const changed = new Map(delta.rows.map((row) => [row.symbol, row]));
+  const rows = portfolio.rows.map((row) => changed.get(row.symbol) ?? row).sort(compareRows);
+  return { ...delta, rows };
+}
+
 function PortfolioPage() {
   const api = useApi();
   const [portfolio, setPortfolio] = useState({ rows: [], total_value: 0, total_cost: 0, total_pnl_eur: 0, total_pnl_pct: 0 });
@@ -24,6 +39,20 @@ function PortfolioPage() {
     loadPortfolio();
   }, [loadPortfolio]);
 
+  // Live valuations; a (re)connect always starts with a full snapshot
+  useEffect(() => {
+    const es = new EventSource('/api/portfolio/stream');
+    es.addEventListener('snapshot', (event) => {
+      setPortfolio(JSON.parse(event.data));
+      setLoading(false);
+    });
+    es.addEventListener('delta', (event) => {
+      const delta = JSON.parse(event.data);
+      setPortfolio((prev) => applyDelta(prev, delta));
+    });
+    return () => es.close();
+  }, []);
+
   if (loading) {
     return <p className="text-text-muted text-sm">Loading portfolio...</p>;
   }
@@ -10,7 +10,7 @@ import { ErrorBoundary } from '../components/ErrorBoundary';
 let toastIdCounter = 0;
 
 function PricesPage({ exchange }) {
-  const sseUrl = `/api/prices/stream?exchange=${exchange}`;
+  const sseUrl = `/api/prices/stream?exchange=${exchange}&delta=true`;
   const { data: sseData } = useSSE(sseUrl);
   const [prices, setPrices] = useState(null);
   const [lastUpdate, setLastUpdate] = useState(null);
@@ -1,29 +1,149 @@
 """Alert checking service.
 
-Contains the pure alert-checking function.  It does NOT touch the database —
-it takes a coins list and active alerts list, and returns which alerts
-triggered.  The caller is responsible for calling ``mark_triggered()`` on
-each returned alert.
+Contains the pure alert-checking function and the in-memory ``AlertIndex``
+it matches against.  Neither touches the database — ``check_alerts`` takes a
+coins list and active alerts (a list or an index), and returns which alerts
+triggered.  The caller is responsible for marking the returned alerts
+(``alerts_db.mark_triggered_many()``).
+
+The index keeps, per symbol, the "above" thresholds in ascending order and
+the "below" thresholds in descending order, so a price triggers a prefix of
+each list that ``bisect`` finds in O(log n + k).  ``match`` is safe to call
+while another thread adds or discards alerts (see ``_ThresholdList``).
 """
 
 from __future__ import annotations
 
+from bisect import bisect_left, bisect_right
+
 from crypto_price_tracker.models import CoinData, PriceAlert
 
 
+class _ThresholdList:
+    """Alerts for one symbol and direction, sorted by a numeric key.
+
+    Keys are the target prices for "above" alerts and the negated target
+    prices for "below" alerts, so in both cases the alerts a price triggers
+    are the ones whose key is at most the (possibly negated) price.
+
+    The shared index is updated under a lock but matched without one, so
+    the lists are copy-on-write: a writer builds new lists and swaps the
+    ``(keys, alerts)`` pair in with one assignment, and a reader always sees
+    a consistent pair.
+    """
+
+    __slots__ = ("_entries",)
+
+    def __init__(self, pairs: list[tuple[float, PriceAlert]] | None = None) -> None:
+        pairs = sorted(pairs or (), key=lambda pair: pair[0])
+        self._entries: tuple[list[float], list[PriceAlert]] = (
+            [key for key, _ in pairs],
+            [alert for _, alert in pairs],
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries[0])
+
+    def insert(self, key: float, alert: PriceAlert) -> None:
+        keys, alerts = self._entries
+        pos = bisect_right(keys, key)
+        self._entries = (keys[:pos] + [key] + keys[pos:], alerts[:pos] + [alert] + alerts[pos:])
+
+    def remove(self, key: float, alert_id: int) -> None:
+        keys, alerts = self._entries
+        pos = bisect_left(keys, key)
+        while alerts[pos].id != alert_id:
+            pos += 1
+        self._entries = (keys[:pos] + keys[pos + 1:], alerts[:pos] + alerts[pos + 1:])
+
+    def triggered_by(self, key: float) -> list[PriceAlert]:
+        keys, alerts = self._entries
+        return alerts[:bisect_right(keys, key)]
+
+
+class AlertIndex:
+    """In-memory index of active alerts keyed by symbol.
+
+    Usage:
+        index = AlertIndex(get_active_alerts())
+        triggered = index.match(coins)
+        for alert in triggered:
+            index.discard(alert.id)
+    """
+
+    def __init__(self, alerts: list[PriceAlert] | None = None) -> None:
+        self._by_id: dict[int, PriceAlert] = {alert.id: alert for alert in alerts or ()}
+        above: dict[str, list[tuple[float, PriceAlert]]] = {}
+        below: dict[str, list[tuple[float, PriceAlert]]] = {}
+        for alert in self._by_id.values():
+            if alert.direction == "above":
+                above.setdefault(alert.symbol, []).append((alert.target_price, alert))
+            else:
+                below.setdefault(alert.symbol, []).append((-alert.target_price, alert))
+        self._above = {symbol: _ThresholdList(pairs) for symbol, pairs in above.items()}
+        self._below = {symbol: _ThresholdList(pairs) for symbol, pairs in below.items()}
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __contains__(self, alert_id: int) -> bool:
+        return alert_id in self._by_id
+
+    def fingerprint(self) -> tuple[int, int]:
+        """Return ``(count, max id)`` of the indexed alerts.
+
+        With AUTOINCREMENT IDs, any insert raises the max ID and any delete
+        or trigger lowers the count, so comparing this against the database
+        detects changes the index has not seen.
+        """
+        return len(self._by_id), max(self._by_id, default=0)
+
+    def add(self, alert: PriceAlert) -> None:
+        """Index an active alert (replacing any alert with the same ID)."""
+        self.discard(alert.id)
+        if alert.direction == "above":
+            self._above.setdefault(alert.symbol, _ThresholdList()).insert(alert.target_price, alert)
+        else:
+            self._below.setdefault(alert.symbol, _ThresholdList()).insert(-alert.target_price, alert)
+        self._by_id[alert.id] = alert
+
+    def discard(self, alert_id: int) -> PriceAlert | None:
+        """Remove an alert by ID if indexed.  Return the removed alert."""
+        alert = self._by_id.pop(alert_id, None)
+        if alert is None:
+            return None
+        if alert.direction == "above":
+            lists, key = self._above, alert.target_price
+        else:
+            lists, key = self._below, -alert.target_price
+        thresholds = lists[alert.symbol]
+        thresholds.remove(key, alert_id)
+        if not thresholds:
+            del lists[alert.symbol]
+        return alert
+
+    def match(self, coins: list[CoinData]) -> list[PriceAlert]:
+        """Return the alerts triggered by *coins*' prices, ordered by alert ID."""
+        triggered: dict[int, PriceAlert] = {}
+        for coin in coins:
+            above = self._above.get(coin.symbol)
+            if above is not None:
+                triggered.update((a.id, a) for a in above.triggered_by(coin.price))
+            below = self._below.get(coin.symbol)
+            if below is not None:
+                triggered.update((a.id, a) for a in below.triggered_by(-coin.price))
+        return [triggered[alert_id] for alert_id in sorted(triggered)]
+
+
 def check_alerts(
     coins: list[CoinData],
-    active_alerts: list[PriceAlert],
+    active_alerts: AlertIndex | list[PriceAlert],
 ) -> list[PriceAlert]:
-    """Check active alerts against current prices.  Return those that triggered."""
-    prices = {c.symbol: c.price for c in coins}
-    triggered = []
-    for alert in active_alerts:
-        current_price = prices.get(alert.symbol)
-        if current_price is None:
-            continue
-        if alert.direction == "above" and current_price >= alert.target_price:
-            triggered.append(alert)
-        elif alert.direction == "below" and current_price <= alert.target_price:
-            triggered.append(alert)
-    return triggered
+    """Check active alerts against current prices.  Return those that triggered.
+
+    Pass a maintained ``AlertIndex`` (see ``alerts_db.get_alert_index``) to
+    avoid re-indexing the active alerts on every call.
+    """
+    if not isinstance(active_alerts, AlertIndex):
+        active_alerts = AlertIndex(active_alerts)
+    return active_alerts.match(coins)
@@ -3,16 +3,28 @@
 Every public function accepts an optional ``db_path`` parameter so tests can
 pass a temporary file path.  When *None*, the default path is resolved via
 ``portfolio_db._get_default_db_path()`` (same DB file as portfolio holdings).
+Queries run on the calling thread's pooled connection from ``db``.
+
+``get_alert_index`` returns a per-database ``AlertIndex`` of the active
+alerts.  It is loaded once and then updated incrementally by ``add_alert``,
+``remove_alert`` and ``mark_triggered``.  Writes made by another process
+(e.g. ``crypto alert add`` while the web server runs) change the
+``(count, max id)`` fingerprint of the active rows and trigger a reload.
 """
 
 from __future__ import annotations
 
 import sqlite3
+import threading
+from collections.abc import Iterable
 from datetime import datetime
 from pathlib import Path
 
+from crypto_price_tracker import db
+from crypto_price_tracker.alerts import AlertIndex
 from crypto_price_tracker.models import PriceAlert
-from crypto_price_tracker import portfolio_db
+
+_MAX_SQL_VARIABLES = 500  # IDs bound per UPDATE statement
 
 
 # ---------------------------------------------------------------------------
@@ -25,21 +37,11 @@ def _alert_factory(cursor: sqlite3.Cursor, row: tuple) -> PriceAlert:
     return PriceAlert(**dict(zip(names, row)))
 
 
-def _ensure_alert_schema(conn: sqlite3.Connection) -> None:
-    """Create the alerts table if it does not exist."""
-    conn.execute(
-        """
-        CREATE TABLE IF NOT EXISTS alerts (
-            id            INTEGER PRIMARY KEY AUTOINCREMENT,
-            symbol        TEXT NOT NULL,
-            target_price  REAL NOT NULL CHECK(target_price > 0),
-            direction     TEXT NOT NULL CHECK(direction IN ('above', 'below')),
-            status        TEXT NOT NULL DEFAULT 'active' CHECK(status IN ('active', 'triggered')),
-            created_at    TEXT NOT NULL,
-            triggered_at  TEXT
-        )
-        """
-    )
+def _active_fingerprint(conn: sqlite3.Connection) -> tuple[int, int]:
+    """Return ``(count, max id)`` of the active alerts (see ``AlertIndex.fingerprint``)."""
+    cursor = conn.execute("SELECT COUNT(*), COALESCE(MAX(id), 0) FROM alerts WHERE status = 'active'")
+    cursor.row_factory = None
+    return tuple(cursor.fetchone())
 
 
 # ---------------------------------------------------------------------------
@@ -47,14 +49,56 @@ def _ensure_alert_schema(conn: sqlite3.Connection) -> None:
 # ---------------------------------------------------------------------------
 
 def get_alert_connection(db_path: Path | None = None) -> sqlite3.Connection:
-    """Open a connection with WAL mode, foreign keys, and alert schema check."""
-    path = db_path or portfolio_db._get_default_db_path()
-    conn = sqlite3.connect(str(path))
-    conn.execute("PRAGMA journal_mode=WAL")
-    conn.execute("PRAGMA foreign_keys=ON")
-    conn.row_factory = _alert_factory
-    _ensure_alert_schema(conn)
-    return conn
+    """Open a standalone connection with WAL mode, foreign keys, and migrated schema.
+
+    The functions below use the shared pooled connection instead (see ``db``).
+    """
+    return db.connect(db_path, _alert_factory)
+
+
+# ---------------------------------------------------------------------------
+# Active alert index
+# ---------------------------------------------------------------------------
+
+_index_lock = threading.Lock()
+_indexes: dict[str, AlertIndex] = {}
+
+
+def _index_key(db_path: Path | None) -> str:
+    return str(db.resolve_db_path(db_path))
+
+
+def _update_index(db_path: Path | None, apply) -> None:
+    """Apply an in-process change to the cached index, if one is loaded."""
+    with _index_lock:
+        index = _indexes.get(_index_key(db_path))
+        if index is not None:
+            apply(index)
+
+
+def get_alert_index(*, db_path: Path | None = None) -> AlertIndex:
+    """Return the maintained index of active alerts for *db_path*.
+
+    The cached index is reused as long as its ``(count, max id)`` matches the
+    database; otherwise (first use, or writes from another process) it is
+    reloaded.
+    """
+    key = _index_key(db_path)
+    with db.connection(db_path, _alert_factory) as conn:
+        with _index_lock:
+            index = _indexes.get(key)
+            if index is None or index.fingerprint() != _active_fingerprint(conn):
+                index = AlertIndex(
+                    conn.execute("SELECT * FROM alerts WHERE status = 'active'").fetchall()
+                )
+                _indexes[key] = index
+            return index
+
+
+def clear_alert_indexes() -> None:
+    """Drop every cached alert index (they are reloaded on next use)."""
+    with _index_lock:
+        _indexes.clear()
 
 
 # ---------------------------------------------------------------------------
@@ -73,49 +117,40 @@ def add_alert(
         raise ValueError(f"Invalid direction: {direction!r} (must be 'above' or 'below')")
     symbol = symbol.upper()
     created_at = datetime.now().isoformat()
-    conn = get_alert_connection(db_path)
-    try:
+    with db.connection(db_path, _alert_factory) as conn:
         with conn:
             cursor = conn.execute(
                 "INSERT INTO alerts (symbol, target_price, direction, status, created_at) VALUES (?, ?, ?, 'active', ?)",
                 (symbol, target_price, direction, created_at),
             )
-            return cursor.lastrowid
-    finally:
-        conn.close()
+            alert = PriceAlert(cursor.lastrowid, symbol, target_price, direction, "active", created_at, None)
+            _update_index(db_path, lambda index: index.add(alert))
+            return alert.id
 
 
 def get_active_alerts(*, db_path: Path | None = None) -> list[PriceAlert]:
     """Return all active alerts ordered by creation time."""
-    conn = get_alert_connection(db_path)
-    try:
+    with db.connection(db_path, _alert_factory) as conn:
         cursor = conn.execute("SELECT * FROM alerts WHERE status = 'active' ORDER BY created_at")
         return cursor.fetchall()
-    finally:
-        conn.close()
 
 
 def get_all_alerts(*, db_path: Path | None = None) -> list[PriceAlert]:
     """Return all alerts, active first then triggered, ordered by creation time."""
-    conn = get_alert_connection(db_path)
-    try:
+    with db.connection(db_path, _alert_factory) as conn:
         cursor = conn.execute(
             "SELECT * FROM alerts ORDER BY CASE WHEN status = 'active' THEN 0 ELSE 1 END, created_at"
         )
         return cursor.fetchall()
-    finally:
-        conn.close()
 
 
 def remove_alert(alert_id: int, *, db_path: Path | None = None) -> bool:
     """Delete an alert by ID.  Return *True* if a row was deleted."""
-    conn = get_alert_connection(db_path)
-    try:
+    with db.connection(db_path, _alert_factory) as conn:
         with conn:
             cursor = conn.execute("DELETE FROM alerts WHERE id = ?", (alert_id,))
+            _update_index(db_path, lambda index: index.discard(alert_id))
             return cursor.rowcount > 0
-    finally:
-        conn.close()
 
 
 def mark_triggered(alert_id: int, *, db_path: Path | None = None) -> bool:
@@ -124,24 +159,44 @@ def mark_triggered(alert_id: int, *, db_path: Path | None = None) -> bool:
     The ``AND status = 'active'`` guard prevents double-triggering in
     concurrent requests.
     """
-    conn = get_alert_connection(db_path)
-    try:
+    return alert_id in mark_triggered_many([alert_id], db_path=db_path)
+
+
+def mark_triggered_many(alert_ids: Iterable[int], *, db_path: Path | None = None) -> set[int]:
+    """Mark many alerts as triggered in one transaction.  Return the IDs that flipped.
+
+    Like ``mark_triggered``, only active alerts are updated, so an ID missing
+    from the result was already triggered (or deleted) by someone else and
+    should not be announced again.
+    """
+    alert_ids = list(dict.fromkeys(alert_ids))
+    if not alert_ids:
+        return set()
+    triggered_at = datetime.now().isoformat()
+    flipped: set[int] = set()
+    with db.connection(db_path) as conn:
         with conn:
-            cursor = conn.execute(
-                "UPDATE alerts SET status = 'triggered', triggered_at = ? WHERE id = ? AND status = 'active'",
-                (datetime.now().isoformat(), alert_id),
-            )
-            return cursor.rowcount > 0
-    finally:
-        conn.close()
+            for start in range(0, len(alert_ids), _MAX_SQL_VARIABLES):
+                chunk = alert_ids[start:start + _MAX_SQL_VARIABLES]
+                placeholders = ", ".join("?" * len(chunk))
+                cursor = conn.execute(
+                    "UPDATE alerts SET status = 'triggered', triggered_at = ? "
+                    f"WHERE id IN ({placeholders}) AND status = 'active' RETURNING id",
+                    (triggered_at, *chunk),
+                )
+                flipped.update(row[0] for row in cursor.fetchall())
+
+            def discard_all(index: AlertIndex) -> None:
+                for alert_id in alert_ids:
+                    index.discard(alert_id)
+
+            _update_index(db_path, discard_all)
+        return flipped
 
 
 def clear_triggered_alerts(*, db_path: Path | None = None) -> int:
     """Delete all triggered alerts.  Return the number of deleted rows."""
-    conn = get_alert_connection(db_path)
-    try:
+    with db.connection(db_path, _alert_factory) as conn:
         with conn:
             cursor = conn.execute("DELETE FROM alerts WHERE status = 'triggered'")
             return cursor.rowcount
-    finally:
-        conn.close()
@@ -7,16 +7,162 @@ Ranking note: Bitvavo's public API does not provide market cap data. This
 client uses `volumeQuote` (24h EUR trading volume) as a market cap proxy.
 High-volume coins strongly correlate with high-market-cap coins and represent
 the most relevant/liquid assets for a user checking prices.
+
+``BitvavoClient`` is a blocking ``httpx.Client`` wrapper for the CLI and
+threadpool routes; ``AsyncBitvavoClient`` is its ``httpx.AsyncClient``
+counterpart for code running on the event loop.  Both share the same
+response parsing and connection settings: keep-alive pooling, and HTTP/2
+when the optional ``h2`` package is installed.
 """
 
 from __future__ import annotations
 
+import asyncio
+import time
+from collections.abc import Iterable
+from pathlib import Path
+
 import httpx
 
-from crypto_price_tracker.models import Candle, CoinData
+from crypto_price_tracker import candles_db
+from crypto_price_tracker.models import CandleSeries, CoinData
 
 BASE_URL = "https://api.bitvavo.com/v2"
 
+HTTP_TIMEOUT = 10.0
+HTTP_HEADERS = {"User-Agent": "crypto-price-tracker/0.1.0"}
+HTTP_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=60.0)
+
+try:
+    import h2  # noqa: F401 -- only needed so httpx can negotiate HTTP/2
+    HTTP2_ENABLED = True
+except ImportError:
+    HTTP2_ENABLED = False
+
+CANDLE_CONCURRENCY = 8  # default in-flight candle requests for batch fetches
+CANDLE_MAX_ATTEMPTS = 3  # tries per candle request when rate limited (HTTP 429)
+RATE_LIMIT_RESERVE = 20  # pause once Bitvavo reports this little weight left
+RATE_LIMIT_MAX_PAUSE = 60.0  # never sleep longer than this on a single backoff
+
+
+# ---------------------------------------------------------------------------
+# Response parsing (shared by the sync and async clients)
+# ---------------------------------------------------------------------------
+
+def _parse_top_coins(ticker_data: list[dict], assets: dict[str, str]) -> list[CoinData]:
+    """Turn raw /ticker/24h entries into CoinData sorted by EUR volume descending."""
+    coins: list[CoinData] = []
+    for entry in ticker_data:
+        market: str = entry.get("market", "")
+
+        # Only process EUR-denominated pairs
+        if not market.endswith("-EUR"):
+            continue
+
+        symbol = market.split("-")[0]
+
+        raw_last = entry.get("last", "0") or "0"
+        raw_open = entry.get("open", "0") or "0"
+        raw_volume = entry.get("volume", "0") or "0"
+        raw_volume_quote = entry.get("volumeQuote", "0") or "0"
+
+        # Skip entries with zero or missing open price to avoid ZeroDivisionError
+        if not raw_open or raw_open == "0":
+            continue
+
+        last = float(raw_last)
+        open_price = float(raw_open)
+        volume = float(raw_volume)
+        volume_eur = float(raw_volume_quote)
+
+        change_24h = ((last - open_price) / open_price) * 100
+
+        name = assets.get(symbol, symbol)
+
+        coins.append(
+            CoinData(
+                symbol=symbol,
+                name=name,
+                price=last,
+                change_24h=change_24h,
+                volume=volume,
+                volume_eur=volume_eur,
+            )
+        )
+
+    # Sort by 24h EUR volume descending — highest volume = most relevant coins
+    coins.sort(key=lambda c: c.volume_eur, reverse=True)
+    return coins
+
+
+def _candle_params(interval: str, limit: int, start: int | None) -> dict[str, str | int]:
+    """Build query parameters for the /{market}/candles endpoint."""
+    params: dict[str, str | int] = {"interval": interval, "limit": limit}
+    if start is not None:
+        params["start"] = start
+    return params
+
+
+def _parse_candles(raw: list[list]) -> CandleSeries:
+    """Turn raw newest-first candle arrays into a chronological CandleSeries."""
+    return CandleSeries.from_rows(raw, reverse=True)
+
+
+class RateLimitGate:
+    """Delays requests when Bitvavo reports the rate-limit budget is spent.
+
+    Bitvavo returns the remaining request weight for the current window in
+    ``bitvavo-ratelimit-remaining`` and the window reset time (epoch ms) in
+    ``bitvavo-ratelimit-resetat``.  When the budget drops to ``reserve`` or a
+    429 is returned, further requests wait until the window resets (or for
+    ``Retry-After`` seconds when no reset time is given).
+    """
+
+    def __init__(self, reserve: int = RATE_LIMIT_RESERVE) -> None:
+        self.reserve = reserve
+        self._resume_at = 0.0  # wall-clock seconds
+
+    @property
+    def delay(self) -> float:
+        """Seconds to wait before the next request may be sent."""
+        return max(0.0, self._resume_at - time.time())
+
+    async def wait(self) -> None:
+        """Sleep until the rate-limit window allows another request."""
+        delay = self.delay
+        if delay:
+            await asyncio.sleep(delay)
+
+    def observe(self, response: httpx.Response) -> None:
+        """Update the gate from a response's rate-limit headers.
+
+        A malformed remaining-weight header is ignored; a malformed reset
+        time falls back to a 1s pause.
+        """
+        headers = response.headers
+        try:
+            remaining = int(headers["bitvavo-ratelimit-remaining"])
+        except (KeyError, ValueError):
+            remaining = None
+        exhausted = response.status_code == 429 or (
+            remaining is not None and remaining <= self.reserve
+        )
+        if not exhausted:
+            return
+        now = time.time()
+        reset_at = headers.get("bitvavo-ratelimit-resetat")
+        retry_after = headers.get("retry-after")
+        try:
+            if reset_at:
+                resume = int(reset_at) / 1000
+            elif retry_after:
+                resume = now + float(retry_after)
+            else:
+                resume = now + 1.0
+        except ValueError:
+            resume = now + 1.0
+        self._resume_at = max(self._resume_at, min(resume, now + RATE_LIMIT_MAX_PAUSE))
+
 
 class BitvavoClient:
     """Client for the Bitvavo public REST API.
@@ -30,14 +176,16 @@ class BitvavoClient:
             coins = client.get_top_coins()
 
     Args:
-        top_n: Number of top coins to return (default 20).
+        top_n: Number of top coins to return (default 20, *None* for all).
     """
 
-    def __init__(self, top_n: int = 20) -> None:
+    def __init__(self, top_n: int | None = 20) -> None:
         self.top_n = top_n
         self._client = httpx.Client(
-            timeout=10.0,
-            headers={"User-Agent": "crypto-price-tracker/0.1.0"},
+            timeout=HTTP_TIMEOUT,
+            headers=HTTP_HEADERS,
+            limits=HTTP_LIMITS,
+            http2=HTTP2_ENABLED,
         )
 
     @property
@@ -51,6 +199,10 @@ class BitvavoClient:
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
         self._client.__exit__(exc_type, exc_val, exc_tb)
 
+    def close(self) -> None:
+        """Close the underlying connection pool."""
+        self._client.close()
+
     def _fetch_assets(self) -> dict[str, str]:
         """Fetch asset metadata and return a symbol-to-name mapping.
 
@@ -91,100 +243,247 @@ class BitvavoClient:
         """
         ticker_data = self._fetch_ticker_24h()
         assets = self._fetch_assets()
+        coins = _parse_top_coins(ticker_data, assets)
+        limit = top_n if top_n is not None else self.top_n
+        return coins[:limit]
 
-        coins: list[CoinData] = []
-        for entry in ticker_data:
-            market: str = entry.get("market", "")
+    def get_candles(
+        self,
+        market: str,
+        interval: str = "4h",
+        limit: int = 42,
+        start: int | None = None,
+    ) -> CandleSeries:
+        """Fetch OHLCV candles for a market, returned in chronological order.
 
-            # Only process EUR-denominated pairs
-            if not market.endswith("-EUR"):
-                continue
+        Args:
+            market:   Market pair (e.g. "BTC-EUR").
+            interval: Candle interval (e.g. "4h", "1d").
+            limit:    Number of candles to return.
+            start:    Only return candles at or after this Unix ms timestamp.
 
-            symbol = market.split("-")[0]
+        Returns:
+            CandleSeries sorted oldest-first (chronological).
 
-            raw_last = entry.get("last", "0") or "0"
-            raw_open = entry.get("open", "0") or "0"
-            raw_volume = entry.get("volume", "0") or "0"
-            raw_volume_quote = entry.get("volumeQuote", "0") or "0"
+        Raises:
+            httpx.HTTPStatusError: on non-2xx HTTP responses (e.g. 400 for invalid market).
+        """
+        response = self._client.get(
+            f"{BASE_URL}/{market}/candles",
+            params=_candle_params(interval, limit, start),
+        )
+        response.raise_for_status()
+        return _parse_candles(response.json())
 
-            # Skip entries with zero or missing open price to avoid ZeroDivisionError
-            if not raw_open or raw_open == "0":
-                continue
 
-            last = float(raw_last)
-            open_price = float(raw_open)
-            volume = float(raw_volume)
-            volume_eur = float(raw_volume_quote)
+class AsyncBitvavoClient:
+    """Async counterpart of :class:`BitvavoClient` built on ``httpx.AsyncClient``.
 
-            change_24h = ((last - open_price) / open_price) * 100
+    Ticker and asset metadata are fetched concurrently.  Candle requests
+    honour Bitvavo's rate-limit headers through a shared ``RateLimitGate``.
 
-            name = assets.get(symbol, symbol)
+    Usage:
+        async with AsyncBitvavoClient(top_n=20) as client:
+            coins = await client.get_top_coins()
 
-            coins.append(
-                CoinData(
-                    symbol=symbol,
-                    name=name,
-                    price=last,
-                    change_24h=change_24h,
-                    volume=volume,
-                    volume_eur=volume_eur,
-                )
-            )
+    Args:
+        top_n: Number of top coins to return (default 20, *None* for all).
+    """
 
-        # Sort by 24h EUR volume descending — highest volume = most relevant coins
-        coins.sort(key=lambda c: c.volume_eur, reverse=True)
+    def __init__(self, top_n: int | None = 20) -> None:
+        self.top_n = top_n
+        self._client = httpx.AsyncClient(
+            timeout=HTTP_TIMEOUT,
+            headers=HTTP_HEADERS,
+            limits=HTTP_LIMITS,
+            http2=HTTP2_ENABLED,
+        )
+        self.rate_limit = RateLimitGate()
 
-        limit = top_n if top_n is not None else self.top_n
-        return coins[:limit]
+    @property
+    def name(self) -> str:
+        return "Bitvavo"
 
-    def get_candles(self, market: str, interval: str = "4h", limit: int = 42) -> list[Candle]:
-        """Fetch OHLCV candles for a market, returned in chronological order.
+    async def __aenter__(self) -> "AsyncBitvavoClient":
+        await self._client.__aenter__()
+        return self
 
-        Args:
-            market:   Market pair (e.g. "BTC-EUR").
-            interval: Candle interval (e.g. "4h", "1d").
-            limit:    Number of candles to return.
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self._client.__aexit__(exc_type, exc_val, exc_tb)
+
+    async def aclose(self) -> None:
+        """Close the underlying connection pool."""
+        await self._client.aclose()
+
+    async def _fetch_assets(self) -> dict[str, str]:
+        """Fetch asset metadata and return a symbol-to-name mapping."""
+        response = await self._client.get(f"{BASE_URL}/assets")
+        response.raise_for_status()
+        assets: list[dict] = response.json()
+        return {asset["symbol"]: asset["name"] for asset in assets}
+
+    async def _fetch_ticker_24h(self) -> list[dict]:
+        """Fetch 24h ticker data for all markets."""
+        response = await self._client.get(f"{BASE_URL}/ticker/24h")
+        response.raise_for_status()
+        return response.json()
+
+    async def get_top_coins(self, top_n: int | None = None) -> list[CoinData]:
+        """Return the top N coins by 24h EUR trading volume.
 
         Returns:
-            List of Candle instances sorted oldest-first (chronological).
+            List of CoinData instances, sorted by volume_eur descending,
+            length <= self.top_n.
+        """
+        ticker_data, assets = await asyncio.gather(
+            self._fetch_ticker_24h(),
+            self._fetch_assets(),
+        )
+        coins = _parse_top_coins(ticker_data, assets)
+        limit = top_n if top_n is not None else self.top_n
+        return coins[:limit]
+
+    async def get_candles(
+        self,
+        market: str,
+        interval: str = "4h",
+        limit: int = 42,
+        start: int | None = None,
+    ) -> CandleSeries:
+        """Fetch OHLCV candles for a market, returned in chronological order.
 
         Raises:
             httpx.HTTPStatusError: on non-2xx HTTP responses (e.g. 400 for invalid market).
         """
-        response = self._client.get(
+        await self.rate_limit.wait()
+        response = await self._client.get(
             f"{BASE_URL}/{market}/candles",
-            params={"interval": interval, "limit": limit},
+            params=_candle_params(interval, limit, start),
         )
+        self.rate_limit.observe(response)
         response.raise_for_status()
-        raw: list[list] = response.json()
-        candles = [
-            Candle(
-                timestamp=entry[0],
-                open=float(entry[1]),
-                high=float(entry[2]),
-                low=float(entry[3]),
-                close=float(entry[4]),
-                volume=float(entry[5]),
-            )
-            for entry in raw
-        ]
-        candles.reverse()  # API returns newest-first; we want chronological
-        return candles
+        return _parse_candles(response.json())
 
 
-def get_candles(market: str, interval: str = "4h", limit: int = 42) -> list[Candle]:
-    """Fetch OHLCV candles for a market from Bitvavo.
+def get_candles(
+    market: str,
+    interval: str = "4h",
+    limit: int = 42,
+    *,
+    db_path: Path | None = None,
+) -> CandleSeries:
+    """Fetch OHLCV candles for a market, served from the local candle store.
 
-    Convenience function that opens a client, fetches candles, and closes
-    the connection automatically.
+    Only candles from the newest stored bucket onwards are downloaded (the
+    full *limit* on a cold cache), merged into the store, and the newest
+    *limit* stored candles are returned.  Uses the process-wide pooled
+    Bitvavo client.  If the network is unavailable but history is stored,
+    the stored candles are returned as-is.
 
     Args:
         market:   Market pair (e.g. "BTC-EUR").
         interval: Candle interval (e.g. "4h", "1d").
         limit:    Number of candles to return.
+        db_path:  Optional candle store path (tests).
+
+    Returns:
+        CandleSeries sorted oldest-first (chronological).
+
+    Raises:
+        httpx.HTTPStatusError: on non-2xx HTTP responses (e.g. 400 for invalid market).
+    """
+    from crypto_price_tracker.exchange import client_registry
+
+    start = candles_db.get_refresh_start(market, interval, limit, db_path=db_path)
+    try:
+        fresh = client_registry.get("bitvavo").get_candles(market, interval, limit, start=start)
+    except httpx.TransportError:
+        if start is None:
+            raise
+        fresh = CandleSeries.empty()
+    candles_db.store_candles(market, interval, fresh, db_path=db_path)
+    return candles_db.get_stored_candles(market, interval, limit, db_path=db_path)
+
+
+async def fetch_candles_batch(
+    requests: Iterable[tuple[str, str, int]],
+    *,
+    concurrency: int = CANDLE_CONCURRENCY,
+    client: AsyncBitvavoClient | None = None,
+    starts: dict[tuple[str, str], int | None] | None = None,
+) -> dict[tuple[str, str], CandleSeries]:
+    """Fetch candles for many markets/intervals concurrently.
+
+    At most *concurrency* requests are in flight at once.  Requests that hit
+    Bitvavo's rate limit (HTTP 429) wait for the window to reset and are
+    retried up to ``CANDLE_MAX_ATTEMPTS`` times.  Requests that still fail
+    (invalid market, connection error, timeout) are left out of the result.
+
+    Args:
+        requests:    ``(market, interval, limit)`` tuples, e.g. ("BTC-EUR", "4h", 42).
+        concurrency: Maximum number of simultaneous requests.
+        client:      Async client to use; a temporary one is opened if omitted.
+        starts:      Optional ``(market, interval) -> start`` timestamps (Unix ms)
+                     for incremental tail downloads.
 
     Returns:
-        List of Candle instances sorted oldest-first (chronological).
+        Dict mapping ``(market, interval)`` to chronological candles.
+    """
+    if client is None:
+        async with AsyncBitvavoClient() as own_client:
+            return await fetch_candles_batch(
+                requests, concurrency=concurrency, client=own_client, starts=starts,
+            )
+
+    starts = starts or {}
+    semaphore = asyncio.Semaphore(concurrency)
+    results: dict[tuple[str, str], CandleSeries] = {}
+
+    async def fetch_one(market: str, interval: str, limit: int) -> None:
+        async with semaphore:
+            for _ in range(CANDLE_MAX_ATTEMPTS):
+                try:
+                    results[(market, interval)] = await client.get_candles(
+                        market, interval, limit, start=starts.get((market, interval)),
+                    )
+                    return
+                except httpx.HTTPStatusError as e:
+                    if e.response.status_code != 429:
+                        return
+                except httpx.TransportError:
+                    return
+
+    await asyncio.gather(*(fetch_one(*request) for request in requests))
+    return results
+
+
+def get_candles_batch(
+    requests: Iterable[tuple[str, str, int]],
+    concurrency: int = CANDLE_CONCURRENCY,
+    *,
+    db_path: Path | None = None,
+) -> dict[tuple[str, str], CandleSeries]:
+    """Fetch many candle series concurrently, served from the local candle store.
+
+    Blocking wrapper around :func:`fetch_candles_batch` for the CLI.  Like
+    :func:`get_candles`, each series only downloads its tail when enough
+    history is stored; series that fail to download fall back to whatever
+    is stored and are omitted if nothing is.
     """
-    with BitvavoClient() as client:
-        return client.get_candles(market, interval, limit)
+    requests = list(requests)
+    starts = {
+        (market, interval): candles_db.get_refresh_start(market, interval, limit, db_path=db_path)
+        for market, interval, limit in requests
+    }
+    fetched = asyncio.run(
+        fetch_candles_batch(requests, concurrency=concurrency, starts=starts)
+    )
+    results: dict[tuple[str, str], CandleSeries] = {}
+    for market, interval, limit in requests:
+        key = (market, interval)
+        if key in fetched:
+            candles_db.store_candles(market, interval, fetched[key], db_path=db_path)
+        elif starts[key] is None:
+            continue
+        results[key] = candles_db.get_stored_candles(market, interval, limit, db_path=db_path)
+    return results
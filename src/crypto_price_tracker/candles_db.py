@@ -0,0 +1,118 @@
+"""SQLite storage layer for cached OHLCV candle history.
+
+Candles are keyed by ``(market, interval, timestamp)``, so re-storing an
+overlapping download replaces existing buckets instead of duplicating them.
+This lets callers fetch only the tail of a series (everything from the last
+stored timestamp onwards) and merge it into the stored history, as long as
+the stored history is recent and has no gaps.
+
+Every public function accepts an optional ``db_path`` parameter so tests can
+pass a temporary file path.  When *None*, the default path is resolved via
+``portfolio_db._get_default_db_path()`` (same DB file as portfolio/alerts).
+Queries run on the calling thread's pooled connection from ``db``.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import time
+from collections.abc import Sequence
+from itertools import repeat
+from pathlib import Path
+
+from crypto_price_tracker import db
+from crypto_price_tracker.models import INTERVAL_SECONDS, Candle, CandleSeries
+
+
+# ---------------------------------------------------------------------------
+# Connection management
+# ---------------------------------------------------------------------------
+
+def get_candle_connection(db_path: Path | None = None) -> sqlite3.Connection:
+    """Open a standalone connection with WAL mode, foreign keys, and migrated schema.
+
+    The functions below use the shared pooled connection instead (see ``db``).
+    """
+    return db.connect(db_path)
+
+
+# ---------------------------------------------------------------------------
+# Queries
+# ---------------------------------------------------------------------------
+
+def store_candles(
+    market: str,
+    interval: str,
+    candles: CandleSeries | Sequence[Candle],
+    *,
+    db_path: Path | None = None,
+) -> int:
+    """Insert or replace candles for a market/interval.  Return the row count written.
+
+    Existing buckets with the same timestamp are overwritten, which is how a
+    still-forming newest candle gets updated on the next refresh.
+    """
+    if not candles:
+        return 0
+    series = CandleSeries.from_candles(candles)
+    with db.connection(db_path) as conn:
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO candles "
+                "(market, interval, timestamp, open, high, low, close, volume) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                zip(repeat(market), repeat(interval), *(col.tolist() for col in series.columns())),
+            )
+        return len(series)
+
+
+def get_stored_candles(
+    market: str,
+    interval: str,
+    limit: int,
+    *,
+    db_path: Path | None = None,
+) -> CandleSeries:
+    """Return the newest *limit* stored candles in chronological order."""
+    with db.connection(db_path) as conn:
+        cursor = conn.execute(
+            "SELECT timestamp, open, high, low, close, volume FROM candles "
+            "WHERE market = ? AND interval = ? ORDER BY timestamp DESC LIMIT ?",
+            (market, interval, limit),
+        )
+        return CandleSeries.from_rows(cursor.fetchall(), reverse=True)
+
+
+def get_refresh_start(
+    market: str,
+    interval: str,
+    limit: int,
+    *,
+    now: int | None = None,
+    db_path: Path | None = None,
+) -> int | None:
+    """Return the timestamp to resume downloading from, or *None* for a full fetch.
+
+    Only the tail starting at the newest stored bucket (which may still have
+    been forming) needs fetching when the newest *limit* buckets are all
+    stored and the newest is less than *limit* intervals before *now* (Unix
+    ms, default: the current time).  Otherwise a tail download of *limit*
+    candles could not reach back to the stored history and would leave a gap.
+    """
+    seconds = INTERVAL_SECONDS.get(interval)
+    if seconds is None:
+        return None
+    interval_ms = seconds * 1000
+    now = int(time.time() * 1000) if now is None else now
+    with db.connection(db_path) as conn:
+        (latest,) = conn.execute(
+            "SELECT MAX(timestamp) FROM candles WHERE market = ? AND interval = ?",
+            (market, interval),
+        ).fetchone()
+        if latest is None or latest <= now - limit * interval_ms:
+            return None
+        (count,) = conn.execute(
+            "SELECT COUNT(*) FROM candles WHERE market = ? AND interval = ? AND timestamp >= ?",
+            (market, interval, latest - (limit - 1) * interval_ms),
+        ).fetchone()
+        return latest if count >= limit else None
@@ -9,6 +9,7 @@ Provides three subcommands:
 from __future__ import annotations
 
 import argparse
+import atexit
 import sqlite3
 import sys
 import time
@@ -16,16 +17,18 @@ from datetime import datetime
 
 import httpx
 
+from crypto_price_tracker import db
 from crypto_price_tracker.alerts import check_alerts
 from crypto_price_tracker.alerts_db import (
     add_alert,
     clear_triggered_alerts,
     get_active_alerts,
+    get_alert_index,
     get_all_alerts,
-    mark_triggered,
+    mark_triggered_many,
     remove_alert as remove_alert_db,
 )
-from crypto_price_tracker.api import get_candles
+from crypto_price_tracker.api import CANDLE_CONCURRENCY, get_candles, get_candles_batch
 from crypto_price_tracker.watchlist_db import (
     add_watchlist_entry,
     get_all_watchlist_entries,
@@ -34,13 +37,20 @@ from crypto_price_tracker.watchlist_db import (
     update_watchlist_tags,
     VALID_TAGS,
 )
-from crypto_price_tracker.exchange import get_top_coins_with_fallback
+from crypto_price_tracker.exchange import (
+    ALL_EXCHANGES,
+    client_registry,
+    get_consolidated_coins,
+    get_top_coins_with_fallback,
+)
 from crypto_price_tracker.display import (
     render_alert_banner,
     render_alert_list,
     render_chart_detail,
     render_chart_table,
     render_coin_detail,
+    render_consolidated_table,
+    render_indicator_table,
     render_portfolio_lots,
     render_portfolio_table,
     render_price_table,
@@ -48,12 +58,24 @@ from crypto_price_tracker.display import (
     sparkline,
 )
 from rich.console import Console
+from crypto_price_tracker.indicators import compute_indicators_batch
+from crypto_price_tracker.models import INTERVAL_SECONDS, CandleSeries, PriceAlert
 from crypto_price_tracker.notify import send_summary
-from crypto_price_tracker.portfolio import aggregate_portfolio, export_csv, export_json
+from crypto_price_tracker.portfolio import (
+    IMPORT_BATCH_SIZE,
+    EXPORT_FORMATS,
+    IMPORT_FORMATS,
+    ImportReport,
+    aggregate_rollups,
+    import_holdings,
+    iter_export,
+)
 from crypto_price_tracker.portfolio_db import (
     add_holding,
-    get_all_holdings,
+    add_holdings,
+    get_holding_rollups,
     get_holdings_by_symbol,
+    iter_holdings,
     remove_holding,
     update_holding,
 )
@@ -63,12 +85,22 @@ from crypto_price_tracker.report import (
     generate_report_html,
     html_to_pdf,
 )
+from crypto_price_tracker.tick_archive import compact
+
+
+def _mark_triggered(triggered: list[PriceAlert]) -> list[PriceAlert]:
+    """Mark *triggered* alerts in one batch; keep only those this call flipped."""
+    flipped = mark_triggered_many([a.id for a in triggered])
+    return [a for a in triggered if a.id in flipped]
 
 
 def cmd_prices(args: argparse.Namespace) -> None:
     """Fetch top coins and render a price table, then exit."""
     try:
-        coins, source = get_top_coins_with_fallback(exchange=args.exchange, top_n=args.top)
+        if args.exchange == ALL_EXCHANGES:
+            coins, source = get_consolidated_coins(top_n=args.top)
+        else:
+            coins, source = get_top_coins_with_fallback(exchange=args.exchange, top_n=args.top)
     except (httpx.HTTPStatusError, httpx.ConnectError) as e:
         print(f"Error fetching data: {e}", file=sys.stderr)
         sys.exit(1)
@@ -81,13 +113,14 @@ def cmd_prices(args: argparse.Namespace) -> None:
             return
     # Passive alert checking
     active = get_active_alerts()
-    triggered = check_alerts(coins, active)
-    for alert in triggered:
-        mark_triggered(alert.id)
+    triggered = _mark_triggered(check_alerts(coins, active))
     triggered_symbols = {a.symbol for a in triggered}
     if triggered:
         render_alert_banner(triggered)
-    render_price_table(coins, triggered_symbols=triggered_symbols, source=source)
+    if args.exchange == ALL_EXCHANGES:
+        render_consolidated_table(coins, triggered_symbols=triggered_symbols, source=source)
+    else:
+        render_price_table(coins, triggered_symbols=triggered_symbols, source=source)
 
 
 def cmd_watch(args: argparse.Namespace) -> None:
@@ -103,10 +136,7 @@ def cmd_watch(args: argparse.Namespace) -> None:
                     wl_symbols = get_watchlist_symbols()
                     coins = [c for c in coins if c.symbol in wl_symbols]
                 # Passive alert checking (flash once — mark_triggered prevents repeats)
-                active = get_active_alerts()
-                triggered = check_alerts(coins, active)
-                for alert in triggered:
-                    mark_triggered(alert.id)
+                triggered = _mark_triggered(check_alerts(coins, get_alert_index()))
                 triggered_symbols = {a.symbol for a in triggered}
                 if triggered:
                     render_alert_banner(triggered)
@@ -189,8 +219,8 @@ def cmd_portfolio_edit(args: argparse.Namespace) -> None:
 
 def cmd_portfolio_list(args: argparse.Namespace) -> None:
     """Show aggregated portfolio view with live prices."""
-    holdings = get_all_holdings()
-    if not holdings:
+    rollups = get_holding_rollups()
+    if not rollups:
         print("No holdings in portfolio.")
         return
     # Fetch live prices (best-effort)
@@ -200,7 +230,7 @@ def cmd_portfolio_list(args: argparse.Namespace) -> None:
         prices = {c.symbol: c for c in coins_list}
     except (httpx.HTTPStatusError, httpx.ConnectError) as e:
         print(f"Warning: could not fetch live prices: {e}", file=sys.stderr)
-    summary = aggregate_portfolio(holdings, prices)
+    summary = aggregate_rollups(rollups, prices)
     render_portfolio_table(summary)
 
 
@@ -215,18 +245,52 @@ def cmd_portfolio_lots(args: argparse.Namespace) -> None:
 
 
 def cmd_portfolio_export(args: argparse.Namespace) -> None:
-    """Export holdings to CSV or JSON."""
-    holdings = get_all_holdings()
-    if args.export_format == "json":
-        data = export_json(holdings)
-    else:
-        data = export_csv(holdings)
+    """Export holdings to CSV, JSON or NDJSON, streaming from the database."""
+    chunks = iter_export(iter_holdings(), args.export_format)
     if args.output:
         with open(args.output, "w") as f:
-            f.write(data)
+            f.writelines(chunks)
         print(f"Exported to {args.output}")
     else:
-        print(data, end="")
+        sys.stdout.writelines(chunks)
+
+
+def _import_format(path: str, explicit: str | None) -> str | None:
+    """Return the import format for *path*: *explicit*, else from the extension."""
+    if explicit:
+        return explicit
+    suffix = path.rsplit(".", 1)[-1].lower() if "." in path else ""
+    return {"csv": "csv", "json": "json", "ndjson": "json", "jsonl": "json"}.get(suffix)
+
+
+def cmd_portfolio_import(args: argparse.Namespace) -> None:
+    """Bulk-import holdings from a CSV or JSON file (``-`` reads stdin)."""
+    fmt = _import_format(args.file, args.import_format)
+    if fmt is None:
+        print("Cannot infer the file format; pass --format csv or --format json.", file=sys.stderr)
+        sys.exit(1)
+    console = Console(stderr=True)
+    try:
+        stream = sys.stdin if args.file == "-" else open(args.file, newline="", encoding="utf-8")
+    except OSError as e:
+        print(f"Cannot open {args.file}: {e}", file=sys.stderr)
+        sys.exit(1)
+    with stream, console.status("Importing holdings...") as status:
+
+        def progress(report: ImportReport) -> None:
+            status.update(f"Importing holdings... {report.rows:,} rows read, {report.imported:,} imported")
+
+        report = import_holdings(
+            stream, fmt, add_holdings, batch_size=args.batch_size, on_progress=progress,
+        )
+
+    for error in report.errors:
+        print(f"Row {error.row}: {error.message}", file=sys.stderr)
+    if report.failed > len(report.errors):
+        print(f"... and {report.failed - len(report.errors)} more errors", file=sys.stderr)
+    print(f"Imported {report.imported} holdings ({report.failed} rows rejected)")
+    if report.failed:
+        sys.exit(1)
 
 
 def cmd_alert_add(args: argparse.Namespace) -> None:
@@ -268,9 +332,7 @@ def cmd_alert_check(args: argparse.Namespace) -> None:
     if not active:
         print("No active alerts.")
         sys.exit(0)
-    triggered = check_alerts(coins, active)
-    for alert in triggered:
-        mark_triggered(alert.id)
+    triggered = _mark_triggered(check_alerts(coins, active))
     if triggered:
         render_alert_banner(triggered)
         sys.exit(1)
@@ -346,9 +408,8 @@ def cmd_export(args: argparse.Namespace) -> None:
     except (httpx.HTTPStatusError, httpx.ConnectError) as e:
         print(f"Error fetching data: {e}", file=sys.stderr)
         sys.exit(1)
-    holdings = get_all_holdings()
     prices = {c.symbol: c for c in coins}
-    portfolio = aggregate_portfolio(holdings, prices)
+    portfolio = aggregate_rollups(get_holding_rollups(), prices)
     watchlist = get_all_watchlist_entries()
     alerts = get_all_alerts()
     html = generate_report_html(portfolio, coins, watchlist, alerts)
@@ -370,9 +431,8 @@ def cmd_summary_send(args: argparse.Namespace) -> None:
     except (httpx.HTTPStatusError, httpx.ConnectError) as e:
         print(f"Error fetching data: {e}", file=sys.stderr)
         sys.exit(1)
-    holdings = get_all_holdings()
     prices = {c.symbol: c for c in coins}
-    portfolio = aggregate_portfolio(holdings, prices)
+    portfolio = aggregate_rollups(get_holding_rollups(), prices)
     text = build_summary_text(portfolio)
     html = build_summary_html(portfolio)
     channels = send_summary(text, html)
@@ -413,11 +473,11 @@ def cmd_chart(args: argparse.Namespace) -> None:
         try:
             candles_7d = get_candles(market, interval="4h", limit=42)
         except (httpx.HTTPStatusError, httpx.ConnectError):
-            candles_7d = []
+            candles_7d = CandleSeries.empty()
         try:
             candles_30d = get_candles(market, interval="1d", limit=30)
         except (httpx.HTTPStatusError, httpx.ConnectError):
-            candles_30d = []
+            candles_30d = CandleSeries.empty()
 
         render_chart_detail(match, candles_7d, candles_30d, console=console)
     else:
@@ -430,29 +490,89 @@ def cmd_chart(args: argparse.Namespace) -> None:
             print(f"Error fetching data: {e}", file=sys.stderr)
             sys.exit(1)
 
+        requests = [
+            (f"{coin.symbol}-EUR", interval, limit)
+            for coin in coins
+            for interval, limit in (("4h", 42), ("1d", 30))
+        ]
+        with console.status("Fetching chart data..."):
+            candles = get_candles_batch(requests, concurrency=args.concurrency)
+
         sparklines_7d: dict[str, str] = {}
         sparklines_30d: dict[str, str] = {}
-
-        with console.status("Fetching chart data..."):
-            for coin in coins:
-                market = f"{coin.symbol}-EUR"
-                try:
-                    candles_7d = get_candles(market, interval="4h", limit=42)
-                    candles_30d = get_candles(market, interval="1d", limit=30)
-                except (httpx.HTTPStatusError, httpx.ConnectError):
-                    candles_7d, candles_30d = [], []
-                sparklines_7d[coin.symbol] = sparkline(
-                    [c.close for c in candles_7d]
-                )
-                sparklines_30d[coin.symbol] = sparkline(
-                    [c.close for c in candles_30d]
-                )
+        for coin in coins:
+            market = f"{coin.symbol}-EUR"
+            for interval, sparklines in (("4h", sparklines_7d), ("1d", sparklines_30d)):
+                series = candles.get((market, interval))
+                sparklines[coin.symbol] = sparkline(series.close) if series is not None else ""
 
         render_chart_table(coins, sparklines_7d, sparklines_30d, console=console)
 
 
+def cmd_indicators(args: argparse.Namespace) -> None:
+    """Compute and display technical indicators over candle history.
+
+    If a symbol is provided, show that coin only.  Otherwise, evaluate all
+    top coins, fetching their candle histories in one batch.
+    """
+    console = Console()
+
+    if args.symbol:
+        symbols = [args.symbol.upper()]
+    else:
+        try:
+            coins, _ = get_top_coins_with_fallback(exchange=args.exchange, top_n=args.top)
+        except (httpx.HTTPStatusError, httpx.ConnectError) as e:
+            print(f"Error fetching data: {e}", file=sys.stderr)
+            sys.exit(1)
+        symbols = [coin.symbol for coin in coins]
+
+    requests = [(f"{symbol}-EUR", args.interval, args.limit) for symbol in symbols]
+    with console.status("Fetching candle history..."):
+        candles = get_candles_batch(requests, concurrency=args.concurrency)
+
+    series = {
+        symbol: candles[(f"{symbol}-EUR", args.interval)]
+        for symbol in symbols
+        if (f"{symbol}-EUR", args.interval) in candles
+    }
+    if not series:
+        print("No candle data available.", file=sys.stderr)
+        sys.exit(1)
+
+    render_indicator_table(
+        compute_indicators_batch(series, args.interval), args.interval, console=console,
+    )
+
+
+def cmd_compact(args: argparse.Namespace) -> None:
+    """Archive completed tick history buckets to the memory-mapped archive."""
+    written = compact()
+    print(f"Archived {written} bucket(s)")
+
+
+def _int_range(low: int, high: int | None = None):
+    """Return an argparse ``type`` accepting integers in ``[low, high]``."""
+
+    def parse(value: str) -> int:
+        try:
+            number = int(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid int value: {value!r}") from None
+        if number < low or (high is not None and number > high):
+            bound = f"at least {low}" if high is None else f"between {low} and {high}"
+            raise argparse.ArgumentTypeError(f"must be {bound}, got {number}")
+        return number
+
+    return parse
+
+
 def main() -> None:
     """Entry point -- parse arguments and dispatch to the appropriate command."""
+    atexit.register(client_registry.close)
+    atexit.register(db.close_all)
+    # Queued tick history writes need no hook: concurrent.futures drains its
+    # worker threads at interpreter exit, before these atexit callbacks run.
     parser = argparse.ArgumentParser(
         prog="crypto",
         description="Cryptocurrency price tracker -- live prices from the Bitvavo API",
@@ -472,9 +592,9 @@ def main() -> None:
     prices_parser.add_argument(
         "--exchange",
         type=str,
-        choices=["bitvavo", "binance"],
+        choices=["bitvavo", "binance", "all"],
         default="bitvavo",
-        help="Exchange to fetch prices from (default: bitvavo)",
+        help="Exchange to fetch prices from, or 'all' for a consolidated view (default: bitvavo)",
     )
     prices_parser.add_argument(
         "--watchlist", action="store_true", default=False,
@@ -588,11 +708,11 @@ def main() -> None:
 
     # portfolio export
     export_parser = portfolio_sub.add_parser(
-        "export", help="Export holdings to CSV or JSON"
+        "export", help="Export holdings to CSV, JSON or NDJSON"
     )
     export_parser.add_argument(
         "--format",
-        choices=["csv", "json"],
+        choices=EXPORT_FORMATS,
         default="csv",
         dest="export_format",
         help="Export format (default: csv)",
@@ -601,6 +721,27 @@ def main() -> None:
         "--output", "-o", type=str, default=None, help="Output file path (default: stdout)"
     )
 
+    # portfolio import
+    import_parser = portfolio_sub.add_parser(
+        "import", help="Bulk-import holdings from CSV or JSON"
+    )
+    import_parser.add_argument(
+        "file", type=str, help="CSV, JSON or NDJSON file to import ('-' for stdin)"
+    )
+    import_parser.add_argument(
+        "--format",
+        choices=IMPORT_FORMATS,
+        default=None,
+        dest="import_format",
+        help="Input format (default: from the file extension)",
+    )
+    import_parser.add_argument(
+        "--batch-size",
+        type=_int_range(1),
+        default=IMPORT_BATCH_SIZE,
+        help=f"Rows per insert transaction (default: {IMPORT_BATCH_SIZE})",
+    )
+
     # alert subcommand group
     alert_parser = subparsers.add_parser("alert", help="Manage price alerts")
     alert_sub = alert_parser.add_subparsers(dest="alert_command")
@@ -693,6 +834,12 @@ def main() -> None:
         default=20,
         help="Number of top coins to chart (default: 20, ignored if symbol given)",
     )
+    chart_parser.add_argument(
+        "--concurrency",
+        type=_int_range(1),
+        default=CANDLE_CONCURRENCY,
+        help=f"Maximum parallel candle requests (default: {CANDLE_CONCURRENCY})",
+    )
     chart_parser.add_argument(
         "--exchange",
         type=str,
@@ -701,8 +848,61 @@ def main() -> None:
         help="Exchange to fetch prices from (default: bitvavo)",
     )
 
+    # indicators subcommand
+    indicators_parser = subparsers.add_parser(
+        "indicators", help="Show technical indicators (RSI, MACD, Bollinger, ...)",
+    )
+    indicators_parser.add_argument(
+        "symbol",
+        type=str,
+        nargs="?",
+        default=None,
+        help="Coin symbol (e.g. BTC). Omit for all top coins.",
+    )
+    indicators_parser.add_argument(
+        "-n",
+        "--top",
+        type=int,
+        default=20,
+        help="Number of top coins to analyse (default: 20, ignored if symbol given)",
+    )
+    indicators_parser.add_argument(
+        "-i",
+        "--interval",
+        type=str,
+        choices=list(INTERVAL_SECONDS),
+        default="4h",
+        help="Candle interval (default: 4h)",
+    )
+    indicators_parser.add_argument(
+        "-l",
+        "--limit",
+        type=_int_range(1, 1440),
+        default=200,
+        help="Number of candles of history to use (default: 200, max: 1440)",
+    )
+    indicators_parser.add_argument(
+        "--concurrency",
+        type=_int_range(1),
+        default=CANDLE_CONCURRENCY,
+        help=f"Maximum parallel candle requests (default: {CANDLE_CONCURRENCY})",
+    )
+    indicators_parser.add_argument(
+        "--exchange",
+        type=str,
+        choices=["bitvavo", "binance"],
+        default="bitvavo",
+        help="Exchange to rank top coins by (default: bitvavo)",
+    )
+
+    # compact subcommand
+    subparsers.add_parser("compact", help="Archive completed tick history buckets")
+
     args = parser.parse_args()
 
+    if args.command is not None and args.command != "web":
+        db.migrate()  # the web app migrates in its own lifespan
+
     if args.command == "prices":
         cmd_prices(args)
     elif args.command == "watch":
@@ -726,6 +926,8 @@ def main() -> None:
             cmd_portfolio_lots(args)
         elif args.portfolio_command == "export":
             cmd_portfolio_export(args)
+        elif args.portfolio_command == "import":
+            cmd_portfolio_import(args)
     elif args.command == "alert":
         if not hasattr(args, "alert_command") or args.alert_command is None:
             alert_parser.print_help()
@@ -757,6 +959,10 @@ def main() -> None:
             cmd_summary_send(args)
     elif args.command == "chart":
         cmd_chart(args)
+    elif args.command == "indicators":
+        cmd_indicators(args)
+    elif args.command == "compact":
+        cmd_compact(args)
     else:
         parser.print_help()
 
@@ -0,0 +1,144 @@
+"""Shared SQLite connection management for the ``*_db`` storage modules.
+
+Each thread keeps one long-lived connection per database file, so WAL mode,
+foreign keys and the connection's prepared-statement cache are set up once
+instead of on every call.  Pending schema migrations (see ``migrations``)
+are applied once per database file per process, when the first connection
+to it is opened; ``migrate()`` does that eagerly at app/CLI startup.
+
+Usage (inside a storage module):
+    with db.connection(db_path, _holding_factory) as conn:
+        with conn:
+            conn.execute("INSERT ...")
+
+Connections are thread-local because ``sqlite3`` connections must not be
+used from two threads at once; FastAPI's threadpool workers and the feed's
+``asyncio.to_thread`` workers each get their own.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from contextlib import AbstractContextManager, contextmanager
+from pathlib import Path
+from typing import Callable, Iterator
+
+from crypto_price_tracker import migrations
+
+STATEMENT_CACHE_SIZE = 256  # prepared statements kept per connection
+
+RowFactory = Callable[[sqlite3.Cursor, tuple], object]
+
+
+def resolve_db_path(db_path: Path | None = None) -> Path:
+    """Return *db_path*, or the default database path if *None*."""
+    from crypto_price_tracker import portfolio_db
+
+    return db_path or portfolio_db._get_default_db_path()
+
+
+class ConnectionPool:
+    """Thread-local pool of long-lived connections, one per thread and database."""
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._open_connections: list[sqlite3.Connection] = []
+        self._migrated: set[str] = set()
+
+    def open(self, db_path: Path | None = None) -> sqlite3.Connection:
+        """Open a new (unpooled) connection with WAL mode, foreign keys and a migrated schema."""
+        path = str(resolve_db_path(db_path))
+        conn = sqlite3.connect(path, check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        self._ensure_migrated(path, conn)
+        return conn
+
+    def _ensure_migrated(self, path: str, conn: sqlite3.Connection) -> None:
+        if path in self._migrated:
+            return
+        with self._lock:
+            if path not in self._migrated:
+                migrations.migrate(conn)
+                self._migrated.add(path)
+
+    def _thread_connections(self) -> dict[str, sqlite3.Connection]:
+        local = self._local
+        if getattr(local, "generation", None) != self._generation:
+            local.generation = self._generation
+            local.connections = {}
+        return local.connections
+
+    @contextmanager
+    def connection(
+        self,
+        db_path: Path | None = None,
+        row_factory: RowFactory | None = None,
+    ) -> Iterator[sqlite3.Connection]:
+        """Yield this thread's connection to *db_path* with *row_factory* set.
+
+        The connection stays open after the block; use ``with conn:`` inside
+        it for transactions.  A transaction started in the block and left
+        uncommitted is rolled back, as closing a connection used to do.
+        """
+        path = str(resolve_db_path(db_path))
+        connections = self._thread_connections()
+        conn = connections.get(path)
+        if conn is None:
+            conn = self.open(Path(path))
+            connections[path] = conn
+            with self._lock:
+                self._open_connections.append(conn)
+        previous = conn.row_factory
+        outermost = not conn.in_transaction
+        conn.row_factory = row_factory
+        try:
+            yield conn
+        finally:
+            if outermost and conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = previous
+
+    def close_all(self) -> None:
+        """Close every pooled connection in every thread."""
+        with self._lock:
+            self._generation += 1
+            connections, self._open_connections = self._open_connections, []
+            self._migrated.clear()
+        for conn in connections:
+            conn.close()
+
+
+pool = ConnectionPool()
+
+
+def connection(
+    db_path: Path | None = None,
+    row_factory: RowFactory | None = None,
+) -> AbstractContextManager[sqlite3.Connection]:
+    """Context manager yielding the current thread's pooled connection (see ``ConnectionPool``)."""
+    return pool.connection(db_path, row_factory)
+
+
+def connect(db_path: Path | None = None, row_factory: RowFactory | None = None) -> sqlite3.Connection:
+    """Open a standalone connection; the caller is responsible for closing it."""
+    conn = pool.open(db_path)
+    conn.row_factory = row_factory
+    return conn
+
+
+def migrate(db_path: Path | None = None) -> int:
+    """Apply pending schema migrations to *db_path* now.  Return its schema version.
+
+    Call once at startup so the first request or command doesn't pay for it.
+    """
+    with pool.connection(db_path) as conn:
+        return migrations.get_schema_version(conn)
+
+
+def close_all() -> None:
+    """Close every pooled connection (e.g. at app shutdown or between tests)."""
+    pool.close_all()
@@ -2,39 +2,50 @@
 
 from __future__ import annotations
 
+from collections.abc import Sequence
+
+import numpy as np
 import rich.box
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 
-from crypto_price_tracker.models import Candle, CoinData, Holding, PriceAlert, WatchlistEntry
+from crypto_price_tracker.indicators import IndicatorSet
+from crypto_price_tracker.models import (
+    Candle,
+    CandleSeries,
+    CoinData,
+    ConsolidatedCoin,
+    Holding,
+    PriceAlert,
+    WatchlistEntry,
+)
 from crypto_price_tracker.portfolio import PortfolioRow, PortfolioSummary
 
 SPARK_CHARS = "\u2581\u2582\u2583\u2584\u2585\u2586\u2587\u2588"
+_SPARK_ARRAY = np.array(list(SPARK_CHARS))
 
 
-def sparkline(values: list[float]) -> str:
+def sparkline(values: Sequence[float] | np.ndarray) -> str:
     """Convert numeric values to a Unicode sparkline string.
 
     Maps values linearly across 8 Unicode block characters (U+2581..U+2588).
     Returns empty string for empty input, uniform mid-height bars for constant values.
 
     Args:
-        values: List of numeric values to render.
+        values: Numeric values to render (list or NumPy array).
 
     Returns:
         A string of Unicode block characters representing the data.
     """
-    if not values:
+    if len(values) == 0:
         return ""
-    mn, mx = min(values), max(values)
+    arr = np.asarray(values, dtype=np.float64)
+    mn, mx = arr.min(), arr.max()
     if mn == mx:
-        return SPARK_CHARS[3] * len(values)
-    extent = mx - mn
-    return "".join(
-        SPARK_CHARS[min(7, int((v - mn) / extent * 8))]
-        for v in values
-    )
+        return SPARK_CHARS[3] * len(arr)
+    levels = np.minimum(7, ((arr - mn) / (mx - mn) * 8).astype(np.intp))
+    return "".join(_SPARK_ARRAY[levels])
 
 
 def render_price_table(
@@ -87,6 +98,63 @@ def render_price_table(
     console.print(table)
 
 
+def render_consolidated_table(
+    coins: list[ConsolidatedCoin],
+    console: Console | None = None,
+    triggered_symbols: set[str] | None = None,
+    source: str | None = None,
+) -> None:
+    """Render coins merged across exchanges, with per-exchange prices and spread.
+
+    Args:
+        coins:   List of ConsolidatedCoin objects to display.
+        console: Optional Rich Console instance for output capture (e.g. in tests).
+        triggered_symbols: Set of symbols with triggered alerts (highlighted in table).
+        source: Optional label of the exchanges used (e.g. "Binance + Bitvavo").
+    """
+    if console is None:
+        console = Console()
+    if triggered_symbols is None:
+        triggered_symbols = set()
+    exchanges = sorted({e for coin in coins for e in coin.prices})
+
+    table = Table(title="Consolidated Crypto Prices (EUR)", show_lines=False)
+    if source:
+        table.caption = f"via {source}; price is volume-weighted"
+        table.caption_style = "dim"
+
+    table.add_column("#", justify="right", style="dim")
+    table.add_column("Symbol", justify="left", style="bold")
+    table.add_column("Price (EUR)", justify="right")
+    for exchange in exchanges:
+        table.add_column(exchange.capitalize(), justify="right", style="dim")
+    table.add_column("Spread", justify="right")
+    table.add_column("24h %", justify="right")
+    table.add_column("Volume (EUR)", justify="right")
+
+    for rank, coin in enumerate(coins, start=1):
+        change_str = f"{coin.change_24h:+.2f}%"
+        change_colored = f"[green]{change_str}[/green]" if coin.change_24h >= 0 else f"[red]{change_str}[/red]"
+        symbol_str = coin.symbol
+        if coin.symbol in triggered_symbols:
+            symbol_str = f"[bold yellow]\u26a0 {coin.symbol}[/bold yellow]"
+        per_exchange = [
+            f"{coin.prices[e]:,.2f}" if e in coin.prices else "-" for e in exchanges
+        ]
+        spread_str = f"{coin.spread_pct:.2f}%" if len(coin.prices) > 1 else "-"
+        table.add_row(
+            str(rank),
+            symbol_str,
+            f"EUR {coin.price:,.2f}",
+            *per_exchange,
+            spread_str,
+            change_colored,
+            f"EUR {coin.volume_eur:,.0f}",
+        )
+
+    console.print(table)
+
+
 def render_portfolio_table(summary: PortfolioSummary, console: Console | None = None) -> None:
     """Render an aggregated portfolio view as a Rich table with P&L and allocation.
 
@@ -311,8 +379,8 @@ def render_chart_table(
 
 def render_chart_detail(
     coin: CoinData,
-    candles_7d: list[Candle],
-    candles_30d: list[Candle],
+    candles_7d: CandleSeries | list[Candle],
+    candles_30d: CandleSeries | list[Candle],
     console: Console | None = None,
 ) -> None:
     """Render a detailed single-coin chart view with sparklines and stats.
@@ -322,8 +390,8 @@ def render_chart_detail(
 
     Args:
         coin:        CoinData object for the coin header.
-        candles_7d:  List of 7-day Candle objects (chronological).
-        candles_30d: List of 30-day Candle objects (chronological).
+        candles_7d:  7-day candles (chronological).
+        candles_30d: 30-day candles (chronological).
         console:     Optional Rich Console instance for output capture.
     """
     if console is None:
@@ -336,11 +404,12 @@ def render_chart_detail(
             console.print(f"  {label}: No data available")
             continue
 
-        spark = sparkline([c.close for c in candles])
-        o = candles[0].open
-        c = candles[-1].close
-        hi = max(c_.high for c_ in candles)
-        lo = min(c_.low for c_ in candles)
+        series = CandleSeries.from_candles(candles)
+        spark = sparkline(series.close)
+        o = float(series.open[0])
+        c = float(series.close[-1])
+        hi = float(series.high.max())
+        lo = float(series.low.min())
         change = ((c - o) / o) * 100 if o else 0
 
         console.print(f"  [bold]{label}[/bold]  {spark}")
@@ -355,6 +424,72 @@ def render_chart_detail(
     console.print()
 
 
+def render_indicator_table(
+    indicators: dict[str, IndicatorSet],
+    interval: str,
+    console: Console | None = None,
+) -> None:
+    """Render the latest technical indicator values for one or more coins.
+
+    Args:
+        indicators: Dict mapping symbol -> IndicatorSet (determines row order).
+        interval:   Candle interval the indicators were computed on (e.g. "4h").
+        console:    Optional Rich Console instance for output capture.
+    """
+    if console is None:
+        console = Console()
+
+    def fmt(value: float | None, spec: str = ",.2f") -> str:
+        return "-" if value is None else format(value, spec)
+
+    table = Table(title=f"Technical Indicators ({interval} candles, EUR)", show_lines=False)
+    table.add_column("Symbol", justify="left", style="bold")
+    table.add_column("Close", justify="right")
+    table.add_column("SMA 20", justify="right")
+    table.add_column("EMA 20", justify="right")
+    table.add_column("RSI 14", justify="right")
+    table.add_column("MACD hist", justify="right")
+    table.add_column("Bollinger", justify="right")
+    table.add_column("ATR 14", justify="right")
+    table.add_column("VWAP", justify="right")
+    table.add_column("Volatility", justify="right")
+
+    for symbol, indicator_set in indicators.items():
+        latest = indicator_set.latest()
+
+        rsi_str = fmt(latest["rsi"], ".1f")
+        if latest["rsi"] is not None and latest["rsi"] >= 70:
+            rsi_str = f"[red]{rsi_str}[/red]"
+        elif latest["rsi"] is not None and latest["rsi"] <= 30:
+            rsi_str = f"[green]{rsi_str}[/green]"
+
+        hist_str = fmt(latest["macd_hist"], "+,.4f")
+        if latest["macd_hist"] is not None:
+            color = "green" if latest["macd_hist"] >= 0 else "red"
+            hist_str = f"[{color}]{hist_str}[/{color}]"
+
+        if latest["bb_lower"] is None:
+            bands_str = "-"
+        else:
+            bands_str = f"{fmt(latest['bb_lower'])} \u2013 {fmt(latest['bb_upper'])}"
+
+        vol = latest["volatility"]
+        table.add_row(
+            symbol,
+            fmt(latest["close"]),
+            fmt(latest["sma"]),
+            fmt(latest["ema"]),
+            rsi_str,
+            hist_str,
+            bands_str,
+            fmt(latest["atr"]),
+            fmt(latest["vwap"]),
+            "-" if vol is None else f"{vol * 100:.1f}%",
+        )
+
+    console.print(table)
+
+
 def render_watchlist_table(
     entries: list[WatchlistEntry],
     prices: dict[str, CoinData],
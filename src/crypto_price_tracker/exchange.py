@@ -5,27 +5,88 @@ for Bitvavo and Binance exchanges.  Includes a factory function and
 automatic fallback logic that silently switches to the other exchange
 when the primary is unavailable.
 
+Ticker data is served from a process-wide snapshot cache: each exchange's
+full coin list is fetched at most once per ``SNAPSHOT_TTL`` seconds and any
+``top_n`` slice is cut from that snapshot.  Concurrent callers that miss the
+cache share a single in-flight upstream fetch.  Every upstream snapshot is
+recorded once in the tick history (``ticks_db.append_ticks``), whichever
+command or endpoint asked for it.  Recording runs on a single background
+thread, so neither the fetch's waiters nor its latency stats pay for the
+SQLite write; ``flush_tick_recorder`` waits for pending writes.
+
+Every upstream fetch feeds per-exchange EWMA latency and error-rate
+statistics (``exchange_health``).  The fallback functions use them to pick
+the primary exchange and hedge: if the primary has not answered within its
+rolling p95 latency, the other exchange is raced and the first answer wins.
+Each exchange also has a circuit breaker: after ``BREAKER_FAILURE_THRESHOLD``
+consecutive failures it opens and fetches fail fast with ``CircuitOpenError``
+(so traffic goes straight to the other exchange) until a probe succeeds
+after ``BREAKER_COOLDOWN`` seconds.  Both defaults can be overridden with the
+``CRYPTO_BREAKER_FAILURES`` and ``CRYPTO_BREAKER_COOLDOWN`` environment
+variables; malformed values are ignored with a logged warning.
+
 Exports:
     ExchangeClient      -- Protocol for exchange client implementations
+    AsyncExchangeClient -- Async protocol for exchange client implementations
     BinanceClient       -- Client for the public Binance REST API
+    AsyncBinanceClient  -- Async client for the public Binance REST API
+    TickerSnapshot      -- Full sorted coin list fetched from one exchange
+    TickerSnapshotCache -- TTL-bounded, single-flight snapshot cache
+    ClientRegistry      -- Long-lived pooled clients keyed by exchange
+    client_registry     -- The process-wide ClientRegistry instance
     get_exchange_client  -- Factory returning the right client instance
-    get_top_coins_with_fallback -- Fetch with automatic exchange fallback
+    get_async_exchange_client -- Factory returning the right async client
+    get_ticker_snapshot  -- Cached full coin list for one exchange
+    get_ticker_snapshot_async -- Async variant of get_ticker_snapshot
+    clear_ticker_cache   -- Drop all cached snapshots
+    flush_tick_recorder  -- Wait until queued snapshots are written to tick history
+    ExchangeStats       -- EWMA latency/error-rate and p95 of one exchange
+    CircuitBreaker      -- Closed/open/half-open breaker for one exchange
+    CircuitOpenError    -- Raised instead of fetching while a breaker is open
+    ExchangeHealth      -- Per-exchange stats and breakers driving primary choice
+    exchange_health     -- The process-wide ExchangeHealth instance
+    get_top_coins_with_fallback -- Hedged fetch with automatic exchange fallback
+    get_top_coins_with_fallback_async -- Async fetch with exchange fallback
+    consolidate_snapshots -- Merge per-exchange snapshots into ConsolidatedCoin
+    get_consolidated_coins -- Concurrent fetch from every exchange, merged
+    get_consolidated_coins_async -- Async variant of get_consolidated_coins
 """
 
 from __future__ import annotations
 
+import asyncio
+import logging
+import math
+import os
+import threading
 import time
-from typing import Protocol
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Awaitable, Callable, Protocol
 
 import httpx
 
-from crypto_price_tracker.models import CoinData
+from crypto_price_tracker.api import HTTP2_ENABLED, HTTP_HEADERS, HTTP_LIMITS, HTTP_TIMEOUT
+from crypto_price_tracker.models import CoinData, ConsolidatedCoin
+from crypto_price_tracker.ticks_db import append_ticks
+
+logger = logging.getLogger(__name__)
 
 BINANCE_BASE_URL = "https://api.binance.com/api/v3"
+BINANCE_STABLECOINS = frozenset({"USDC", "BUSD", "DAI", "TUSD", "FDUSD", "USDD", "USDP"})
 
 EXCHANGES = {"bitvavo", "binance"}
+ALL_EXCHANGES = "all"  # pseudo-exchange key selecting the consolidated view
 DEFAULT_EXCHANGE = "bitvavo"
 
+SNAPSHOT_TTL = 10.0  # seconds a ticker snapshot is served before refetching
+
+_FETCH_ERRORS = (httpx.HTTPStatusError, httpx.ConnectError, httpx.TimeoutException)
+
 
 class ExchangeClient(Protocol):
     """Protocol for exchange clients that fetch cryptocurrency prices."""
@@ -35,8 +96,8 @@ class ExchangeClient(Protocol):
         """Human-readable exchange name (e.g. 'Bitvavo', 'Binance')."""
         ...
 
-    def get_top_coins(self, top_n: int = 20) -> list[CoinData]:
-        """Return the top N coins by volume."""
+    def get_top_coins(self, top_n: int | None = 20) -> list[CoinData]:
+        """Return the top N coins by volume (all coins when *None*)."""
         ...
 
     def __enter__(self) -> "ExchangeClient":
@@ -45,6 +106,82 @@ class ExchangeClient(Protocol):
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
         ...
 
+    def close(self) -> None:
+        ...
+
+
+class AsyncExchangeClient(Protocol):
+    """Async counterpart of :class:`ExchangeClient` for use on the event loop."""
+
+    @property
+    def name(self) -> str:
+        """Human-readable exchange name (e.g. 'Bitvavo', 'Binance')."""
+        ...
+
+    async def get_top_coins(self, top_n: int | None = 20) -> list[CoinData]:
+        """Return the top N coins by volume (all coins when *None*)."""
+        ...
+
+    async def __aenter__(self) -> "AsyncExchangeClient":
+        ...
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        ...
+
+    async def aclose(self) -> None:
+        ...
+
+
+def _parse_binance_tickers(tickers: list[dict], fx_rate: float) -> list[CoinData]:
+    """Turn raw Binance 24hr tickers into EUR CoinData sorted by volume descending."""
+    coins: list[CoinData] = []
+    for entry in tickers:
+        symbol_pair: str = entry.get("symbol", "")
+
+        # Only process USDT pairs
+        if not symbol_pair.endswith("USDT"):
+            continue
+
+        # Extract base symbol (e.g. "BTC" from "BTCUSDT")
+        base_symbol = symbol_pair[:-4]
+
+        # Skip stablecoins
+        if base_symbol in BINANCE_STABLECOINS:
+            continue
+
+        raw_last = entry.get("lastPrice", "0") or "0"
+        raw_open = entry.get("openPrice", "0") or "0"
+        raw_volume = entry.get("volume", "0") or "0"
+        raw_quote_volume = entry.get("quoteVolume", "0") or "0"
+
+        if not raw_open or raw_open == "0" or float(raw_open) == 0:
+            continue
+
+        last_usdt = float(raw_last)
+        open_usdt = float(raw_open)
+        volume = float(raw_volume)
+        volume_usdt = float(raw_quote_volume)
+
+        # Convert USDT prices to EUR
+        price_eur = last_usdt * fx_rate
+        volume_eur = volume_usdt * fx_rate
+
+        change_24h = ((last_usdt - open_usdt) / open_usdt) * 100
+
+        coins.append(
+            CoinData(
+                symbol=base_symbol,
+                name=base_symbol,  # Binance doesn't expose human names in ticker
+                price=price_eur,
+                change_24h=change_24h,
+                volume=volume,
+                volume_eur=volume_eur,
+            )
+        )
+
+    coins.sort(key=lambda c: c.volume_eur, reverse=True)
+    return coins
+
 
 class BinanceClient:
     """Client for the public Binance REST API.
@@ -54,15 +191,15 @@ class BinanceClient:
     for 5 minutes to avoid redundant API calls.
     """
 
-    _STABLECOIN_SYMBOLS = frozenset(
-        {"USDC", "BUSD", "DAI", "TUSD", "FDUSD", "USDD", "USDP"}
-    )
+    _STABLECOIN_SYMBOLS = BINANCE_STABLECOINS
 
-    def __init__(self, top_n: int = 20) -> None:
+    def __init__(self, top_n: int | None = 20) -> None:
         self.top_n = top_n
         self._client = httpx.Client(
-            timeout=10.0,
-            headers={"User-Agent": "crypto-price-tracker/0.1.0"},
+            timeout=HTTP_TIMEOUT,
+            headers=HTTP_HEADERS,
+            limits=HTTP_LIMITS,
+            http2=HTTP2_ENABLED,
         )
         self._fx_rate: float | None = None
         self._fx_rate_time: float = 0.0
@@ -79,6 +216,10 @@ class BinanceClient:
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
         self._client.__exit__(exc_type, exc_val, exc_tb)
 
+    def close(self) -> None:
+        """Close the underlying connection pool."""
+        self._client.close()
+
     def _get_usdt_eur_rate(self) -> float:
         """Fetch USDT/EUR conversion rate from Binance, with 5-minute caching."""
         now = time.monotonic()
@@ -108,56 +249,275 @@ class BinanceClient:
         fx_rate = self._get_usdt_eur_rate()
         tickers = self._fetch_tickers()
 
-        coins: list[CoinData] = []
-        for entry in tickers:
-            symbol_pair: str = entry.get("symbol", "")
-
-            # Only process USDT pairs
-            if not symbol_pair.endswith("USDT"):
-                continue
-
-            # Extract base symbol (e.g. "BTC" from "BTCUSDT")
-            base_symbol = symbol_pair[:-4]
-
-            # Skip stablecoins
-            if base_symbol in self._STABLECOIN_SYMBOLS:
-                continue
-
-            raw_last = entry.get("lastPrice", "0") or "0"
-            raw_open = entry.get("openPrice", "0") or "0"
-            raw_volume = entry.get("volume", "0") or "0"
-            raw_quote_volume = entry.get("quoteVolume", "0") or "0"
-
-            if not raw_open or raw_open == "0" or float(raw_open) == 0:
-                continue
-
-            last_usdt = float(raw_last)
-            open_usdt = float(raw_open)
-            volume = float(raw_volume)
-            volume_usdt = float(raw_quote_volume)
-
-            # Convert USDT prices to EUR
-            price_eur = last_usdt * fx_rate
-            volume_eur = volume_usdt * fx_rate
-
-            change_24h = ((last_usdt - open_usdt) / open_usdt) * 100
-
-            coins.append(
-                CoinData(
-                    symbol=base_symbol,
-                    name=base_symbol,  # Binance doesn't expose human names in ticker
-                    price=price_eur,
-                    change_24h=change_24h,
-                    volume=volume,
-                    volume_eur=volume_eur,
-                )
-            )
+        coins = _parse_binance_tickers(tickers, fx_rate)
+        return coins[:top_n]
+
+
+class AsyncBinanceClient:
+    """Async counterpart of :class:`BinanceClient` built on ``httpx.AsyncClient``.
+
+    The FX rate and ticker data are fetched concurrently; the FX rate is
+    cached for 5 minutes like in the sync client.
+    """
+
+    _STABLECOIN_SYMBOLS = BINANCE_STABLECOINS
 
-        coins.sort(key=lambda c: c.volume_eur, reverse=True)
+    def __init__(self, top_n: int | None = 20) -> None:
+        self.top_n = top_n
+        self._client = httpx.AsyncClient(
+            timeout=HTTP_TIMEOUT,
+            headers=HTTP_HEADERS,
+            limits=HTTP_LIMITS,
+            http2=HTTP2_ENABLED,
+        )
+        self._fx_rate: float | None = None
+        self._fx_rate_time: float = 0.0
+        self._FX_CACHE_TTL = 300  # 5 minutes
+
+    @property
+    def name(self) -> str:
+        return "Binance"
+
+    async def __aenter__(self) -> "AsyncBinanceClient":
+        await self._client.__aenter__()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self._client.__aexit__(exc_type, exc_val, exc_tb)
+
+    async def aclose(self) -> None:
+        """Close the underlying connection pool."""
+        await self._client.aclose()
+
+    async def _get_usdt_eur_rate(self) -> float:
+        """Fetch USDT/EUR conversion rate from Binance, with 5-minute caching."""
+        now = time.monotonic()
+        if self._fx_rate is not None and (now - self._fx_rate_time) < self._FX_CACHE_TTL:
+            return self._fx_rate
+        response = await self._client.get(
+            f"{BINANCE_BASE_URL}/ticker/price",
+            params={"symbol": "EURUSDT"},
+        )
+        response.raise_for_status()
+        eur_per_usdt = 1.0 / float(response.json()["price"])
+        self._fx_rate = eur_per_usdt
+        self._fx_rate_time = now
+        return eur_per_usdt
+
+    async def _fetch_tickers(self) -> list[dict]:
+        """Fetch 24h ticker data for all markets."""
+        response = await self._client.get(f"{BINANCE_BASE_URL}/ticker/24hr")
+        response.raise_for_status()
+        return response.json()
+
+    async def get_top_coins(self, top_n: int | None = None) -> list[CoinData]:
+        """Return top N coins by 24h USDT volume, converted to EUR."""
+        if top_n is None:
+            top_n = self.top_n
+        fx_rate, tickers = await asyncio.gather(
+            self._get_usdt_eur_rate(),
+            self._fetch_tickers(),
+        )
+        coins = _parse_binance_tickers(tickers, fx_rate)
         return coins[:top_n]
 
 
-def get_exchange_client(exchange: str = DEFAULT_EXCHANGE, top_n: int = 20) -> ExchangeClient:
+# ---------------------------------------------------------------------------
+# Ticker snapshot cache
+# ---------------------------------------------------------------------------
+
+@dataclass(slots=True)
+class TickerSnapshot:
+    """The full, volume-sorted coin list fetched from one exchange.
+
+    Fields:
+        coins:      Every coin the exchange returned, sorted by volume_eur descending
+        source:     Exchange name that produced the data (e.g. "Bitvavo")
+        fetched_at: ``time.monotonic()`` timestamp of the upstream fetch
+    """
+
+    coins: list[CoinData]
+    source: str
+    fetched_at: float
+
+
+class TickerSnapshotCache:
+    """Process-wide, TTL-bounded cache of ticker snapshots keyed by exchange.
+
+    Callers that miss the cache while a fetch for the same exchange is
+    already running wait for that fetch instead of starting their own, so a
+    burst of concurrent requests costs one upstream round-trip.  Fetch
+    errors are propagated to every waiter and nothing is cached.
+    """
+
+    def __init__(self, ttl: float = SNAPSHOT_TTL) -> None:
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: dict[str, TickerSnapshot] = {}
+        self._inflight: dict[str, Future[TickerSnapshot]] = {}
+
+    def get(self, exchange: str, fetch: Callable[[], TickerSnapshot]) -> TickerSnapshot:
+        """Return a fresh snapshot for *exchange*, calling *fetch* at most once per TTL."""
+        entry, future, leader = self._claim(exchange)
+        if entry is not None:
+            return entry
+        if not leader:
+            return future.result()
+        return self._lead(exchange, future, fetch)
+
+    def submit(
+        self,
+        exchange: str,
+        fetch: Callable[[], TickerSnapshot],
+        executor: Executor,
+    ) -> Future[TickerSnapshot]:
+        """Non-blocking variant of :meth:`get`: return a future for the snapshot.
+
+        On a miss, *fetch* runs on *executor*.  The future may be shared with
+        other callers, so it must not be cancelled.
+        """
+        entry, future, leader = self._claim(exchange)
+        if entry is not None:
+            future = Future()
+            future.set_result(entry)
+        elif leader:
+            executor.submit(self._lead, exchange, future, fetch)
+        return future
+
+    async def aget(
+        self,
+        exchange: str,
+        fetch: Callable[[], Awaitable[TickerSnapshot]],
+    ) -> TickerSnapshot:
+        """Async variant of :meth:`get`; shares in-flight fetches with sync callers.
+
+        Cancelling the caller does not cancel the upstream fetch, which
+        still completes into the cache for the other waiters.
+        """
+        entry, future, leader = self._claim(exchange)
+        if entry is not None:
+            return entry
+        if not leader:
+            return await asyncio.shield(asyncio.wrap_future(future))
+        task = asyncio.ensure_future(fetch())
+        task.add_done_callback(lambda t: self._settle_task(exchange, future, t))
+        return await asyncio.shield(task)
+
+    def _lead(
+        self,
+        exchange: str,
+        future: Future[TickerSnapshot],
+        fetch: Callable[[], TickerSnapshot],
+    ) -> TickerSnapshot:
+        """Run the fetch this caller claimed and settle *future* with the outcome."""
+        try:
+            snapshot = fetch()
+        except BaseException as exc:
+            self._settle(exchange, future, exc=exc)
+            raise
+        self._settle(exchange, future, snapshot=snapshot)
+        return snapshot
+
+    def _claim(
+        self, exchange: str
+    ) -> tuple[TickerSnapshot | None, Future[TickerSnapshot] | None, bool]:
+        """Return (fresh entry, in-flight future, whether the caller must fetch)."""
+        with self._lock:
+            entry = self._entries.get(exchange)
+            if entry is not None and (time.monotonic() - entry.fetched_at) < self.ttl:
+                return entry, None, False
+            future = self._inflight.get(exchange)
+            if future is not None:
+                return None, future, False
+            future = Future()
+            self._inflight[exchange] = future
+            return None, future, True
+
+    def _settle(
+        self,
+        exchange: str,
+        future: Future[TickerSnapshot],
+        snapshot: TickerSnapshot | None = None,
+        exc: BaseException | None = None,
+    ) -> None:
+        """Store the leader's result (or error) and release any waiters."""
+        with self._lock:
+            if snapshot is not None:
+                self._entries[exchange] = snapshot
+            del self._inflight[exchange]
+        if exc is not None:
+            future.set_exception(exc)
+        else:
+            future.set_result(snapshot)
+
+    def _settle_task(self, exchange: str, future: Future[TickerSnapshot], task: asyncio.Task) -> None:
+        """Settle *future* from a finished async fetch task."""
+        if task.cancelled():
+            self._settle(exchange, future, exc=asyncio.CancelledError())
+        elif task.exception() is not None:
+            self._settle(exchange, future, exc=task.exception())
+        else:
+            self._settle(exchange, future, snapshot=task.result())
+
+    def clear(self) -> None:
+        """Drop all cached snapshots (in-flight fetches are unaffected)."""
+        with self._lock:
+            self._entries.clear()
+
+
+_snapshot_cache = TickerSnapshotCache()
+_recorder = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tick-recorder")
+
+
+def _record_snapshot(exchange: str, snapshot: TickerSnapshot) -> None:
+    """Append *snapshot* to the tick history; a storage error never fails the fetch."""
+    try:
+        append_ticks(snapshot.coins, exchange)
+    except Exception:
+        logger.exception("Recording %s ticks failed", exchange)
+
+
+def flush_tick_recorder() -> None:
+    """Block until every snapshot queued so far has been written to the tick history."""
+    _recorder.submit(lambda: None).result()
+
+
+def _fetch_snapshot(exchange: str) -> TickerSnapshot:
+    """Fetch the complete coin list from *exchange* (uncached)."""
+    client = client_registry.get(exchange)
+    with exchange_health.measure(exchange):
+        coins = client.get_top_coins()
+    snapshot = TickerSnapshot(coins=coins, source=client.name, fetched_at=time.monotonic())
+    _recorder.submit(_record_snapshot, exchange, snapshot)
+    return snapshot
+
+
+async def _fetch_snapshot_async(exchange: str) -> TickerSnapshot:
+    """Fetch the complete coin list from *exchange* without blocking the loop."""
+    client = client_registry.get_async(exchange)
+    with exchange_health.measure(exchange):
+        coins = await client.get_top_coins()
+    snapshot = TickerSnapshot(coins=coins, source=client.name, fetched_at=time.monotonic())
+    _recorder.submit(_record_snapshot, exchange, snapshot)
+    return snapshot
+
+
+def get_ticker_snapshot(exchange: str = DEFAULT_EXCHANGE) -> TickerSnapshot:
+    """Return the cached ticker snapshot for *exchange*, refreshing it if stale."""
+    return _snapshot_cache.get(exchange, lambda: _fetch_snapshot(exchange))
+
+
+async def get_ticker_snapshot_async(exchange: str = DEFAULT_EXCHANGE) -> TickerSnapshot:
+    """Async variant of :func:`get_ticker_snapshot`."""
+    return await _snapshot_cache.aget(exchange, lambda: _fetch_snapshot_async(exchange))
+
+
+def clear_ticker_cache() -> None:
+    """Drop all cached ticker snapshots so the next call goes upstream."""
+    _snapshot_cache.clear()
+
+
+def get_exchange_client(exchange: str = DEFAULT_EXCHANGE, top_n: int | None = 20) -> ExchangeClient:
     """Return an exchange client instance for the given exchange name."""
     from crypto_price_tracker.api import BitvavoClient
 
@@ -166,27 +526,582 @@ def get_exchange_client(exchange: str = DEFAULT_EXCHANGE, top_n: int = 20) -> Ex
     return BitvavoClient(top_n=top_n)
 
 
+def get_async_exchange_client(
+    exchange: str = DEFAULT_EXCHANGE,
+    top_n: int | None = 20,
+) -> AsyncExchangeClient:
+    """Return an async exchange client instance for the given exchange name."""
+    from crypto_price_tracker.api import AsyncBitvavoClient
+
+    if exchange == "binance":
+        return AsyncBinanceClient(top_n=top_n)
+    return AsyncBitvavoClient(top_n=top_n)
+
+
+# ---------------------------------------------------------------------------
+# Client registry
+# ---------------------------------------------------------------------------
+
+class ClientRegistry:
+    """Long-lived, per-exchange client instances with pooled connections.
+
+    Clients are created lazily (unbounded, ``top_n=None``) and reused for
+    every request, so keep-alive connections and TLS sessions survive across
+    calls.  Async clients are bound to the event loop that created them and
+    are rebuilt if a different loop asks for one.
+
+    The CLI closes the registry at interpreter exit; the web app closes it
+    in its lifespan shutdown.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._clients: dict[str, ExchangeClient] = {}
+        self._async_clients: dict[str, AsyncExchangeClient] = {}
+        self._async_loop: asyncio.AbstractEventLoop | None = None
+
+    def get(self, exchange: str) -> ExchangeClient:
+        """Return the shared sync client for *exchange*, creating it on first use."""
+        with self._lock:
+            client = self._clients.get(exchange)
+            if client is None:
+                client = get_exchange_client(exchange, top_n=None)
+                self._clients[exchange] = client
+            return client
+
+    def get_async(self, exchange: str) -> AsyncExchangeClient:
+        """Return the shared async client for *exchange* on the running loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._async_loop is not loop:
+                # Clients from a previous loop cannot be used (or closed) here
+                self._async_clients = {}
+                self._async_loop = loop
+            client = self._async_clients.get(exchange)
+            if client is None:
+                client = get_async_exchange_client(exchange, top_n=None)
+                self._async_clients[exchange] = client
+            return client
+
+    def close(self) -> None:
+        """Close all sync clients and forget all async ones."""
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+            self._async_clients = {}
+            self._async_loop = None
+        for client in clients:
+            client.close()
+
+    async def aclose(self) -> None:
+        """Close every client, awaiting the async ones on the running loop."""
+        with self._lock:
+            async_clients = list(self._async_clients.values())
+            if self._async_loop is not asyncio.get_running_loop():
+                async_clients = []
+            self._async_clients = {}
+        for client in async_clients:
+            await client.aclose()
+        self.close()
+
+
+client_registry = ClientRegistry()
+
+
+# ---------------------------------------------------------------------------
+# Exchange health and hedged fetches
+# ---------------------------------------------------------------------------
+
+LATENCY_WINDOW = 50  # successful fetches per exchange kept for the rolling p95
+LATENCY_MIN_SAMPLES = 5  # fewer samples than this: hedge after HEDGE_DELAY_DEFAULT
+STATS_EWMA_ALPHA = 0.2  # weight of the newest fetch in the EWMA latency and error rate
+STATS_STALE_AFTER = 60.0  # seconds after which an exchange's stats no longer steer primary choice
+HEDGE_DELAY_DEFAULT = 1.0  # seconds to wait for an unmeasured primary before hedging
+HEDGE_DELAY_MIN = 0.05  # floor on the hedge delay, so fast exchanges are not raced on every jitter
+PRIMARY_SWITCH_RATIO = 3.0  # demote the preferred exchange once it scores this much worse
+
+
+def _env_number(name: str, default: float, parse: Callable[[str], float]) -> float:
+    """Return environment variable *name* parsed by *parse* if it is a positive number.
+
+    An unset variable gives *default*; a malformed or non-positive one logs a
+    warning and gives *default*, so a bad setting never breaks the import.
+    """
+    raw = os.environ.get(name)
+    if raw is None:
+        return default
+    try:
+        value = parse(raw)
+    except ValueError:
+        value = None
+    if value is None or not value > 0:
+        logger.warning("Ignoring %s=%r: expected a positive number, using %s", name, raw, default)
+        return default
+    return value
+
+
+# Circuit breaker defaults, overridable per process via the environment
+BREAKER_FAILURE_THRESHOLD = _env_number("CRYPTO_BREAKER_FAILURES", 5, int)  # consecutive failures
+BREAKER_COOLDOWN = _env_number("CRYPTO_BREAKER_COOLDOWN", 30.0, float)  # seconds open before a probe
+BREAKER_TRANSITION_LOG = 20  # recent state transitions kept per breaker for the metrics endpoint
+
+_fanout = ThreadPoolExecutor(max_workers=len(EXCHANGES), thread_name_prefix="exchange-fetch")
+
+
+class ExchangeStats:
+    """Latency and error statistics for one exchange's upstream fetches.
+
+    Latencies are only sampled from successful fetches, so a run of
+    timeouts raises ``error_rate`` instead of stretching the hedge delay.
+    """
+
+    def __init__(self) -> None:
+        self.fetches = 0
+        self.errors = 0
+        self.ewma_latency: float | None = None
+        self.error_rate = 0.0
+        self.updated_at: float | None = None
+        self._recent: deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    def record(self, latency: float, ok: bool) -> None:
+        """Fold one fetch of *latency* seconds into the statistics."""
+        self.fetches += 1
+        self.updated_at = time.monotonic()
+        self.error_rate += STATS_EWMA_ALPHA * ((0.0 if ok else 1.0) - self.error_rate)
+        if not ok:
+            self.errors += 1
+            return
+        self._recent.append(latency)
+        if self.ewma_latency is None:
+            self.ewma_latency = latency
+        else:
+            self.ewma_latency += STATS_EWMA_ALPHA * (latency - self.ewma_latency)
+
+    def p95(self) -> float | None:
+        """Return the 95th percentile of the recent successful latencies."""
+        if not self._recent:
+            return None
+        ordered = sorted(self._recent)
+        return ordered[math.ceil(0.95 * len(ordered)) - 1]
+
+    def hedge_delay(self) -> float:
+        """Return how long to wait for this exchange before racing another."""
+        if len(self._recent) < LATENCY_MIN_SAMPLES:
+            return HEDGE_DELAY_DEFAULT
+        return max(self.p95(), HEDGE_DELAY_MIN)
+
+    def score(self) -> float | None:
+        """Return the expected seconds to a successful answer, or *None* if unmeasured or stale."""
+        if self.updated_at is None or time.monotonic() - self.updated_at > STATS_STALE_AFTER:
+            return None
+        latency = HEDGE_DELAY_DEFAULT if self.ewma_latency is None else self.ewma_latency
+        return latency / max(1.0 - self.error_rate, 0.01)
+
+
+class CircuitOpenError(httpx.ConnectError):
+    """Raised instead of contacting an exchange whose circuit breaker is open.
+
+    Subclasses ``httpx.ConnectError`` so every caller that already handles
+    an unreachable exchange handles this one too.
+    """
+
+
+class CircuitBreaker:
+    """Closed/open/half-open circuit breaker for one exchange.
+
+    ``failure_threshold`` consecutive failures open the breaker; while open,
+    ``allow`` refuses every call.  After ``cooldown`` seconds it turns
+    half-open and admits a single probe: success closes it, failure opens
+    it for another cooldown.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        cooldown: float = BREAKER_COOLDOWN,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures = 0  # consecutive
+        self.rejected = 0
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._probing = False
+        self._transitions: deque[dict] = deque(maxlen=BREAKER_TRANSITION_LOG)
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Return the current state, turning half-open once the cooldown has passed."""
+        with self._lock:
+            return self._current_state()
+
+    def allow(self) -> bool:
+        """Return True if a call may go upstream now (claiming the probe when half-open)."""
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED or (state == self.HALF_OPEN and not self._probing):
+                self._probing = state == self.HALF_OPEN
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        """Reset the failure count and close the breaker."""
+        with self._lock:
+            self.failures = 0
+            self._probing = False
+            if self._state != self.CLOSED:
+                self._transition(self.CLOSED)
+
+    def record_failure(self) -> None:
+        """Count a failure; open the breaker at the threshold or on a failed probe."""
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self._state == self.HALF_OPEN or (
+                self._state == self.CLOSED and self.failures >= self.failure_threshold
+            ):
+                self._opened_at = time.monotonic()
+                self._transition(self.OPEN)
+
+    def release(self) -> None:
+        """Give up a half-open probe that ended without a verdict (e.g. cancelled)."""
+        with self._lock:
+            self._probing = False
+
+    def metrics(self) -> dict:
+        """Return the breaker's configuration, state and recent transitions."""
+        with self._lock:
+            return {
+                "state": self._current_state(),
+                "failures": self.failures,
+                "failure_threshold": self.failure_threshold,
+                "cooldown": self.cooldown,
+                "rejected": self.rejected,
+                "transitions": list(self._transitions),
+            }
+
+    def _current_state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.cooldown:
+            self._transition(self.HALF_OPEN)
+        return self._state
+
+    def _transition(self, state: str) -> None:
+        self._transitions.append(
+            {"from": self._state, "to": state, "at": datetime.now().isoformat(timespec="seconds")}
+        )
+        self._state = state
+
+
+class ExchangeHealth:
+    """Process-wide stats and circuit breaker per exchange, used to pick and hedge primaries."""
+
+    def __init__(
+        self,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        cooldown: float = BREAKER_COOLDOWN,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._stats: dict[str, ExchangeStats] = {}
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def stats(self, exchange: str) -> ExchangeStats:
+        """Return the statistics for *exchange*, creating them on first use."""
+        with self._lock:
+            return self._stats.setdefault(exchange, ExchangeStats())
+
+    def breaker(self, exchange: str) -> CircuitBreaker:
+        """Return the circuit breaker for *exchange*, creating it on first use."""
+        with self._lock:
+            breaker = self._breakers.get(exchange)
+            if breaker is None:
+                breaker = CircuitBreaker(self.failure_threshold, self.cooldown)
+                self._breakers[exchange] = breaker
+            return breaker
+
+    def record(self, exchange: str, latency: float, ok: bool) -> None:
+        """Record one upstream fetch from *exchange*."""
+        with self._lock:
+            self._stats.setdefault(exchange, ExchangeStats()).record(latency, ok)
+        breaker = self.breaker(exchange)
+        if ok:
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+
+    @contextmanager
+    def measure(self, exchange: str) -> Iterator[None]:
+        """Gate the enclosed fetch on the breaker, time it and record the outcome.
+
+        Raises:
+            CircuitOpenError: The breaker is open (or its probe is taken).
+        """
+        breaker = self.breaker(exchange)
+        if not breaker.allow():
+            raise CircuitOpenError(f"Circuit breaker for {exchange} is {breaker.state}")
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.record(exchange, time.perf_counter() - start, ok=False)
+            raise
+        except BaseException:
+            breaker.release()
+            raise
+        self.record(exchange, time.perf_counter() - start, ok=True)
+
+    def hedge_delay(self, exchange: str) -> float:
+        """Return how long to wait for *exchange* before racing another."""
+        with self._lock:
+            return self._stats.setdefault(exchange, ExchangeStats()).hedge_delay()
+
+    def rank(self, preferred: str) -> tuple[str, str]:
+        """Return (primary, secondary) for a request that asked for *preferred*.
+
+        *preferred* is demoted while its breaker is open and the other's is
+        not, or when both exchanges have recent stats and it scores
+        ``PRIMARY_SWITCH_RATIO`` times worse than the other.  Stats go stale
+        after ``STATS_STALE_AFTER`` seconds, so a demoted exchange is retried
+        as primary once its record has aged out.
+        """
+        other = "binance" if preferred == "bitvavo" else "bitvavo"
+        mine_open = self.breaker(preferred).state == CircuitBreaker.OPEN
+        if mine_open and self.breaker(other).state != CircuitBreaker.OPEN:
+            return other, preferred
+        with self._lock:
+            mine = self._stats.setdefault(preferred, ExchangeStats()).score()
+            theirs = self._stats.setdefault(other, ExchangeStats()).score()
+        if mine is not None and theirs is not None and mine > PRIMARY_SWITCH_RATIO * theirs:
+            return other, preferred
+        return preferred, other
+
+    def metrics(self) -> dict[str, dict]:
+        """Return latency stats and breaker state for every exchange seen so far."""
+        with self._lock:
+            exchanges = sorted(self._stats.keys() | self._breakers.keys())
+        metrics: dict[str, dict] = {}
+        for exchange in exchanges:
+            stats = self.stats(exchange)
+            with self._lock:
+                metrics[exchange] = {
+                    "fetches": stats.fetches,
+                    "errors": stats.errors,
+                    "ewma_latency": stats.ewma_latency,
+                    "p95_latency": stats.p95(),
+                    "error_rate": stats.error_rate,
+                    "hedge_delay": stats.hedge_delay(),
+                }
+            metrics[exchange]["breaker"] = self.breaker(exchange).metrics()
+        return metrics
+
+    def reset(self) -> None:
+        """Forget all statistics and close every breaker."""
+        with self._lock:
+            self._stats.clear()
+            self._breakers.clear()
+
+
+exchange_health = ExchangeHealth()
+
+
+def _first_success(ordered: list, done: set) -> TickerSnapshot | BaseException | None:
+    """Return the first successful result among *done* (in *ordered* order).
+
+    Otherwise return the last fetch error, or *None* if nothing is done.
+    Any other exception is raised.
+    """
+    error: BaseException | None = None
+    for future in ordered:
+        if future not in done:
+            continue
+        exc = future.exception()
+        if exc is None:
+            return future.result()
+        if not isinstance(exc, _FETCH_ERRORS):
+            raise exc
+        error = exc
+    return error
+
+
+def _hedged_snapshot(exchange: str) -> TickerSnapshot:
+    """Return a snapshot from the ranked primary, racing the secondary if it is slow.
+
+    The secondary is started once the primary has been pending for its
+    rolling p95 latency; the first success wins.  The losing fetch is not
+    interrupted (threads cannot be), it completes into the snapshot cache.
+    """
+    primary, secondary = exchange_health.rank(exchange)
+    first = _snapshot_cache.submit(primary, lambda: _fetch_snapshot(primary), _fanout)
+    try:
+        return first.result(timeout=exchange_health.hedge_delay(primary))
+    except TimeoutError:
+        pass
+    except _FETCH_ERRORS:
+        # Failed fast: fall back -- if this also fails, the exception propagates
+        return get_ticker_snapshot(secondary)
+
+    second = _snapshot_cache.submit(secondary, lambda: _fetch_snapshot(secondary), _fanout)
+    pending = {first, second}
+    while True:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        result = _first_success([first, second], done)
+        if isinstance(result, TickerSnapshot):
+            return result
+        if not pending:
+            raise result
+
+
+async def _hedged_snapshot_async(exchange: str) -> TickerSnapshot:
+    """Async variant of :func:`_hedged_snapshot`; the losing wait is cancelled."""
+    primary, secondary = exchange_health.rank(exchange)
+    tasks = [asyncio.ensure_future(get_ticker_snapshot_async(primary))]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=exchange_health.hedge_delay(primary))
+        if done:
+            try:
+                return tasks[0].result()
+            except _FETCH_ERRORS:
+                return await get_ticker_snapshot_async(secondary)
+
+        tasks.append(asyncio.ensure_future(get_ticker_snapshot_async(secondary)))
+        pending = set(tasks)
+        while True:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            result = _first_success(tasks, done)
+            if isinstance(result, TickerSnapshot):
+                return result
+            if not pending:
+                raise result
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
 def get_top_coins_with_fallback(
     exchange: str = DEFAULT_EXCHANGE,
     top_n: int = 20,
 ) -> tuple[list[CoinData], str]:
     """Fetch top coins with automatic fallback to the other exchange.
 
+    Both exchanges are read through the shared snapshot cache, so repeated
+    calls within ``SNAPSHOT_TTL`` seconds do not hit the network.  A slow
+    primary is hedged with the other exchange after its p95 latency, and a
+    consistently slow or failing *exchange* is demoted to secondary (see
+    ``ExchangeHealth.rank``).
+
     Returns:
         Tuple of (coins list, exchange name that was actually used).
     """
-    primary = exchange
-    fallback = "binance" if primary == "bitvavo" else "bitvavo"
+    snapshot = _hedged_snapshot(exchange)
+    return snapshot.coins[:top_n], snapshot.source
 
-    # Try primary
-    try:
-        with get_exchange_client(primary, top_n=top_n) as client:
-            coins = client.get_top_coins()
-            return coins, client.name
-    except (httpx.HTTPStatusError, httpx.ConnectError, httpx.TimeoutException):
-        pass
 
-    # Try fallback -- if this also fails, the exception propagates to the caller
-    with get_exchange_client(fallback, top_n=top_n) as client:
-        coins = client.get_top_coins()
-        return coins, client.name
+async def get_top_coins_with_fallback_async(
+    exchange: str = DEFAULT_EXCHANGE,
+    top_n: int = 20,
+) -> tuple[list[CoinData], str]:
+    """Async variant of :func:`get_top_coins_with_fallback`.
+
+    Never blocks the event loop, so several requests can be in flight at once.
+
+    Returns:
+        Tuple of (coins list, exchange name that was actually used).
+    """
+    snapshot = await _hedged_snapshot_async(exchange)
+    return snapshot.coins[:top_n], snapshot.source
+
+
+# ---------------------------------------------------------------------------
+# Consolidated multi-exchange view
+# ---------------------------------------------------------------------------
+
+def consolidate_snapshots(snapshots: dict[str, TickerSnapshot]) -> list[ConsolidatedCoin]:
+    """Merge per-exchange snapshots by symbol, sorted by total volume_eur descending.
+
+    Price and 24h change are weighted by each exchange's EUR volume (plain
+    averages if every volume is zero).
+    """
+    quotes: dict[str, list[tuple[str, CoinData]]] = {}
+    for exchange in sorted(snapshots):
+        for coin in snapshots[exchange].coins:
+            quotes.setdefault(coin.symbol, []).append((exchange, coin))
+
+    merged: list[ConsolidatedCoin] = []
+    for symbol, listed in quotes.items():
+        volume_eur = sum(c.volume_eur for _, c in listed)
+        if volume_eur > 0:
+            weights = [c.volume_eur / volume_eur for _, c in listed]
+        else:
+            weights = [1 / len(listed)] * len(listed)
+        prices = {exchange: c.price for exchange, c in listed}
+        low, high = min(prices.values()), max(prices.values())
+        merged.append(
+            ConsolidatedCoin(
+                symbol=symbol,
+                name=next((c.name for _, c in listed if c.name != symbol), symbol),
+                price=sum(w * c.price for w, (_, c) in zip(weights, listed)),
+                change_24h=sum(w * c.change_24h for w, (_, c) in zip(weights, listed)),
+                volume=sum(c.volume for _, c in listed),
+                volume_eur=volume_eur,
+                prices=prices,
+                spread_pct=(high - low) / low * 100 if low else 0.0,
+            )
+        )
+    merged.sort(key=lambda c: c.volume_eur, reverse=True)
+    return merged
+
+
+def _consolidated_result(
+    results: dict[str, TickerSnapshot | BaseException],
+    top_n: int,
+) -> tuple[list[ConsolidatedCoin], str]:
+    """Merge the successful fetches; re-raise the first error if none succeeded."""
+    snapshots = {e: r for e, r in results.items() if isinstance(r, TickerSnapshot)}
+    if not snapshots:
+        raise next(iter(results.values()))
+    source = " + ".join(snapshots[e].source for e in sorted(snapshots))
+    return consolidate_snapshots(snapshots)[:top_n], source
+
+
+def get_consolidated_coins(top_n: int = 20) -> tuple[list[ConsolidatedCoin], str]:
+    """Fetch every exchange concurrently and return the merged top coins.
+
+    The wait is that of the slowest exchange, not the sum.  Exchanges that
+    fail are left out; if all fail, the first error propagates.
+
+    Returns:
+        Tuple of (consolidated coins, "+"-joined names of the exchanges used).
+    """
+    futures = {
+        e: _snapshot_cache.submit(e, lambda e=e: _fetch_snapshot(e), _fanout)
+        for e in sorted(EXCHANGES)
+    }
+    results: dict[str, TickerSnapshot | BaseException] = {}
+    for exchange, future in futures.items():
+        try:
+            results[exchange] = future.result()
+        except _FETCH_ERRORS as exc:
+            results[exchange] = exc
+    return _consolidated_result(results, top_n)
+
+
+async def get_consolidated_coins_async(top_n: int = 20) -> tuple[list[ConsolidatedCoin], str]:
+    """Async variant of :func:`get_consolidated_coins`."""
+    exchanges = sorted(EXCHANGES)
+    snapshots = await asyncio.gather(
+        *(get_ticker_snapshot_async(e) for e in exchanges),
+        return_exceptions=True,
+    )
+    results: dict[str, TickerSnapshot | BaseException] = {}
+    for exchange, result in zip(exchanges, snapshots):
+        if isinstance(result, BaseException) and not isinstance(result, _FETCH_ERRORS):
+            raise result
+        results[exchange] = result
+    return _consolidated_result(results, top_n)
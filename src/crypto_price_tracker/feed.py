@@ -0,0 +1,313 @@
+"""Shared background price feed for SSE subscribers.
+
+A single ``PriceFeed`` task polls each exchange that has at least one
+subscriber once per interval, checks and marks alerts once, and fans the
+resulting ``PriceTick`` out to every subscriber through a small bounded
+queue.  Slow consumers never block the poller: when a subscriber's queue is
+full, its oldest pending tick is dropped in favour of the new one.  A failed
+poll is logged and skipped; the poller retries on the next interval.
+
+Ticks memoize their serialized SSE payload per ``top`` value, so a frame is
+JSON-encoded once per tick no matter how many clients receive it.  Delta
+frames (only the coins and fields that changed since an earlier tick) are
+memoized the same way per ``(base tick, top)``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import json
+import logging
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+import httpx
+
+from crypto_price_tracker.alerts import check_alerts
+from crypto_price_tracker.alerts_db import get_alert_index, mark_triggered_many
+from crypto_price_tracker.exchange import get_top_coins_with_fallback_async
+from crypto_price_tracker.models import CoinData, PriceAlert
+
+FEED_INTERVAL = 10.0  # seconds between polls
+FEED_DEPTH = 100  # coins fetched per poll (the largest ``top`` a client may ask for)
+FEED_QUEUE_SIZE = 2  # pending ticks per subscriber before stale ones are dropped
+FEED_KEYFRAME_EVERY = 30  # delta-mode events per full keyframe (~5 min at FEED_INTERVAL)
+
+logger = logging.getLogger(__name__)
+
+_COIN_FIELDS = tuple(f.name for f in dataclasses.fields(CoinData) if f.name != "symbol")
+
+PollFn = Callable[[str, int], Awaitable[tuple[list[CoinData], str, list[PriceAlert]]]]
+
+
+# ---------------------------------------------------------------------------
+# Data structures
+# ---------------------------------------------------------------------------
+
+@dataclass(slots=True)
+class PriceTick:
+    """One poll result for one exchange.
+
+    Fields:
+        seq:              Monotonic tick number across the whole feed
+        exchange:         Requested exchange key (e.g. "bitvavo")
+        source:           Exchange name that actually served the data
+        coins:            Top ``FEED_DEPTH`` coins, sorted by volume_eur descending
+        triggered_alerts: Alerts that fired (and were marked) on this tick
+        created_at:       ``time.monotonic()`` timestamp of the poll
+    """
+
+    seq: int
+    exchange: str
+    source: str
+    coins: list[CoinData]
+    triggered_alerts: list[PriceAlert]
+    created_at: float
+    # init=False: ``dataclasses.replace`` gives a copy fresh memos instead of sharing these
+    _frames: dict[int, str] = field(init=False, default_factory=dict, repr=False, compare=False)
+    _deltas: dict[tuple[int, int], str] = field(init=False, default_factory=dict, repr=False, compare=False)
+
+    def frame(self, top: int) -> str:
+        """Return the serialized ``prices`` event payload for the top *top* coins."""
+        raw = self._frames.get(top)
+        if raw is None:
+            raw = json.dumps(
+                {
+                    "coins": [dataclasses.asdict(c) for c in self.coins[:top]],
+                    "triggered_alerts": [dataclasses.asdict(a) for a in self.triggered_alerts],
+                    "exchange": self.source,
+                }
+            )
+            self._frames[top] = raw
+        return raw
+
+    def delta_frame(self, base: PriceTick, top: int) -> str:
+        """Return the serialized ``delta`` event payload from *base* to this tick.
+
+        ``coins`` maps each symbol whose data changed to its changed fields
+        (all fields for a coin new to the top *top*).  ``removed`` and
+        ``order`` (the full symbol order) are present only when the set or
+        order of coins changed.  ``base`` is *base*'s ``seq``, so a client
+        can tell whether it holds the state the delta applies to.
+        """
+        key = (base.seq, top)
+        raw = self._deltas.get(key)
+        if raw is None:
+            before = {c.symbol: c for c in base.coins[:top]}
+            coins: dict[str, dict] = {}
+            for coin in self.coins[:top]:
+                old = before.get(coin.symbol)
+                if old is None:
+                    coins[coin.symbol] = dataclasses.asdict(coin)
+                elif old != coin:
+                    coins[coin.symbol] = {
+                        name: getattr(coin, name)
+                        for name in _COIN_FIELDS
+                        if getattr(coin, name) != getattr(old, name)
+                    }
+            payload = {
+                "base": base.seq,
+                "coins": coins,
+                "triggered_alerts": [dataclasses.asdict(a) for a in self.triggered_alerts],
+                "exchange": self.source,
+            }
+            order = [c.symbol for c in self.coins[:top]]
+            removed = before.keys() - set(order)
+            if removed:
+                payload["removed"] = sorted(removed)
+            if order != list(before):
+                payload["order"] = order
+            raw = json.dumps(payload)
+            self._deltas[key] = raw
+        return raw
+
+
+class Subscription:
+    """A single subscriber's bounded inbox of price ticks.
+
+    Iterating with ``async for`` yields ticks until the subscription is
+    closed (``PriceFeed.stop`` closes every subscription).
+    """
+
+    def __init__(self, exchange: str, maxsize: int = FEED_QUEUE_SIZE) -> None:
+        self.exchange = exchange
+        self.dropped = 0
+        self._queue: asyncio.Queue[PriceTick | None] = asyncio.Queue(maxsize=maxsize)
+
+    def offer(self, tick: PriceTick | None) -> None:
+        """Enqueue *tick*, discarding the oldest pending tick if the inbox is full."""
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(tick)
+
+    def close(self) -> None:
+        """End iteration once the ticks already queued have been consumed."""
+        self.offer(None)
+
+    async def get(self) -> PriceTick | None:
+        """Wait for and return the next tick (*None* once closed)."""
+        return await self._queue.get()
+
+    def __aiter__(self) -> Subscription:
+        return self
+
+    async def __anext__(self) -> PriceTick:
+        tick = await self._queue.get()
+        if tick is None:
+            self._queue.put_nowait(None)  # stay closed for later readers
+            raise StopAsyncIteration
+        return tick
+
+
+# ---------------------------------------------------------------------------
+# Polling
+# ---------------------------------------------------------------------------
+
+def _check_and_mark_alerts(coins: list[CoinData]) -> list[PriceAlert]:
+    """Check active alerts against *coins* and mark the triggered ones (blocking)."""
+    triggered = check_alerts(coins, get_alert_index())
+    flipped = mark_triggered_many([a.id for a in triggered])
+    return [a for a in triggered if a.id in flipped]
+
+
+async def poll_prices(exchange: str, top_n: int) -> tuple[list[CoinData], str, list[PriceAlert]]:
+    """Fetch prices, check active alerts, and mark the triggered ones.
+
+    The upstream fetch is natively async (and records the snapshot in the
+    tick history); SQLite work runs in a worker thread, so the event loop is
+    never blocked.
+    """
+    coins, source = await get_top_coins_with_fallback_async(exchange=exchange, top_n=top_n)
+    triggered = await asyncio.to_thread(_check_and_mark_alerts, coins)
+    return coins, source, triggered
+
+
+class PriceFeed:
+    """App-wide poller that feeds every SSE price subscriber.
+
+    Usage:
+        feed = PriceFeed()
+        await feed.start()
+        sub = feed.subscribe("bitvavo")
+        tick = await sub.get()
+        feed.unsubscribe(sub)
+        await feed.stop()
+    """
+
+    def __init__(
+        self,
+        interval: float = FEED_INTERVAL,
+        depth: int = FEED_DEPTH,
+        queue_size: int = FEED_QUEUE_SIZE,
+        poll: PollFn = poll_prices,
+    ) -> None:
+        self.interval = interval
+        self.depth = depth
+        self.queue_size = queue_size
+        self._poll = poll
+        self._subscribers: dict[str, set[Subscription]] = defaultdict(set)
+        self._latest: dict[str, PriceTick] = {}
+        self._seq = 0
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """Start the background polling task (no-op if already running)."""
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancel the background polling task, wait for it, and close every subscription."""
+        for subs in self._subscribers.values():
+            for sub in subs:
+                sub.close()
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def subscribe(self, exchange: str) -> Subscription:
+        """Register a subscriber for *exchange* and return its inbox.
+
+        A recent tick is delivered immediately (without its alerts, which
+        were already announced); otherwise the poller is woken up early.
+        """
+        sub = Subscription(exchange, maxsize=self.queue_size)
+        self._subscribers[exchange].add(sub)
+        latest = self._latest.get(exchange)
+        if latest is not None and (time.monotonic() - latest.created_at) < self.interval:
+            sub.offer(dataclasses.replace(latest, triggered_alerts=[]))
+        else:
+            self._wake.set()
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        """Remove a subscriber; polling for its exchange stops with the last one."""
+        subs = self._subscribers.get(sub.exchange)
+        if subs is not None:
+            subs.discard(sub)
+            if not subs:
+                del self._subscribers[sub.exchange]
+
+    def subscriber_count(self, exchange: str | None = None) -> int:
+        """Return the number of subscribers, optionally for a single exchange."""
+        if exchange is not None:
+            return len(self._subscribers.get(exchange, ()))
+        return sum(len(subs) for subs in self._subscribers.values())
+
+    async def poll_once(self) -> list[PriceTick]:
+        """Poll every subscribed exchange concurrently and publish the ticks."""
+        exchanges = list(self._subscribers)
+        results = await asyncio.gather(*(self._poll_exchange(e) for e in exchanges))
+        ticks = [tick for tick in results if tick is not None]
+        for tick in ticks:
+            self._publish(tick)
+        return ticks
+
+    async def _poll_exchange(self, exchange: str) -> PriceTick | None:
+        try:
+            coins, source, triggered = await self._poll(exchange, self.depth)
+        except (httpx.HTTPStatusError, httpx.ConnectError, httpx.TimeoutException) as e:
+            logger.warning("Price feed poll for %s failed: %s", exchange, e)
+            return None  # keep serving subscribers; retry next interval
+        except Exception:
+            # e.g. a locked database or a malformed upstream response: the
+            # poller is shared by every subscriber, so it must survive
+            logger.exception("Price feed poll for %s failed", exchange)
+            return None
+        self._seq += 1
+        return PriceTick(
+            seq=self._seq,
+            exchange=exchange,
+            source=source,
+            coins=coins,
+            triggered_alerts=triggered,
+            created_at=time.monotonic(),
+        )
+
+    def _publish(self, tick: PriceTick) -> None:
+        self._latest[tick.exchange] = tick
+        for sub in list(self._subscribers.get(tick.exchange, ())):
+            sub.offer(tick)
+
+    async def _run(self) -> None:
+        while True:
+            self._wake.clear()
+            if self._subscribers:
+                await self.poll_once()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.interval)
+            except TimeoutError:
+                pass
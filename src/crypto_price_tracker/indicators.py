@@ -0,0 +1,276 @@
+"""Technical indicator engine over columnar candle histories.
+
+All indicators operate directly on the NumPy columns of a ``CandleSeries``
+and return arrays aligned with its candles (``NaN`` until an indicator has
+enough history).  ``compute_indicators`` evaluates the full set for one
+market, sharing intermediates such as the previous-close column, and
+``compute_indicators_batch`` does the same for many markets at once.
+
+Like ``alerts`` and ``portfolio``, this module is pure: it never fetches
+candles or touches the database.
+
+Exports:
+    sma, ema, rsi, macd, bollinger_bands, atr, vwap, volatility
+    IndicatorSet, compute_indicators, compute_indicators_batch
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Hashable, TypeVar
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from crypto_price_tracker.models import INTERVAL_SECONDS, CandleSeries
+
+SMA_PERIOD = 20
+EMA_PERIOD = 20
+RSI_PERIOD = 14
+MACD_FAST = 12
+MACD_SLOW = 26
+MACD_SIGNAL = 9
+BOLLINGER_PERIOD = 20
+BOLLINGER_WIDTH = 2.0
+ATR_PERIOD = 14
+VOLATILITY_PERIOD = 20
+
+SECONDS_PER_YEAR = 365 * 86400  # with INTERVAL_SECONDS, annualizes volatility
+
+K = TypeVar("K", bound=Hashable)
+
+
+# ---------------------------------------------------------------------------
+# Internal helpers
+# ---------------------------------------------------------------------------
+
+def _nan(n: int) -> np.ndarray:
+    return np.full(n, np.nan)
+
+
+def _smooth(values: np.ndarray, period: int, alpha: float) -> np.ndarray:
+    """Exponential smoothing seeded with the mean of the first *period* values.
+
+    NaNs at the start of *values* are skipped, so smoothed series (e.g. the
+    MACD line) can be smoothed again.  The recurrence is inherently
+    sequential, so it runs as a plain float loop over the column.
+    """
+    out = _nan(len(values))
+    valid = np.flatnonzero(~np.isnan(values))
+    if len(valid) < period:
+        return out
+    first = valid[0]
+    seed_end = first + period
+    acc = float(values[first:seed_end].mean())
+    out[seed_end - 1] = acc
+    result = out.tolist()
+    for i, value in enumerate(values[seed_end:].tolist(), start=seed_end):
+        acc += alpha * (value - acc)
+        result[i] = acc
+    return np.array(result)
+
+
+# ---------------------------------------------------------------------------
+# Indicators
+# ---------------------------------------------------------------------------
+
+def sma(values: np.ndarray, period: int = SMA_PERIOD) -> np.ndarray:
+    """Simple moving average over *period* values."""
+    out = _nan(len(values))
+    if len(values) >= period:
+        out[period - 1:] = sliding_window_view(values, period).mean(axis=1)
+    return out
+
+
+def ema(values: np.ndarray, period: int = EMA_PERIOD) -> np.ndarray:
+    """Exponential moving average (``alpha = 2 / (period + 1)``), seeded with the SMA."""
+    return _smooth(values, period, 2.0 / (period + 1))
+
+
+def rsi(close: np.ndarray, period: int = RSI_PERIOD) -> np.ndarray:
+    """Relative Strength Index with Wilder smoothing (0-100)."""
+    out = _nan(len(close))
+    if len(close) <= period:
+        return out
+    delta = np.diff(close)
+    avg_gain = _smooth(np.clip(delta, 0.0, None), period, 1.0 / period)
+    avg_loss = _smooth(np.clip(-delta, 0.0, None), period, 1.0 / period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    values = np.where(avg_loss == 0.0, 100.0, values)
+    values[np.isnan(avg_gain)] = np.nan
+    out[1:] = values
+    return out
+
+
+def macd(
+    close: np.ndarray,
+    fast: int = MACD_FAST,
+    slow: int = MACD_SLOW,
+    signal: int = MACD_SIGNAL,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return ``(macd_line, signal_line, histogram)``."""
+    line = ema(close, fast) - ema(close, slow)
+    signal_line = ema(line, signal)
+    return line, signal_line, line - signal_line
+
+
+def bollinger_bands(
+    close: np.ndarray,
+    period: int = BOLLINGER_PERIOD,
+    width: float = BOLLINGER_WIDTH,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return ``(upper, middle, lower)`` bands: SMA +/- *width* population std devs."""
+    middle = _nan(len(close))
+    spread = _nan(len(close))
+    if len(close) >= period:
+        windows = sliding_window_view(close, period)
+        middle[period - 1:] = windows.mean(axis=1)
+        spread[period - 1:] = width * windows.std(axis=1)
+    return middle + spread, middle, middle - spread
+
+
+def atr(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    period: int = ATR_PERIOD,
+) -> np.ndarray:
+    """Average True Range with Wilder smoothing."""
+    if len(close) == 0:
+        return _nan(0)
+    prev_close = np.concatenate(([close[0]], close[:-1]))
+    true_range = np.maximum(high, prev_close) - np.minimum(low, prev_close)
+    return _smooth(true_range, period, 1.0 / period)
+
+
+def vwap(
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    volume: np.ndarray,
+) -> np.ndarray:
+    """Volume-weighted average typical price, anchored at the first candle."""
+    typical = (high + low + close) / 3.0
+    cum_volume = np.cumsum(volume)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = np.cumsum(typical * volume) / cum_volume
+    return np.where(cum_volume > 0, values, np.nan)
+
+
+def volatility(
+    close: np.ndarray,
+    period: int = VOLATILITY_PERIOD,
+    interval: str | None = None,
+) -> np.ndarray:
+    """Rolling standard deviation of log returns over *period* candles.
+
+    When *interval* is given (e.g. "1d"), the result is annualized.
+    """
+    out = _nan(len(close))
+    if len(close) <= period:
+        return out
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.diff(np.log(close))
+    out[period:] = sliding_window_view(returns, period).std(axis=1, ddof=1)
+    if interval is not None:
+        out *= math.sqrt(SECONDS_PER_YEAR / INTERVAL_SECONDS[interval])
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Indicator sets
+# ---------------------------------------------------------------------------
+
+@dataclass(slots=True, eq=False)
+class IndicatorSet:
+    """All indicators for one candle series, aligned with its candles.
+
+    Fields:
+        timestamp:   Candle timestamps (Unix ms)
+        close:       Closing prices
+        sma:         ``SMA_PERIOD`` simple moving average of close
+        ema:         ``EMA_PERIOD`` exponential moving average of close
+        rsi:         ``RSI_PERIOD`` RSI of close
+        macd:        MACD line (``MACD_FAST`` EMA - ``MACD_SLOW`` EMA)
+        macd_signal: ``MACD_SIGNAL`` EMA of the MACD line
+        macd_hist:   MACD line - signal line
+        bb_upper:    Upper Bollinger band
+        bb_middle:   Middle Bollinger band
+        bb_lower:    Lower Bollinger band
+        atr:         ``ATR_PERIOD`` Average True Range
+        vwap:        VWAP anchored at the first candle
+        volatility:  Rolling log-return volatility (annualized if the interval is known)
+    """
+
+    timestamp: np.ndarray
+    close: np.ndarray
+    sma: np.ndarray
+    ema: np.ndarray
+    rsi: np.ndarray
+    macd: np.ndarray
+    macd_signal: np.ndarray
+    macd_hist: np.ndarray
+    bb_upper: np.ndarray
+    bb_middle: np.ndarray
+    bb_lower: np.ndarray
+    atr: np.ndarray
+    vwap: np.ndarray
+    volatility: np.ndarray
+
+    def latest(self) -> dict[str, float | int | None]:
+        """Return the newest value of every field (``None`` where not yet defined)."""
+        result: dict[str, float | int | None] = {}
+        for name in self.__slots__:
+            column = getattr(self, name)
+            value = column[-1].item() if len(column) else None
+            result[name] = None if isinstance(value, float) and math.isnan(value) else value
+        return result
+
+    def to_dict(self) -> dict[str, list]:
+        """Return every column as a JSON-ready list (``NaN`` becomes ``None``)."""
+        result: dict[str, list] = {}
+        for name in self.__slots__:
+            column = getattr(self, name)
+            if column.dtype.kind == "f":
+                result[name] = [None if math.isnan(v) else v for v in column.tolist()]
+            else:
+                result[name] = column.tolist()
+        return result
+
+
+def compute_indicators(series: CandleSeries, interval: str | None = None) -> IndicatorSet:
+    """Evaluate every indicator over *series* in one pass.
+
+    Args:
+        series:   Chronological candle history.
+        interval: Candle interval (e.g. "4h"); annualizes the volatility if given.
+    """
+    close = series.close
+    macd_line, signal_line, hist = macd(close)
+    upper, middle, lower = bollinger_bands(close)
+    return IndicatorSet(
+        timestamp=series.timestamp,
+        close=close,
+        sma=sma(close),
+        ema=ema(close),
+        rsi=rsi(close),
+        macd=macd_line,
+        macd_signal=signal_line,
+        macd_hist=hist,
+        bb_upper=upper,
+        bb_middle=middle,
+        bb_lower=lower,
+        atr=atr(series.high, series.low, close),
+        vwap=vwap(series.high, series.low, close, series.volume),
+        volatility=volatility(close, interval=interval),
+    )
+
+
+def compute_indicators_batch(
+    series_by_key: dict[K, CandleSeries],
+    interval: str | None = None,
+) -> dict[K, IndicatorSet]:
+    """Evaluate :func:`compute_indicators` for many markets (e.g. ``get_candles_batch`` output)."""
+    return {key: compute_indicators(series, interval) for key, series in series_by_key.items()}
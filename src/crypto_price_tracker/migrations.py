@@ -0,0 +1,272 @@
+"""Versioned schema migrations for the shared SQLite database.
+
+The database's ``PRAGMA user_version`` records how many entries of
+``MIGRATIONS`` have been applied.  ``migrate`` applies the missing ones in
+order inside one ``BEGIN IMMEDIATE`` transaction, so two processes starting
+at the same time cannot both apply a step, and a failing step leaves the
+database at its previous version.
+
+Append new migrations to the end of ``MIGRATIONS``; never edit or reorder
+one that has shipped.  Migration 1 is the baseline schema: its ``IF NOT
+EXISTS`` clauses let it adopt databases created before versioning existed
+(``user_version`` 0).
+
+Migrations run once per database per process, when ``db`` first opens a
+connection to it (``db.migrate()`` at app/CLI startup).
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from typing import Callable
+
+Migration = Callable[[sqlite3.Connection], None]
+
+
+# ---------------------------------------------------------------------------
+# Migrations
+# ---------------------------------------------------------------------------
+
+def _create_tables(conn: sqlite3.Connection) -> None:
+    """Baseline: holdings, alerts, watchlist and candles tables."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS holdings (
+            id        INTEGER PRIMARY KEY AUTOINCREMENT,
+            symbol    TEXT NOT NULL,
+            amount    REAL NOT NULL CHECK(amount > 0),
+            buy_price REAL NOT NULL CHECK(buy_price > 0),
+            buy_date  TEXT NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS alerts (
+            id            INTEGER PRIMARY KEY AUTOINCREMENT,
+            symbol        TEXT NOT NULL,
+            target_price  REAL NOT NULL CHECK(target_price > 0),
+            direction     TEXT NOT NULL CHECK(direction IN ('above', 'below')),
+            status        TEXT NOT NULL DEFAULT 'active' CHECK(status IN ('active', 'triggered')),
+            created_at    TEXT NOT NULL,
+            triggered_at  TEXT
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS watchlist (
+            id       INTEGER PRIMARY KEY AUTOINCREMENT,
+            symbol   TEXT NOT NULL UNIQUE,
+            tags     TEXT NOT NULL DEFAULT '',
+            added_at TEXT NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS candles (
+            market     TEXT    NOT NULL,
+            interval   TEXT    NOT NULL,
+            timestamp  INTEGER NOT NULL,
+            open       REAL    NOT NULL,
+            high       REAL    NOT NULL,
+            low        REAL    NOT NULL,
+            close      REAL    NOT NULL,
+            volume     REAL    NOT NULL,
+            PRIMARY KEY (market, interval, timestamp)
+        ) WITHOUT ROWID
+        """
+    )
+
+
+def _add_query_indexes(conn: sqlite3.Connection) -> None:
+    """Indexes for the filtered/ordered list queries, which were full scans + sorts."""
+    # get_active_alerts: WHERE status = 'active' ORDER BY created_at
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_alerts_status_created ON alerts (status, created_at)")
+    # get_all_holdings / get_holdings_by_symbol: [WHERE symbol = ?] ORDER BY (symbol,) buy_date
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_holdings_symbol_date ON holdings (symbol, buy_date)")
+    # get_all_watchlist_entries: [tag filter] ORDER BY added_at
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_watchlist_added ON watchlist (added_at)")
+
+
+def _normalize_watchlist_tags(conn: sqlite3.Connection) -> None:
+    """Move watchlist tags into an indexed ``watchlist_tags`` join table.
+
+    ``watchlist.tags`` stays as the comma-joined display copy; the join table
+    is what tag filters query.
+    """
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS watchlist_tags (
+            symbol TEXT NOT NULL REFERENCES watchlist (symbol) ON DELETE CASCADE,
+            tag    TEXT NOT NULL,
+            PRIMARY KEY (symbol, tag)
+        ) WITHOUT ROWID
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_watchlist_tags_tag ON watchlist_tags (tag)")
+    rows = conn.execute("SELECT symbol, tags FROM watchlist WHERE tags != ''").fetchall()
+    conn.executemany(
+        "INSERT OR IGNORE INTO watchlist_tags (symbol, tag) VALUES (?, ?)",
+        [(symbol, tag) for symbol, tags in rows for tag in tags.split(",") if tag],
+    )
+
+
+def _add_holding_rollups(conn: sqlite3.Connection) -> None:
+    """Per-symbol holding totals, kept current by triggers on ``holdings``.
+
+    The triggers apply each lot's delta, so every writer (single adds, bulk
+    imports, edits, removals, other processes) updates the rollup in the
+    same transaction as the lot itself.
+    """
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS holding_rollups (
+            symbol       TEXT    PRIMARY KEY,
+            num_lots     INTEGER NOT NULL,
+            total_amount REAL    NOT NULL,
+            total_cost   REAL    NOT NULL
+        ) WITHOUT ROWID
+        """
+    )
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS holdings_rollup_insert AFTER INSERT ON holdings
+        BEGIN
+            INSERT INTO holding_rollups (symbol, num_lots, total_amount, total_cost)
+            VALUES (NEW.symbol, 1, NEW.amount, NEW.amount * NEW.buy_price)
+            ON CONFLICT (symbol) DO UPDATE SET
+                num_lots = num_lots + 1,
+                total_amount = total_amount + excluded.total_amount,
+                total_cost = total_cost + excluded.total_cost;
+        END
+        """
+    )
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS holdings_rollup_delete AFTER DELETE ON holdings
+        BEGIN
+            UPDATE holding_rollups SET
+                num_lots = num_lots - 1,
+                total_amount = total_amount - OLD.amount,
+                total_cost = total_cost - OLD.amount * OLD.buy_price
+            WHERE symbol = OLD.symbol;
+            DELETE FROM holding_rollups WHERE symbol = OLD.symbol AND num_lots <= 0;
+        END
+        """
+    )
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS holdings_rollup_update
+        AFTER UPDATE OF symbol, amount, buy_price ON holdings
+        BEGIN
+            UPDATE holding_rollups SET
+                num_lots = num_lots - 1,
+                total_amount = total_amount - OLD.amount,
+                total_cost = total_cost - OLD.amount * OLD.buy_price
+            WHERE symbol = OLD.symbol;
+            DELETE FROM holding_rollups WHERE symbol = OLD.symbol AND num_lots <= 0;
+            INSERT INTO holding_rollups (symbol, num_lots, total_amount, total_cost)
+            VALUES (NEW.symbol, 1, NEW.amount, NEW.amount * NEW.buy_price)
+            ON CONFLICT (symbol) DO UPDATE SET
+                num_lots = num_lots + 1,
+                total_amount = total_amount + excluded.total_amount,
+                total_cost = total_cost + excluded.total_cost;
+        END
+        """
+    )
+    conn.execute("DELETE FROM holding_rollups")
+    conn.execute(
+        """
+        INSERT INTO holding_rollups (symbol, num_lots, total_amount, total_cost)
+        SELECT symbol, COUNT(*), SUM(amount), SUM(amount * buy_price)
+        FROM holdings GROUP BY symbol
+        """
+    )
+
+
+def _add_tick_history(conn: sqlite3.Connection) -> None:
+    """Raw price ticks plus their 1m/1h/1d OHLC buckets (see ``ticks_db``).
+
+    ``ticks`` is clustered by time, so appends go to the end of the B-tree
+    and retention deletes a leading range; per-symbol range queries use the
+    secondary index.
+    """
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS ticks (
+            timestamp  INTEGER NOT NULL,
+            symbol     TEXT    NOT NULL,
+            exchange   TEXT    NOT NULL,
+            price      REAL    NOT NULL,
+            volume_eur REAL    NOT NULL,
+            change_24h REAL    NOT NULL,
+            PRIMARY KEY (timestamp, symbol, exchange)
+        ) WITHOUT ROWID
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_ticks_symbol_time ON ticks (symbol, exchange, timestamp)")
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS tick_buckets (
+            symbol    TEXT    NOT NULL,
+            exchange  TEXT    NOT NULL,
+            interval  TEXT    NOT NULL,
+            timestamp INTEGER NOT NULL,
+            open      REAL    NOT NULL,
+            high      REAL    NOT NULL,
+            low       REAL    NOT NULL,
+            close     REAL    NOT NULL,
+            volume    REAL    NOT NULL,
+            ticks     INTEGER NOT NULL,
+            PRIMARY KEY (symbol, exchange, interval, timestamp)
+        ) WITHOUT ROWID
+        """
+    )
+    # Retention: DELETE ... WHERE interval = ? AND timestamp < ?
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_tick_buckets_interval_time ON tick_buckets (interval, timestamp)")
+
+
+MIGRATIONS: tuple[Migration, ...] = (
+    _create_tables,
+    _add_query_indexes,
+    _normalize_watchlist_tags,
+    _add_holding_rollups,
+    _add_tick_history,
+)
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Return the database's ``PRAGMA user_version``."""
+    cursor = conn.execute("PRAGMA user_version")
+    cursor.row_factory = None
+    return cursor.fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """Apply every pending migration to *conn*'s database.  Return the resulting version.
+
+    A database newer than this code (e.g. after a downgrade) is left untouched.
+    """
+    version = get_schema_version(conn)
+    if version >= SCHEMA_VERSION:
+        return version
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # Re-read under the write lock: another process may have migrated meanwhile.
+        version = get_schema_version(conn)
+        for step in MIGRATIONS[version:]:
+            step(conn)
+        if version < SCHEMA_VERSION:
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    return max(version, SCHEMA_VERSION)
@@ -1,6 +1,11 @@
 """Data models for the crypto price tracker."""
 
-from dataclasses import dataclass
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass, field
+
+import numpy as np
 
 
 @dataclass(slots=True)
@@ -24,6 +29,34 @@ class CoinData:
     volume_eur: float
 
 
+@dataclass(slots=True)
+class ConsolidatedCoin:
+    """One coin's market data merged across exchanges.
+
+    Has the same core fields as CoinData, so it can be used wherever a coin
+    list is rendered or checked against alerts.
+
+    Fields:
+        symbol:     Ticker symbol (e.g. "BTC")
+        name:       Human-readable name (the first exchange that has one)
+        price:      Volume-weighted average price in EUR across exchanges
+        change_24h: Volume-weighted 24h price change as a percentage
+        volume:     24h trading volume in the base asset, summed over exchanges
+        volume_eur: 24h trading volume in EUR, summed over exchanges
+        prices:     Exchange key -> price in EUR on that exchange
+        spread_pct: (highest - lowest price) / lowest price * 100; 0 on one exchange
+    """
+
+    symbol: str
+    name: str
+    price: float
+    change_24h: float
+    volume: float
+    volume_eur: float
+    prices: dict[str, float] = field(default_factory=dict)
+    spread_pct: float = 0.0
+
+
 @dataclass(slots=True)
 class Holding:
     """A single portfolio holding (one lot).
@@ -43,6 +76,71 @@ class Holding:
     buy_date: str
 
 
+@dataclass(slots=True)
+class HoldingRollup:
+    """Per-symbol totals over all lots (one row of ``holding_rollups``).
+
+    Fields:
+        symbol:       Coin ticker symbol (e.g. "BTC")
+        num_lots:     Number of lots held
+        total_amount: Sum of the lots' amounts
+        total_cost:   Sum of amount * buy_price over the lots, in EUR
+    """
+
+    symbol: str
+    num_lots: int
+    total_amount: float
+    total_cost: float
+
+
+@dataclass(slots=True, eq=False)
+class HoldingColumns:
+    """Portfolio lots as columns, with symbols factorized to integer codes.
+
+    Per-symbol totals are grouped reductions over ``codes`` (e.g.
+    ``np.bincount(codes, weights=amount)``).  Symbols keep their order of
+    first appearance, so groups come out in the same order as grouping the
+    lots one by one.
+
+    Fields:
+        symbols:   Distinct symbols, in order of first appearance
+        codes:     int64 index into ``symbols`` for each lot
+        amount:    float64 quantity of each lot
+        buy_price: float64 buy price per unit of each lot, in EUR
+    """
+
+    symbols: list[str]
+    codes: np.ndarray
+    amount: np.ndarray
+    buy_price: np.ndarray
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Sequence]) -> HoldingColumns:
+        """Build columns from ``(symbol, amount, buy_price)`` rows."""
+        index: dict[str, int] = {}
+        codes: list[int] = []
+        amounts: list[float] = []
+        prices: list[float] = []
+        for symbol, amount, buy_price in rows:
+            codes.append(index.setdefault(symbol, len(index)))
+            amounts.append(amount)
+            prices.append(buy_price)
+        return cls(
+            list(index),
+            np.array(codes, dtype=np.int64),
+            np.array(amounts, dtype=np.float64),
+            np.array(prices, dtype=np.float64),
+        )
+
+    @classmethod
+    def from_holdings(cls, holdings: Iterable[Holding]) -> HoldingColumns:
+        """Build columns from Holding objects."""
+        return cls.from_rows((h.symbol, h.amount, h.buy_price) for h in holdings)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+
 @dataclass(slots=True)
 class PriceAlert:
     """A price alert for a cryptocurrency.
@@ -87,6 +185,134 @@ class Candle:
     volume: float
 
 
+CANDLE_FIELDS = ("timestamp", "open", "high", "low", "close", "volume")
+
+# Length of one candle per Bitvavo interval
+INTERVAL_SECONDS = {
+    "1m": 60,
+    "5m": 300,
+    "15m": 900,
+    "30m": 1800,
+    "1h": 3600,
+    "2h": 7200,
+    "4h": 14400,
+    "6h": 21600,
+    "8h": 28800,
+    "12h": 43200,
+    "1d": 86400,
+}
+
+
+@dataclass(slots=True)
+class Tick:
+    """One coin's price as recorded from one polled snapshot.
+
+    Fields:
+        timestamp:  Unix timestamp in milliseconds of the poll
+        symbol:     Coin ticker symbol (e.g. "BTC")
+        exchange:   Exchange key that served the price (e.g. "bitvavo")
+        price:      Price in EUR
+        volume_eur: 24h trading volume in EUR at that time
+        change_24h: 24h price change as a percentage at that time
+    """
+
+    timestamp: int
+    symbol: str
+    exchange: str
+    price: float
+    volume_eur: float
+    change_24h: float
+
+
+@dataclass(slots=True, eq=False)
+class CandleSeries:
+    """Columnar OHLCV history: one contiguous NumPy array per Candle field.
+
+    All columns have the same length and are in chronological order.
+    Indexing with an int returns a Candle built from the columns, and slicing
+    returns a CandleSeries sharing the same buffers, so a series can stand in
+    wherever a ``list[Candle]`` was used.
+
+    Fields:
+        timestamp: int64 Unix timestamps in milliseconds
+        open:      float64 opening prices in EUR
+        high:      float64 highest prices per interval
+        low:       float64 lowest prices per interval
+        close:     float64 closing prices in EUR
+        volume:    float64 volumes traded per interval
+    """
+
+    timestamp: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    @classmethod
+    def empty(cls) -> CandleSeries:
+        """Return a series with no candles."""
+        return cls.from_rows([])
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence], *, reverse: bool = False) -> CandleSeries:
+        """Build a series from ``[timestamp, open, high, low, close, volume]`` rows.
+
+        Values may be numbers or numeric strings (as in the Bitvavo candle
+        JSON arrays).  Pass ``reverse=True`` for newest-first input.
+        """
+        table = np.array(rows, dtype=np.float64).reshape(-1, len(CANDLE_FIELDS))
+        if reverse:
+            table = table[::-1]
+        columns = np.ascontiguousarray(table.T)
+        return cls(columns[0].astype(np.int64), *columns[1:])
+
+    @classmethod
+    def from_candles(cls, candles: CandleSeries | Sequence[Candle]) -> CandleSeries:
+        """Build a series from Candle objects (a CandleSeries is returned as-is)."""
+        if isinstance(candles, CandleSeries):
+            return candles
+        return cls.from_rows(
+            [(c.timestamp, c.open, c.high, c.low, c.close, c.volume) for c in candles]
+        )
+
+    @classmethod
+    def concat(cls, *series: CandleSeries) -> CandleSeries:
+        """Join series end to end (copies; a single non-empty series is returned as-is)."""
+        parts = [s for s in series if len(s)]
+        if len(parts) == 1:
+            return parts[0]
+        if not parts:
+            return cls.empty()
+        return cls(*(np.concatenate(cols) for cols in zip(*(s.columns() for s in parts))))
+
+    def columns(self) -> tuple[np.ndarray, ...]:
+        """Return the columns in ``CANDLE_FIELDS`` order."""
+        return (self.timestamp, self.open, self.high, self.low, self.close, self.volume)
+
+    def to_candles(self) -> list[Candle]:
+        """Materialize the series as a list of Candle objects."""
+        return [Candle(*row) for row in zip(*(col.tolist() for col in self.columns()))]
+
+    def to_records(self) -> list[dict]:
+        """Return JSON-ready candle dicts (the shape of ``dataclasses.asdict(Candle)``)."""
+        return [
+            dict(zip(CANDLE_FIELDS, row))
+            for row in zip(*(col.tolist() for col in self.columns()))
+        ]
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def __iter__(self) -> Iterator[Candle]:
+        return iter(self.to_candles())
+
+    def __getitem__(self, index: int | slice) -> Candle | CandleSeries:
+        if isinstance(index, slice):
+            return CandleSeries(*(col[index] for col in self.columns()))
+        return Candle(*(col[index].item() for col in self.columns()))
+
+
 @dataclass(slots=True)
 class WatchlistEntry:
     """A watchlist entry with optional category tags.
@@ -1,8 +1,17 @@
-"""Portfolio aggregation service and export utilities.
+"""Portfolio aggregation service and import/export utilities.
 
-This module computes aggregated portfolio views (per-coin summaries with P&L)
-and handles CSV/JSON export.  It does **not** touch the database directly --
-it takes ``list[Holding]`` as input.
+This module computes aggregated portfolio views (per-coin summaries with P&L),
+from Holding objects, ``HoldingColumns`` arrays for large lot counts, or the
+per-symbol ``HoldingRollup`` totals the database maintains, and handles
+CSV/JSON export and import.  It does **not** touch the database
+directly -- it takes ``list[Holding]`` as input, and ``import_holdings`` is
+given the function that inserts a batch (``portfolio_db.add_holdings``).
+
+Exports and imports both stream.  The ``iter_export_*`` generators emit the
+document in chunks of ``EXPORT_CHUNK_ROWS`` holdings from any iterable (such
+as ``portfolio_db.iter_holdings``).  On import, CSV rows and JSON objects are
+parsed one at a time, and validated and inserted ``IMPORT_BATCH_SIZE`` rows
+at a time.  In both directions memory use does not grow with the lot count.
 """
 
 from __future__ import annotations
@@ -10,10 +19,34 @@ from __future__ import annotations
 import csv
 import io
 import json
+import math
 from collections import defaultdict
-from dataclasses import asdict, dataclass
+from dataclasses import dataclass, field, replace
+from datetime import date
+from itertools import islice
+from operator import attrgetter
+from typing import Callable, Iterable, Iterator, Mapping, TextIO
+
+import numpy as np
+
+from crypto_price_tracker.models import CoinData, Holding, HoldingColumns, HoldingRollup
+
+EXPORT_FIELDS = ("id", "symbol", "amount", "buy_price", "buy_date")
+EXPORT_FORMATS = ("csv", "json", "ndjson")
+EXPORT_CHUNK_ROWS = 1000  # holdings serialized per emitted chunk
+
+IMPORT_BATCH_SIZE = 5000  # rows validated and inserted per transaction
+IMPORT_MAX_ERRORS = 100  # row errors kept in an ImportReport (all are counted)
+IMPORT_FORMATS = ("csv", "json")
+
+VALUATION_DELTA_THRESHOLD = 0.001  # relative value move (0.1%) before a row is reported again
+
+_export_row = attrgetter(*EXPORT_FIELDS)
 
-from crypto_price_tracker.models import CoinData, Holding
+_JSON_READ_SIZE = 64 * 1024
+_JSON_MAX_RECORD = 1024 * 1024  # larger undecodable spans are reported as malformed
+
+HoldingRow = tuple[str, float, float, str]  # (symbol, amount, buy_price, buy_date)
 
 
 # ---------------------------------------------------------------------------
@@ -48,6 +81,36 @@ class PortfolioSummary:
     total_pnl_pct: float
 
 
+@dataclass(slots=True)
+class ImportRowError:
+    """A record rejected during import (*row* is 1-based, header excluded)."""
+
+    row: int
+    message: str
+
+
+@dataclass(slots=True)
+class ImportReport:
+    """Outcome of a bulk holdings import.
+
+    Fields:
+        rows:     Records read from the input
+        imported: Holdings inserted
+        failed:   Records rejected (invalid, or unreadable input)
+        errors:   The first ``IMPORT_MAX_ERRORS`` rejections
+    """
+
+    rows: int = 0
+    imported: int = 0
+    failed: int = 0
+    errors: list[ImportRowError] = field(default_factory=list)
+
+    def reject(self, row: int, message: str) -> None:
+        self.failed += 1
+        if len(self.errors) < IMPORT_MAX_ERRORS:
+            self.errors.append(ImportRowError(row, message))
+
+
 # ---------------------------------------------------------------------------
 # Aggregation
 # ---------------------------------------------------------------------------
@@ -58,65 +121,129 @@ def aggregate_portfolio(
 ) -> PortfolioSummary:
     """Aggregate holdings into per-coin rows with P&L calculations."""
     if not holdings:
-        return PortfolioSummary(rows=[], total_value=0, total_cost=0, total_pnl_eur=0, total_pnl_pct=0)
+        return _empty_summary()
 
     # Group by symbol
     groups: dict[str, list[Holding]] = defaultdict(list)
     for h in holdings:
         groups[h.symbol].append(h)
 
+    return _summarize(
+        (
+            (
+                symbol,
+                len(lots),
+                sum(h.amount for h in lots),
+                sum(h.amount * h.buy_price for h in lots),
+            )
+            for symbol, lots in groups.items()
+        ),
+        prices,
+    )
+
+
+def aggregate_portfolio_columns(
+    columns: HoldingColumns,
+    prices: dict[str, CoinData],
+) -> PortfolioSummary:
+    """Array-backed ``aggregate_portfolio`` for large lot counts.
+
+    Per-symbol lot counts, amounts and cost bases are single ``bincount``
+    passes over the columns instead of Python loops over Holding objects;
+    only the per-symbol rows are built in Python.  The result equals
+    ``aggregate_portfolio`` on the same lots up to float summation order.
+
+    The app itself now uses ``aggregate_rollups``, which never reads the
+    lots; this path is kept as the reference for ``benchmarks/bench_portfolio.py``.
+    """
+    if not len(columns):
+        return _empty_summary()
+    k = len(columns.symbols)
+    num_lots = np.bincount(columns.codes, minlength=k)
+    total_amount = np.bincount(columns.codes, weights=columns.amount, minlength=k)
+    cost = np.bincount(columns.codes, weights=columns.amount * columns.buy_price, minlength=k)
+    return _summarize(
+        zip(columns.symbols, num_lots.tolist(), total_amount.tolist(), cost.tolist()),
+        prices,
+    )
+
+
+def aggregate_rollups(
+    rollups: Iterable[HoldingRollup],
+    prices: dict[str, CoinData],
+) -> PortfolioSummary:
+    """Aggregate precomputed per-symbol totals (see ``portfolio_db.get_holding_rollups``)."""
+    return _summarize(
+        ((r.symbol, r.num_lots, r.total_amount, r.total_cost) for r in rollups),
+        prices,
+    )
+
+
+def _empty_summary() -> PortfolioSummary:
+    return PortfolioSummary(rows=[], total_value=0, total_cost=0, total_pnl_eur=0, total_pnl_pct=0)
+
+
+def _cost_row(symbol: str, num_lots: int, total_amount: float, cost: float) -> PortfolioRow:
+    """Return a row with the cost basis filled in and no price yet."""
+    avg_buy = cost / total_amount if total_amount else 0.0
+    return PortfolioRow(
+        symbol=symbol,
+        num_lots=num_lots,
+        total_amount=round(total_amount, 2),
+        avg_buy_price=round(avg_buy, 2),
+        current_price=None,
+        total_cost=round(cost, 2),
+        current_value=None,
+        pnl_eur=None,
+        pnl_pct=None,
+        allocation_pct=None,  # computed after totals known
+        change_24h=None,
+    )
+
+
+def _apply_price(row: PortfolioRow, total_amount: float, cost: float, coin: CoinData) -> None:
+    """Fill in *row*'s price-dependent fields from *coin*."""
+    row.current_price = coin.price
+    row.current_value = round(total_amount * coin.price, 2)
+    row.pnl_eur = round(row.current_value - cost, 2)
+    row.pnl_pct = round((row.pnl_eur / cost) * 100, 2) if cost else 0.0
+    row.change_24h = coin.change_24h
+
+
+def _summarize(
+    groups: Iterable[tuple[str, int, float, float]],
+    prices: dict[str, CoinData],
+) -> PortfolioSummary:
+    """Build the summary from ``(symbol, num_lots, total_amount, cost)`` per coin."""
     priced_rows: list[PortfolioRow] = []
     unpriced_rows: list[PortfolioRow] = []
     total_cost = 0.0
     total_priced_value = 0.0
     total_unpriced_cost = 0.0
 
-    for symbol, lots in groups.items():
-        total_amount = sum(h.amount for h in lots)
-        cost = sum(h.amount * h.buy_price for h in lots)
-        avg_buy = cost / total_amount if total_amount else 0.0
+    for symbol, num_lots, total_amount, cost in groups:
+        row = _cost_row(symbol, num_lots, total_amount, cost)
         total_cost += cost
 
         if symbol in prices:
-            coin = prices[symbol]
-            current_value = round(total_amount * coin.price, 2)
-            pnl_eur = round(current_value - cost, 2)
-            pnl_pct = round((pnl_eur / cost) * 100, 2) if cost else 0.0
-            total_priced_value += current_value
-            priced_rows.append(
-                PortfolioRow(
-                    symbol=symbol,
-                    num_lots=len(lots),
-                    total_amount=round(total_amount, 2),
-                    avg_buy_price=round(avg_buy, 2),
-                    current_price=coin.price,
-                    total_cost=round(cost, 2),
-                    current_value=current_value,
-                    pnl_eur=pnl_eur,
-                    pnl_pct=pnl_pct,
-                    allocation_pct=None,  # computed after totals known
-                    change_24h=coin.change_24h,
-                )
-            )
+            _apply_price(row, total_amount, cost, prices[symbol])
+            total_priced_value += row.current_value
+            priced_rows.append(row)
         else:
             total_unpriced_cost += cost
-            unpriced_rows.append(
-                PortfolioRow(
-                    symbol=symbol,
-                    num_lots=len(lots),
-                    total_amount=round(total_amount, 2),
-                    avg_buy_price=round(avg_buy, 2),
-                    current_price=None,
-                    total_cost=round(cost, 2),
-                    current_value=None,
-                    pnl_eur=None,
-                    pnl_pct=None,
-                    allocation_pct=None,
-                    change_24h=None,
-                )
-            )
+            unpriced_rows.append(row)
+
+    return _finish_summary(priced_rows, unpriced_rows, total_cost, total_priced_value + total_unpriced_cost)
 
-    total_value = round(total_priced_value + total_unpriced_cost, 2)
+
+def _finish_summary(
+    priced_rows: list[PortfolioRow],
+    unpriced_rows: list[PortfolioRow],
+    total_cost: float,
+    total_value: float,
+) -> PortfolioSummary:
+    """Compute allocations, sort the rows and round the totals."""
+    total_value = round(total_value, 2)
     total_cost = round(total_cost, 2)
 
     # Compute allocation percentages for priced rows
@@ -141,21 +268,332 @@ def aggregate_portfolio(
     )
 
 
+# ---------------------------------------------------------------------------
+# Incremental valuation
+# ---------------------------------------------------------------------------
+
+class PortfolioValuation:
+    """Live portfolio valuation that is updated incrementally as prices change.
+
+    Holds the cost basis of every symbol once (from the rollups) and keeps
+    one row per symbol plus running totals.  ``update_prices`` revalues only
+    the symbols whose price changed and adjusts the totals by their deltas;
+    ``summary`` then computes allocations and ordering in O(symbols), giving
+    the same result as ``aggregate_rollups`` without touching lots or the
+    database.
+
+    For streaming, ``snapshot`` and ``delta`` additionally remember the value
+    each row was last reported with, so a consumer only receives the rows
+    that moved noticeably since.
+
+    Usage:
+        valuation = PortfolioValuation(get_holding_rollups())
+        changed = valuation.update_prices({c.symbol: c for c in coins})
+        summary = valuation.summary()
+    """
+
+    def __init__(
+        self,
+        rollups: Iterable[HoldingRollup],
+        prices: Mapping[str, CoinData] | None = None,
+    ) -> None:
+        self._rows: dict[str, PortfolioRow] = {}
+        self._basis: dict[str, tuple[float, float]] = {}  # symbol -> (total_amount, cost)
+        self._total_cost = 0.0
+        self._priced_value = 0.0
+        self._unpriced_cost = 0.0
+        self._reported: dict[str, float | None] = {}  # symbol -> last reported current_value
+        for r in rollups:
+            self._rows[r.symbol] = _cost_row(r.symbol, r.num_lots, r.total_amount, r.total_cost)
+            self._basis[r.symbol] = (r.total_amount, r.total_cost)
+            self._total_cost += r.total_cost
+            self._unpriced_cost += r.total_cost
+        if prices:
+            self.update_prices(prices)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._rows
+
+    def update_prices(self, prices: Mapping[str, CoinData]) -> set[str]:
+        """Revalue the held symbols whose price or 24h change differs.  Return them.
+
+        Symbols missing from *prices* keep their last valuation.
+        """
+        changed: set[str] = set()
+        for symbol in self._rows.keys() & prices.keys():
+            row = self._rows[symbol]
+            coin = prices[symbol]
+            if row.current_price == coin.price and row.change_24h == coin.change_24h:
+                continue
+            total_amount, cost = self._basis[symbol]
+            if row.current_value is None:
+                self._unpriced_cost -= cost
+            else:
+                self._priced_value -= row.current_value
+            _apply_price(row, total_amount, cost, coin)
+            self._priced_value += row.current_value
+            changed.add(symbol)
+        return changed
+
+    def row(self, symbol: str) -> PortfolioRow:
+        """Return a copy of *symbol*'s current row (without allocation)."""
+        return replace(self._rows[symbol])
+
+    def summary(self) -> PortfolioSummary:
+        """Return the current valuation as a ``PortfolioSummary`` (rows are copies)."""
+        priced_rows: list[PortfolioRow] = []
+        unpriced_rows: list[PortfolioRow] = []
+        for row in self._rows.values():
+            (unpriced_rows if row.current_value is None else priced_rows).append(replace(row))
+        return _finish_summary(
+            priced_rows,
+            unpriced_rows,
+            self._total_cost,
+            self._priced_value + self._unpriced_cost,
+        )
+
+    def snapshot(self) -> PortfolioSummary:
+        """Return ``summary()`` and record every row as reported."""
+        summary = self.summary()
+        self._reported = {row.symbol: row.current_value for row in summary.rows}
+        return summary
+
+    def delta(self, threshold: float = VALUATION_DELTA_THRESHOLD) -> PortfolioSummary:
+        """Return the current totals with only the rows that moved since last reported.
+
+        A row is included (and recorded as reported) when it gained or lost a
+        price, or its current value moved by more than *threshold* (a
+        fraction) of the value it was last reported with.
+        """
+        summary = self.summary()
+        rows = []
+        for row in summary.rows:
+            if row.symbol in self._reported and not _moved(
+                self._reported[row.symbol], row.current_value, threshold
+            ):
+                continue
+            self._reported[row.symbol] = row.current_value
+            rows.append(row)
+        summary.rows = rows
+        return summary
+
+
+def _moved(last: float | None, value: float | None, threshold: float) -> bool:
+    if last is None or value is None:
+        return last is not value
+    return abs(value - last) > threshold * abs(last)
+
+
 # ---------------------------------------------------------------------------
 # Export
 # ---------------------------------------------------------------------------
 
-def export_csv(holdings: list[Holding]) -> str:
+def _chunked(holdings: Iterable[Holding], size: int) -> Iterator[list[Holding]]:
+    it = iter(holdings)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+def _json_record(holding: Holding) -> str:
+    return json.dumps(dict(zip(EXPORT_FIELDS, _export_row(holding))))
+
+
+def iter_export_csv(holdings: Iterable[Holding], chunk_rows: int = EXPORT_CHUNK_ROWS) -> Iterator[str]:
+    """Yield holdings as CSV: the header row, then one chunk per *chunk_rows* holdings."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    yield buffer.getvalue()
+    for batch in _chunked(holdings, chunk_rows):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(map(_export_row, batch))
+        yield buffer.getvalue()
+
+
+def iter_export_json(holdings: Iterable[Holding], chunk_rows: int = EXPORT_CHUNK_ROWS) -> Iterator[str]:
+    """Yield holdings as a JSON array with one object per line."""
+    yield "["
+    separator = "\n"
+    for batch in _chunked(holdings, chunk_rows):
+        yield separator + ",\n".join(map(_json_record, batch))
+        separator = ",\n"
+    yield "\n]\n"
+
+
+def iter_export_ndjson(holdings: Iterable[Holding], chunk_rows: int = EXPORT_CHUNK_ROWS) -> Iterator[str]:
+    """Yield holdings as newline-delimited JSON objects."""
+    for batch in _chunked(holdings, chunk_rows):
+        yield "".join(_json_record(h) + "\n" for h in batch)
+
+
+def iter_export(holdings: Iterable[Holding], fmt: str) -> Iterator[str]:
+    """Yield holdings in *fmt* (one of ``EXPORT_FORMATS``)."""
+    if fmt == "csv":
+        return iter_export_csv(holdings)
+    if fmt == "json":
+        return iter_export_json(holdings)
+    if fmt == "ndjson":
+        return iter_export_ndjson(holdings)
+    raise ValueError(f"Unsupported export format: {fmt!r}")
+
+
+def export_csv(holdings: Iterable[Holding]) -> str:
     """Export holdings as a CSV string."""
-    output = io.StringIO()
-    fieldnames = ["id", "symbol", "amount", "buy_price", "buy_date"]
-    writer = csv.DictWriter(output, fieldnames=fieldnames)
-    writer.writeheader()
-    for h in holdings:
-        writer.writerow(asdict(h))
-    return output.getvalue()
+    return "".join(iter_export_csv(holdings))
 
 
-def export_json(holdings: list[Holding]) -> str:
+def export_json(holdings: Iterable[Holding]) -> str:
     """Export holdings as a JSON string."""
-    return json.dumps([asdict(h) for h in holdings], indent=2)
+    return "".join(iter_export_json(holdings))
+
+
+# ---------------------------------------------------------------------------
+# Import
+# ---------------------------------------------------------------------------
+
+def _iter_json_records(stream: TextIO) -> Iterator[dict]:
+    """Yield the objects of a JSON array, or of whitespace-separated objects (NDJSON).
+
+    Reads *stream* in chunks and decodes one object at a time, so the whole
+    document is never held in memory.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    in_array: bool | None = None
+    eof = False
+    while True:
+        # Skip whitespace and the array punctuation between objects.
+        while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+            pos += 1
+        if pos < len(buffer):
+            if in_array is None:
+                in_array = buffer[pos] == "["
+                if in_array:
+                    pos += 1
+                continue
+            if in_array and buffer[pos] == "]":
+                return
+            try:
+                record, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as e:
+                if eof or len(buffer) - pos > _JSON_MAX_RECORD:
+                    raise ValueError(f"malformed JSON: {e.msg}") from None
+            else:
+                # An object that ends exactly at the buffer end is complete;
+                # anything else (e.g. a number) might continue in the next chunk.
+                if end < len(buffer) or eof or buffer[end - 1] == "}":
+                    yield record
+                    pos = end
+                    continue
+        elif eof:
+            if in_array:
+                raise ValueError("malformed JSON: unterminated array")
+            return
+        chunk = stream.read(_JSON_READ_SIZE)
+        eof = not chunk
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+
+def iter_holding_records(stream: TextIO, fmt: str) -> Iterator[dict]:
+    """Stream raw holding records from CSV (with a header row) or JSON/NDJSON.
+
+    Records use the export field names (``symbol``, ``amount``,
+    ``buy_price``, ``buy_date``); other fields such as ``id`` are ignored.
+    Raises ValueError if the input becomes unreadable.
+    """
+    if fmt == "csv":
+        return iter(csv.DictReader(stream))
+    if fmt == "json":
+        return _iter_json_records(stream)
+    raise ValueError(f"Unsupported import format: {fmt!r}")
+
+
+def _positive(record: dict, name: str) -> float:
+    value = record.get(name)
+    if value is None or value == "":
+        raise ValueError(f"missing {name}")
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be a number, got {value!r}") from None
+    if not (number > 0 and math.isfinite(number)):
+        raise ValueError(f"{name} must be positive, got {value!r}")
+    return number
+
+
+def validate_holding_record(record: dict, today: str | None = None) -> HoldingRow:
+    """Validate one import record.  Return an insertable ``HoldingRow``.
+
+    Mirrors ``add_holding``: the symbol is uppercased and a missing buy date
+    defaults to *today*.  Raises ValueError describing the first problem.
+    """
+    if not isinstance(record, dict):
+        raise ValueError("expected an object")
+    symbol = record.get("symbol")
+    if not isinstance(symbol, str) or not symbol.strip():
+        raise ValueError("missing symbol")
+    amount = _positive(record, "amount")
+    buy_price = _positive(record, "buy_price")
+    buy_date = record.get("buy_date") or today or date.today().isoformat()
+    try:
+        date.fromisoformat(buy_date)
+    except (TypeError, ValueError):
+        raise ValueError(f"buy_date must be YYYY-MM-DD, got {buy_date!r}") from None
+    return symbol.strip().upper(), amount, buy_price, buy_date
+
+
+def import_holdings(
+    stream: TextIO,
+    fmt: str,
+    insert: Callable[[list[HoldingRow]], int],
+    *,
+    batch_size: int = IMPORT_BATCH_SIZE,
+    on_progress: Callable[[ImportReport], None] | None = None,
+) -> ImportReport:
+    """Stream-parse holdings from *stream* and insert the valid ones in batches.
+
+    Each batch of *batch_size* records is validated and passed to *insert*
+    (one transaction per batch), then *on_progress* is called with the
+    running report.  Invalid records are reported, not inserted.  If the
+    input becomes unreadable, the import stops there; batches already
+    inserted are kept.  Raises ValueError if *batch_size* is less than 1.
+    """
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be at least 1, got {batch_size}")
+    report = ImportReport()
+    today = date.today().isoformat()
+    records = iter_holding_records(stream, fmt)
+    read_error: str | None = None
+    exhausted = False
+    while not exhausted:
+        batch: list[dict] = []
+        try:
+            for record in records:
+                batch.append(record)
+                if len(batch) == batch_size:
+                    break
+            else:
+                exhausted = True
+        except (ValueError, csv.Error, UnicodeDecodeError) as e:
+            read_error = f"unreadable input: {e}"
+            exhausted = True
+        valid: list[HoldingRow] = []
+        for number, record in enumerate(batch, start=report.rows + 1):
+            try:
+                valid.append(validate_holding_record(record, today))
+            except ValueError as e:
+                report.reject(number, str(e))
+        report.rows += len(batch)
+        if valid:
+            report.imported += insert(valid)
+        if batch and on_progress is not None:
+            on_progress(report)
+    if read_error is not None:
+        report.reject(report.rows + 1, read_error)
+    return report
@@ -2,17 +2,26 @@
 
 Every public function accepts an optional ``db_path`` parameter so tests can
 pass a temporary file path.  When *None*, the default XDG data directory is
-used (``~/.local/share/crypto-tracker/portfolio.db``).
+used (``~/.local/share/crypto-tracker/portfolio.db``).  Queries run on the
+calling thread's pooled connection from ``db``.
+
+Per-symbol totals live in ``holding_rollups``, which triggers on the
+``holdings`` table keep in step with every insert, update and delete (see
+``migrations``); ``get_holding_rollups`` reads them without touching lots.
 """
 
 from __future__ import annotations
 
 import os
 import sqlite3
+from collections.abc import Iterable, Iterator
 from datetime import date
 from pathlib import Path
 
-from crypto_price_tracker.models import Holding
+from crypto_price_tracker import db
+from crypto_price_tracker.models import Holding, HoldingColumns, HoldingRollup
+
+FETCH_SIZE = 1000  # rows per fetchmany() when streaming holdings
 
 
 # ---------------------------------------------------------------------------
@@ -28,40 +37,27 @@ def _get_default_db_path() -> Path:
     return db_path
 
 
+def _rollup_factory(cursor: sqlite3.Cursor, row: tuple) -> HoldingRollup:
+    """Row factory that returns *HoldingRollup* instances."""
+    return HoldingRollup(*row)
+
+
 def _holding_factory(cursor: sqlite3.Cursor, row: tuple) -> Holding:
     """Row factory that returns *Holding* instances."""
     names = [description[0] for description in cursor.description]
     return Holding(**dict(zip(names, row)))
 
 
-def _ensure_schema(conn: sqlite3.Connection) -> None:
-    """Create the holdings table if it does not exist."""
-    conn.execute(
-        """
-        CREATE TABLE IF NOT EXISTS holdings (
-            id        INTEGER PRIMARY KEY AUTOINCREMENT,
-            symbol    TEXT NOT NULL,
-            amount    REAL NOT NULL CHECK(amount > 0),
-            buy_price REAL NOT NULL CHECK(buy_price > 0),
-            buy_date  TEXT NOT NULL
-        )
-        """
-    )
-
-
 # ---------------------------------------------------------------------------
 # Connection management
 # ---------------------------------------------------------------------------
 
 def get_connection(db_path: Path | None = None) -> sqlite3.Connection:
-    """Open a connection with WAL mode, foreign keys, and schema check."""
-    path = db_path or _get_default_db_path()
-    conn = sqlite3.connect(str(path))
-    conn.execute("PRAGMA journal_mode=WAL")
-    conn.execute("PRAGMA foreign_keys=ON")
-    conn.row_factory = _holding_factory
-    _ensure_schema(conn)
-    return conn
+    """Open a standalone connection with WAL mode, foreign keys, and migrated schema.
+
+    The functions below use the shared pooled connection instead (see ``db``).
+    """
+    return db.connect(db_path, _holding_factory)
 
 
 # ---------------------------------------------------------------------------
@@ -82,27 +78,41 @@ def add_holding(
     # Validate date format (raises ValueError on bad input)
     date.fromisoformat(buy_date)
     symbol = symbol.upper()
-    conn = get_connection(db_path)
-    try:
+    with db.connection(db_path, _holding_factory) as conn:
         with conn:
             cursor = conn.execute(
                 "INSERT INTO holdings (symbol, amount, buy_price, buy_date) VALUES (?, ?, ?, ?)",
                 (symbol, amount, buy_price, buy_date),
             )
             return cursor.lastrowid
-    finally:
-        conn.close()
+
+
+def add_holdings(
+    rows: Iterable[tuple[str, float, float, str]],
+    *,
+    db_path: Path | None = None,
+) -> int:
+    """Insert many holdings in one transaction.  Return the number inserted.
+
+    *rows* are ``(symbol, amount, buy_price, buy_date)`` tuples, already
+    validated (see ``portfolio.validate_holding_record``); a row violating a
+    constraint rolls back the whole batch.
+    """
+    with db.connection(db_path) as conn:
+        with conn:
+            cursor = conn.executemany(
+                "INSERT INTO holdings (symbol, amount, buy_price, buy_date) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            return cursor.rowcount
 
 
 def remove_holding(holding_id: int, *, db_path: Path | None = None) -> bool:
     """Delete a holding by ID.  Return *True* if a row was deleted."""
-    conn = get_connection(db_path)
-    try:
+    with db.connection(db_path, _holding_factory) as conn:
         with conn:
             cursor = conn.execute("DELETE FROM holdings WHERE id = ?", (holding_id,))
             return cursor.rowcount > 0
-    finally:
-        conn.close()
 
 
 def update_holding(
@@ -129,36 +139,66 @@ def update_holding(
     if not fields:
         return False
     values.append(holding_id)
-    conn = get_connection(db_path)
-    try:
+    with db.connection(db_path, _holding_factory) as conn:
         with conn:
             cursor = conn.execute(
                 f"UPDATE holdings SET {', '.join(fields)} WHERE id = ?",
                 tuple(values),
             )
             return cursor.rowcount > 0
-    finally:
-        conn.close()
 
 
 def get_all_holdings(*, db_path: Path | None = None) -> list[Holding]:
     """Return all holdings ordered by symbol then buy date."""
-    conn = get_connection(db_path)
-    try:
+    with db.connection(db_path, _holding_factory) as conn:
         cursor = conn.execute("SELECT * FROM holdings ORDER BY symbol, buy_date")
         return cursor.fetchall()
+
+
+def get_holding_rollups(*, db_path: Path | None = None) -> list[HoldingRollup]:
+    """Return per-symbol lot totals, one row per symbol, ordered by symbol.
+
+    The ``holding_rollups`` table is maintained by triggers on ``holdings``,
+    so this never reads the individual lots.
+    """
+    with db.connection(db_path, _rollup_factory) as conn:
+        cursor = conn.execute(
+            "SELECT symbol, num_lots, total_amount, total_cost FROM holding_rollups ORDER BY symbol"
+        )
+        return cursor.fetchall()
+
+
+def get_holding_columns(*, db_path: Path | None = None) -> HoldingColumns:
+    """Return symbol/amount/buy_price of all holdings as columns (same order as ``get_all_holdings``).
+
+    Only used by ``benchmarks/bench_portfolio.py``; the app aggregates
+    ``get_holding_rollups`` instead.
+    """
+    with db.connection(db_path) as conn:
+        cursor = conn.execute("SELECT symbol, amount, buy_price FROM holdings ORDER BY symbol, buy_date")
+        return HoldingColumns.from_rows(cursor.fetchall())
+
+
+def iter_holdings(*, fetch_size: int = FETCH_SIZE, db_path: Path | None = None) -> Iterator[Holding]:
+    """Yield all holdings ordered by symbol then buy date, *fetch_size* rows at a time.
+
+    Uses its own connection, closed when the iterator is exhausted or
+    discarded: a streaming response may resume it from different threads.
+    """
+    conn = db.connect(db_path, _holding_factory)
+    try:
+        cursor = conn.execute("SELECT * FROM holdings ORDER BY symbol, buy_date")
+        while rows := cursor.fetchmany(fetch_size):
+            yield from rows
     finally:
         conn.close()
 
 
 def get_holdings_by_symbol(symbol: str, *, db_path: Path | None = None) -> list[Holding]:
     """Return holdings for a single symbol, ordered by buy date."""
-    conn = get_connection(db_path)
-    try:
+    with db.connection(db_path, _holding_factory) as conn:
         cursor = conn.execute(
             "SELECT * FROM holdings WHERE symbol = ? ORDER BY buy_date",
             (symbol.upper(),),
         )
         return cursor.fetchall()
-    finally:
-        conn.close()
@@ -0,0 +1,269 @@
+"""Read-optimized, memory-mapped archive of tick history buckets.
+
+``ticks_db`` keeps recent buckets in SQLite under a retention policy.  Once
+a day, ``compact`` appends every *completed* bucket not yet archived to
+fixed-width column files, one directory per exchange, symbol and interval:
+
+    <db dir>/tick-archive/bitvavo/BTC/1m/timestamp.i8
+                                         open.f8  high.f8  low.f8  close.f8  volume.f8
+
+Each file is a raw little-endian array in chronological order, so reading
+is ``np.memmap`` plus a ``searchsorted`` on the timestamps: a range query
+such as "BTC closes for the last 365 days" returns a ``CandleSeries`` of
+views into the mapped files, with no per-row deserialization.  ``get_history``
+joins the archive with the newer buckets still only in SQLite.
+
+Compaction is not run on the fetch path: the web app runs
+``compact_periodically`` from its lifespan and ``crypto compact`` runs
+``compact`` on demand.  The day of the last compaction is stored in the
+archive root, so a fresh process does not rescan, and ``compact`` holds an
+exclusive file lock there, so a CLI process and the web server never append
+the same rows twice.
+
+Appends write each column file in turn; if a crash leaves them at
+different lengths, readers use the shortest and the next compaction trims
+the others.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: only the in-process lock applies
+    fcntl = None
+
+import numpy as np
+
+from crypto_price_tracker import db
+from crypto_price_tracker.models import CANDLE_FIELDS, CandleSeries
+from crypto_price_tracker.ticks_db import TICK_INTERVALS, get_tick_buckets
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_DIR_NAME = "tick-archive"
+LOCK_FILE_NAME = ".lock"
+STATE_FILE_NAME = "compacted-day"  # day number (UTC) of the last completed compaction
+COMPACT_CHECK_INTERVAL = 3600.0  # seconds between compact_if_due checks in the web app
+_DAY_MS = TICK_INTERVALS["1d"]
+_COLUMN_DTYPES = {name: np.dtype("<i8") if name == "timestamp" else np.dtype("<f8") for name in CANDLE_FIELDS}
+_COLUMN_FILES = {name: f"{name}.{dtype.kind}{dtype.itemsize}" for name, dtype in _COLUMN_DTYPES.items()}
+
+_lock = threading.Lock()
+
+
+# ---------------------------------------------------------------------------
+# Layout
+# ---------------------------------------------------------------------------
+
+def archive_root(db_path: Path | None = None) -> Path:
+    """Return the archive directory that belongs to *db_path*'s database."""
+    return db.resolve_db_path(db_path).parent / ARCHIVE_DIR_NAME
+
+
+def _compacted_day(root: Path) -> int | None:
+    """Return the day number stored by the last ``compact`` in *root*, if any."""
+    try:
+        return int((root / STATE_FILE_NAME).read_text())
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _store_compacted_day(root: Path, day: int) -> None:
+    tmp = root / f"{STATE_FILE_NAME}.tmp"
+    tmp.write_text(str(day))
+    os.replace(tmp, root / STATE_FILE_NAME)
+
+
+@contextmanager
+def _exclusive(root: Path) -> Iterator[None]:
+    """Hold the archive lock for *root* across threads and processes."""
+    root.mkdir(parents=True, exist_ok=True)
+    with _lock, open(root / LOCK_FILE_NAME, "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _series_dir(root: Path, symbol: str, exchange: str, interval: str) -> Path:
+    if not (symbol.isalnum() and exchange.isalnum() and interval in TICK_INTERVALS):
+        raise ValueError(f"Invalid archive key: {exchange}/{symbol}/{interval}")
+    return root / exchange / symbol / interval
+
+
+def _stored_rows(directory: Path) -> int:
+    """Return the number of complete rows, i.e. the shortest column's length."""
+    lengths = []
+    for name, filename in _COLUMN_FILES.items():
+        path = directory / filename
+        lengths.append(path.stat().st_size // _COLUMN_DTYPES[name].itemsize if path.exists() else 0)
+    return min(lengths)
+
+
+# ---------------------------------------------------------------------------
+# Reading
+# ---------------------------------------------------------------------------
+
+def read_archive(
+    symbol: str,
+    exchange: str,
+    interval: str,
+    *,
+    start: int | None = None,
+    end: int | None = None,
+    db_path: Path | None = None,
+) -> CandleSeries:
+    """Return the archived buckets starting in ``[start, end]`` as memory-mapped views."""
+    directory = _series_dir(archive_root(db_path), symbol, exchange, interval)
+    rows = _stored_rows(directory)
+    if not rows:
+        return CandleSeries.empty()
+    columns = {
+        name: np.memmap(directory / _COLUMN_FILES[name], dtype=dtype, mode="r", shape=(rows,))
+        for name, dtype in _COLUMN_DTYPES.items()
+    }
+    timestamps = columns["timestamp"]
+    lo = 0 if start is None else int(np.searchsorted(timestamps, start, side="left"))
+    hi = rows if end is None else int(np.searchsorted(timestamps, end, side="right"))
+    return CandleSeries(*(columns[name][lo:hi] for name in CANDLE_FIELDS))
+
+
+def archived_until(symbol: str, exchange: str, interval: str, *, db_path: Path | None = None) -> int | None:
+    """Return the timestamp of the newest archived bucket, or *None* if there is none."""
+    directory = _series_dir(archive_root(db_path), symbol, exchange, interval)
+    rows = _stored_rows(directory)
+    if not rows:
+        return None
+    dtype = _COLUMN_DTYPES["timestamp"]
+    path = directory / _COLUMN_FILES["timestamp"]
+    return int(np.memmap(path, dtype=dtype, mode="r", shape=(1,), offset=(rows - 1) * dtype.itemsize)[0])
+
+
+def get_history(
+    symbol: str,
+    exchange: str,
+    interval: str,
+    *,
+    start: int | None = None,
+    end: int | None = None,
+    limit: int | None = None,
+    db_path: Path | None = None,
+) -> CandleSeries:
+    """Return buckets in ``[start, end]`` from the archive plus the newer ones in SQLite.
+
+    With *limit*, only the newest *limit* buckets are returned.  A range
+    served entirely by the archive is returned without copying.
+    """
+    archived = read_archive(symbol, exchange, interval, start=start, end=end, db_path=db_path)
+    last = archived_until(symbol, exchange, interval, db_path=db_path)
+    recent_start = start if last is None else max(start or 0, last + 1)
+    if end is not None and recent_start is not None and recent_start > end:
+        recent = CandleSeries.empty()
+    else:
+        recent = get_tick_buckets(
+            symbol,
+            exchange,
+            interval,
+            start=recent_start,
+            end=end,
+            limit=limit,
+            db_path=db_path,
+        )
+    if limit is not None:
+        archived = archived[max(len(archived) - (limit - len(recent)), 0):]
+    return CandleSeries.concat(archived, recent)
+
+
+# ---------------------------------------------------------------------------
+# Compaction
+# ---------------------------------------------------------------------------
+
+def _append(directory: Path, series: CandleSeries) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    rows = _stored_rows(directory)
+    for name, column in zip(CANDLE_FIELDS, series.columns()):
+        path = directory / _COLUMN_FILES[name]
+        dtype = _COLUMN_DTYPES[name]
+        with open(path, "ab") as f:
+            f.truncate(rows * dtype.itemsize)  # drop a torn tail from an interrupted append
+            f.write(np.ascontiguousarray(column, dtype=dtype).tobytes())
+
+
+def _compact_locked(root: Path, cutoff: int, db_path: Path | None) -> int:
+    """Archive buckets ending before *cutoff*; the caller holds ``_exclusive(root)``."""
+    written = 0
+    with db.connection(db_path) as conn:
+        keys = conn.execute("SELECT DISTINCT symbol, exchange, interval FROM tick_buckets").fetchall()
+    for symbol, exchange, interval in keys:
+        try:
+            directory = _series_dir(root, symbol, exchange, interval)
+        except ValueError:
+            continue  # not representable as a path; stays in SQLite only
+        last = archived_until(symbol, exchange, interval, db_path=db_path)
+        series = get_tick_buckets(
+            symbol,
+            exchange,
+            interval,
+            start=0 if last is None else last + 1,
+            end=cutoff - TICK_INTERVALS[interval],
+            limit=None,
+            db_path=db_path,
+        )
+        if len(series):
+            _append(directory, series)
+            written += len(series)
+    _store_compacted_day(root, cutoff // _DAY_MS)
+    return written
+
+
+def compact(*, now: int | None = None, db_path: Path | None = None) -> int:
+    """Archive every completed bucket (before today, UTC) not yet archived.  Return the rows written."""
+    now = int(time.time() * 1000) if now is None else now
+    root = archive_root(db_path)
+    with _exclusive(root):
+        return _compact_locked(root, now - now % _DAY_MS, db_path)
+
+
+def compact_if_due(*, now: int | None = None, db_path: Path | None = None) -> int:
+    """Run ``compact`` unless it already ran today (in any process).  Return the rows written."""
+    now = int(time.time() * 1000) if now is None else now
+    root = archive_root(db_path)
+    if _compacted_day(root) == now // _DAY_MS:
+        return 0
+    with _exclusive(root):
+        if _compacted_day(root) == now // _DAY_MS:
+            return 0  # another process compacted while we waited for the lock
+        return _compact_locked(root, now - now % _DAY_MS, db_path)
+
+
+async def compact_periodically(interval: float = COMPACT_CHECK_INTERVAL, *, db_path: Path | None = None) -> None:
+    """Run ``compact_if_due`` in a worker thread every *interval* seconds until cancelled.
+
+    Cancelling waits for a compaction already running in its thread, so the
+    caller can close the database pool as soon as this task has finished.
+    """
+    while True:
+        work = asyncio.ensure_future(asyncio.to_thread(compact_if_due, db_path=db_path))
+        try:
+            await asyncio.shield(work)
+        except asyncio.CancelledError:
+            await asyncio.wait([work])  # the thread cannot be interrupted
+            if not work.cancelled() and work.exception() is not None:
+                logger.error("Tick archive compaction failed", exc_info=work.exception())
+            raise
+        except Exception:
+            logger.exception("Tick archive compaction failed")
+        await asyncio.sleep(interval)
+
@@ -0,0 +1,211 @@
+"""SQLite storage layer for our own price tick history.
+
+Every upstream snapshot (see ``exchange``) is appended to ``ticks`` (one
+row per coin), and in the same transaction folded into 1m/1h/1d OHLC rows in
+``tick_buckets``.  The bucket ``volume`` is the rolling 24h EUR volume
+reported by the bucket's last tick, *not* the volume traded within the
+bucket, so the history endpoint serves it as ``volume_eur_24h``.  Old rows
+are pruned according to ``TICK_RETENTION``: raw ticks are kept for a week,
+coarser buckets for longer.  Pruning runs automatically from
+``append_ticks`` at most once per ``TICK_PRUNE_EVERY``.
+
+History queries never go upstream: ``get_ticks`` returns raw ticks and
+``get_tick_buckets`` returns buckets as a ``CandleSeries``.  Completed
+buckets are also archived by ``tick_archive`` for long-range reads.
+
+Every public function accepts an optional ``db_path`` parameter so tests can
+pass a temporary file path.  When *None*, the default path is resolved via
+``portfolio_db._get_default_db_path()`` (same DB file as portfolio/alerts).
+Queries run on the calling thread's pooled connection from ``db``.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from collections.abc import Sequence
+from pathlib import Path
+
+from crypto_price_tracker import db
+from crypto_price_tracker.models import CandleSeries, CoinData, Tick
+
+TICK_INTERVALS = {  # bucket interval -> width in milliseconds
+    "1m": 60_000,
+    "1h": 3_600_000,
+    "1d": 86_400_000,
+}
+_DAY_MS = 86_400_000
+TICK_RETENTION: dict[str, int | None] = {  # "tick" or bucket interval -> max age in ms (None = forever)
+    "tick": 7 * _DAY_MS,
+    "1m": 30 * _DAY_MS,
+    "1h": 730 * _DAY_MS,
+    "1d": None,
+}
+TICK_PRUNE_EVERY = 3_600_000  # ms of tick time between automatic prunes
+
+_BUCKET_UPSERT = (
+    "INSERT INTO tick_buckets "
+    "(symbol, exchange, interval, timestamp, open, high, low, close, volume, ticks) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 1) "
+    "ON CONFLICT (symbol, exchange, interval, timestamp) DO UPDATE SET "
+    "high = max(high, excluded.high), "
+    "low = min(low, excluded.low), "
+    "close = excluded.close, "
+    "volume = excluded.volume, "
+    "ticks = ticks + 1"
+)
+
+
+# ---------------------------------------------------------------------------
+# Internal helpers
+# ---------------------------------------------------------------------------
+
+def _tick_factory(cursor: sqlite3.Cursor, row: tuple) -> Tick:
+    """Row factory that returns *Tick* instances."""
+    return Tick(*row)
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+_prune_lock = threading.Lock()
+_last_pruned: dict[str, int] = {}  # database path -> tick timestamp of the last prune
+
+
+def _prune_due(db_path: Path | None, timestamp: int) -> bool:
+    """Return True (and record the prune) if the database is due for pruning."""
+    key = str(db.resolve_db_path(db_path))
+    with _prune_lock:
+        if timestamp - _last_pruned.get(key, 0) < TICK_PRUNE_EVERY:
+            return False
+        _last_pruned[key] = timestamp
+        return True
+
+
+def _prune(conn: sqlite3.Connection, now: int) -> int:
+    deleted = 0
+    for interval, max_age in TICK_RETENTION.items():
+        if max_age is None:
+            continue
+        if interval == "tick":
+            cursor = conn.execute("DELETE FROM ticks WHERE timestamp < ?", (now - max_age,))
+        else:
+            cursor = conn.execute(
+                "DELETE FROM tick_buckets WHERE interval = ? AND timestamp < ?",
+                (interval, now - max_age),
+            )
+        deleted += cursor.rowcount
+    return deleted
+
+
+# ---------------------------------------------------------------------------
+# Connection management
+# ---------------------------------------------------------------------------
+
+def get_tick_connection(db_path: Path | None = None) -> sqlite3.Connection:
+    """Open a standalone connection with WAL mode, foreign keys, and migrated schema.
+
+    The functions below use the shared pooled connection instead (see ``db``).
+    """
+    return db.connect(db_path)
+
+
+# ---------------------------------------------------------------------------
+# Queries
+# ---------------------------------------------------------------------------
+
+def append_ticks(
+    coins: Sequence[CoinData],
+    exchange: str,
+    *,
+    timestamp: int | None = None,
+    db_path: Path | None = None,
+) -> int:
+    """Record one polled snapshot of *coins* from *exchange*.  Return the tick count.
+
+    Ticks must be appended in time order (each bucket's close is its latest
+    append).  *timestamp* defaults to now, in milliseconds.
+    """
+    if not coins:
+        return 0
+    ts = _now_ms() if timestamp is None else timestamp
+    with db.connection(db_path) as conn:
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO ticks "
+                "(timestamp, symbol, exchange, price, volume_eur, change_24h) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(ts, c.symbol, exchange, c.price, c.volume_eur, c.change_24h) for c in coins],
+            )
+            for interval, width in TICK_INTERVALS.items():
+                bucket = ts - ts % width
+                conn.executemany(
+                    _BUCKET_UPSERT,
+                    [
+                        (c.symbol, exchange, interval, bucket, c.price, c.price, c.price, c.price, c.volume_eur)
+                        for c in coins
+                    ],
+                )
+            if _prune_due(db_path, ts):
+                _prune(conn, ts)
+    return len(coins)
+
+
+def prune_ticks(*, now: int | None = None, db_path: Path | None = None) -> int:
+    """Delete ticks and buckets past their ``TICK_RETENTION``.  Return the rows deleted."""
+    with db.connection(db_path) as conn:
+        with conn:
+            return _prune(conn, _now_ms() if now is None else now)
+
+
+def get_ticks(
+    symbol: str,
+    exchange: str,
+    *,
+    start: int | None = None,
+    end: int | None = None,
+    limit: int = 1000,
+    db_path: Path | None = None,
+) -> list[Tick]:
+    """Return the newest *limit* raw ticks in ``[start, end]``, in chronological order."""
+    with db.connection(db_path, _tick_factory) as conn:
+        ticks = conn.execute(
+            "SELECT timestamp, symbol, exchange, price, volume_eur, change_24h FROM ticks "
+            "WHERE symbol = ? AND exchange = ? AND timestamp BETWEEN ? AND ? "
+            "ORDER BY timestamp DESC LIMIT ?",
+            (symbol, exchange, start or 0, _now_ms() if end is None else end, limit),
+        ).fetchall()
+    ticks.reverse()
+    return ticks
+
+
+def get_tick_buckets(
+    symbol: str,
+    exchange: str,
+    interval: str,
+    *,
+    start: int | None = None,
+    end: int | None = None,
+    limit: int | None = 1000,
+    db_path: Path | None = None,
+) -> CandleSeries:
+    """Return the newest *limit* (None: all) *interval* buckets starting in ``[start, end]``, oldest first."""
+    if interval not in TICK_INTERVALS:
+        raise ValueError(f"Unknown tick interval: {interval!r}")
+    with db.connection(db_path) as conn:
+        cursor = conn.execute(
+            "SELECT timestamp, open, high, low, close, volume FROM tick_buckets "
+            "WHERE symbol = ? AND exchange = ? AND interval = ? AND timestamp BETWEEN ? AND ? "
+            "ORDER BY timestamp DESC LIMIT ?",
+            (
+                symbol,
+                exchange,
+                interval,
+                start or 0,
+                _now_ms() if end is None else end,
+                -1 if limit is None else limit,
+            ),
+        )
+        return CandleSeries.from_rows(cursor.fetchall(), reverse=True)
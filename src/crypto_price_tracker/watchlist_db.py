@@ -3,6 +3,12 @@
 Every public function accepts an optional ``db_path`` parameter so tests can
 pass a temporary file path.  When *None*, the default path is resolved via
 ``portfolio_db._get_default_db_path()`` (same DB file as portfolio/alerts).
+Queries run on the calling thread's pooled connection from ``db``.
+
+Tags live in the ``watchlist_tags(symbol, tag)`` join table, indexed by tag,
+so ``get_all_watchlist_entries(tag=...)`` is an index lookup.  The
+comma-joined ``watchlist.tags`` column is kept in step with it (same
+transaction) and is what ``WatchlistEntry.tags`` is read from.
 """
 
 from __future__ import annotations
@@ -11,8 +17,8 @@ import sqlite3
 from datetime import datetime
 from pathlib import Path
 
+from crypto_price_tracker import db
 from crypto_price_tracker.models import WatchlistEntry
-from crypto_price_tracker import portfolio_db
 
 VALID_TAGS = frozenset({"Layer1", "Layer2", "DeFi", "Meme", "Exchange", "Privacy"})
 
@@ -23,39 +29,22 @@ def _watchlist_factory(cursor: sqlite3.Cursor, row: tuple) -> WatchlistEntry:
     return WatchlistEntry(**dict(zip(names, row)))
 
 
-def _ensure_watchlist_schema(conn: sqlite3.Connection) -> None:
-    """Create the watchlist table if it does not exist."""
-    conn.execute(
-        """
-        CREATE TABLE IF NOT EXISTS watchlist (
-            id       INTEGER PRIMARY KEY AUTOINCREMENT,
-            symbol   TEXT NOT NULL UNIQUE,
-            tags     TEXT NOT NULL DEFAULT '',
-            added_at TEXT NOT NULL
-        )
-        """
-    )
-
-
 def get_watchlist_connection(db_path: Path | None = None) -> sqlite3.Connection:
-    """Open a connection with WAL mode, foreign keys, and watchlist schema check."""
-    path = db_path or portfolio_db._get_default_db_path()
-    conn = sqlite3.connect(str(path))
-    conn.execute("PRAGMA journal_mode=WAL")
-    conn.execute("PRAGMA foreign_keys=ON")
-    conn.row_factory = _watchlist_factory
-    _ensure_watchlist_schema(conn)
-    return conn
+    """Open a standalone connection with WAL mode, foreign keys, and migrated schema.
+
+    The functions below use the shared pooled connection instead (see ``db``).
+    """
+    return db.connect(db_path, _watchlist_factory)
 
 
-def _normalize_tags(tags: list[str]) -> str:
-    """Validate and normalize a list of tag strings to a comma-separated string.
+def _normalize_tags(tags: list[str]) -> list[str]:
+    """Validate and normalize a list of tag strings to sorted canonical tags.
 
     Tags are case-insensitive on input but stored with canonical casing from VALID_TAGS.
     Invalid tags raise ValueError.
     """
     if not tags:
-        return ""
+        return []
     normalized = []
     tag_lookup = {t.lower(): t for t in VALID_TAGS}
     for tag in tags:
@@ -66,7 +55,7 @@ def _normalize_tags(tags: list[str]) -> str:
             )
         if canonical not in normalized:
             normalized.append(canonical)
-    return ",".join(sorted(normalized))
+    return sorted(normalized)
 
 
 def add_watchlist_entry(
@@ -81,31 +70,32 @@ def add_watchlist_entry(
     Raises ValueError if any tag is invalid.
     """
     symbol = symbol.upper()
-    tags_str = _normalize_tags(tags or [])
+    normalized = _normalize_tags(tags or [])
     added_at = datetime.now().isoformat()
-    conn = get_watchlist_connection(db_path)
-    try:
+    with db.connection(db_path, _watchlist_factory) as conn:
         with conn:
             cursor = conn.execute(
                 "INSERT INTO watchlist (symbol, tags, added_at) VALUES (?, ?, ?)",
-                (symbol, tags_str, added_at),
+                (symbol, ",".join(normalized), added_at),
+            )
+            conn.executemany(
+                "INSERT INTO watchlist_tags (symbol, tag) VALUES (?, ?)",
+                [(symbol, tag) for tag in normalized],
             )
             return cursor.lastrowid
-    finally:
-        conn.close()
 
 
 def remove_watchlist_entry(symbol: str, *, db_path: Path | None = None) -> bool:
-    """Delete a watchlist entry by symbol. Return *True* if a row was deleted."""
-    conn = get_watchlist_connection(db_path)
-    try:
+    """Delete a watchlist entry by symbol. Return *True* if a row was deleted.
+
+    Its tag rows go with it (``ON DELETE CASCADE``).
+    """
+    with db.connection(db_path, _watchlist_factory) as conn:
         with conn:
             cursor = conn.execute(
                 "DELETE FROM watchlist WHERE symbol = ?", (symbol.upper(),)
             )
             return cursor.rowcount > 0
-    finally:
-        conn.close()
 
 
 def get_all_watchlist_entries(
@@ -113,27 +103,23 @@ def get_all_watchlist_entries(
 ) -> list[WatchlistEntry]:
     """Return all watchlist entries, optionally filtered by tag.
 
-    When tag is provided, only entries whose tags column contains
-    the tag (case-insensitive match) are returned.
+    When tag is provided, only entries carrying that tag (case-insensitive
+    match) are returned.
     """
-    conn = get_watchlist_connection(db_path)
-    try:
+    with db.connection(db_path, _watchlist_factory) as conn:
         if tag:
-            # Match tag as substring within comma-separated list
-            # Use LIKE with the canonical tag form for correctness
             tag_lookup = {t.lower(): t for t in VALID_TAGS}
             canonical = tag_lookup.get(tag.lower(), tag)
             cursor = conn.execute(
-                "SELECT * FROM watchlist WHERE ',' || tags || ',' LIKE ? ORDER BY added_at",
-                (f"%,{canonical},%",),
+                "SELECT w.* FROM watchlist_tags t JOIN watchlist w ON w.symbol = t.symbol "
+                "WHERE t.tag = ? ORDER BY w.added_at",
+                (canonical,),
             )
         else:
             cursor = conn.execute(
                 "SELECT * FROM watchlist ORDER BY added_at"
             )
         return cursor.fetchall()
-    finally:
-        conn.close()
 
 
 def update_watchlist_tags(
@@ -141,27 +127,37 @@ def update_watchlist_tags(
 ) -> bool:
     """Replace all tags on a watchlist entry. Return *True* if a row was updated.
 
+    Only the difference between the old and new tag sets is written.
     Raises ValueError if any tag is invalid.
     """
-    tags_str = _normalize_tags(tags)
-    conn = get_watchlist_connection(db_path)
-    try:
+    symbol = symbol.upper()
+    normalized = _normalize_tags(tags)
+    with db.connection(db_path) as conn:
         with conn:
             cursor = conn.execute(
                 "UPDATE watchlist SET tags = ? WHERE symbol = ?",
-                (tags_str, symbol.upper()),
+                (",".join(normalized), symbol),
             )
-            return cursor.rowcount > 0
-    finally:
-        conn.close()
+            if cursor.rowcount == 0:
+                return False
+            current = {
+                row[0]
+                for row in conn.execute("SELECT tag FROM watchlist_tags WHERE symbol = ?", (symbol,))
+            }
+            new = set(normalized)
+            conn.executemany(
+                "DELETE FROM watchlist_tags WHERE symbol = ? AND tag = ?",
+                [(symbol, tag) for tag in sorted(current - new)],
+            )
+            conn.executemany(
+                "INSERT INTO watchlist_tags (symbol, tag) VALUES (?, ?)",
+                [(symbol, tag) for tag in sorted(new - current)],
+            )
+            return True
 
 
 def get_watchlist_symbols(*, db_path: Path | None = None) -> set[str]:
     """Return the set of all symbols currently on the watchlist."""
-    conn = get_watchlist_connection(db_path)
-    try:
-        conn.row_factory = None  # Override to get raw tuples
+    with db.connection(db_path) as conn:
         cursor = conn.execute("SELECT symbol FROM watchlist")
         return {row[0] for row in cursor.fetchall()}
-    finally:
-        conn.close()
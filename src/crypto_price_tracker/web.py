@@ -2,12 +2,22 @@
 
 Exposes JSON API endpoints that serve cryptocurrency price data from the
 Bitvavo API.  The React SPA frontend (built by Vite) is served via a
-catch-all route.  Real-time price updates are pushed via SSE.
+catch-all route.  Real-time price updates are pushed via SSE from a single
+background ``PriceFeed`` started in the app lifespan and shared by all clients.
+Upstream HTTP goes through the pooled ``client_registry`` and SQLite access
+through the pooled ``db`` connections.  The lifespan applies pending schema
+migrations on startup and runs the daily tick archive compaction; on
+shutdown it closes both pools once the queued tick history writes are flushed.
 
 Endpoints:
-    GET /api/prices          -- Top-N coins as JSON (?top=N, default 20)
-    GET /api/prices/stream   -- SSE stream pushing prices every 10s
+    GET /api/prices          -- Top-N coins as JSON (?top=N, default 20; ?exchange=all merges exchanges)
+    GET /api/prices/stream   -- SSE stream pushing prices every 10s (?delta=true for deltas)
     GET /api/coin/{sym}      -- Single coin detail; 404 if not in top 100
+    GET /api/history/{sym}   -- Recorded price history (?interval=tick|1m|1h|1d&start=&end=)
+    GET /api/metrics         -- Per-exchange latency stats and circuit breaker state
+    GET /api/portfolio/stream -- SSE stream of live portfolio valuations
+    GET /api/portfolio/export -- Streamed holdings download (?format=csv|json|ndjson)
+    POST /api/portfolio/bulk -- Bulk holdings import (CSV or JSON/NDJSON body)
     GET /{path:path}         -- SPA catch-all (static files + index.html)
 """
 
@@ -17,35 +27,59 @@ import asyncio
 import dataclasses
 import io
 import json
+import tempfile
 from collections.abc import AsyncIterable
+from contextlib import asynccontextmanager, suppress
 from pathlib import Path
 
 import httpx
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.sse import EventSourceResponse, ServerSentEvent
 from pydantic import BaseModel, Field
 
+from crypto_price_tracker import db
 from crypto_price_tracker.alerts import check_alerts
 from crypto_price_tracker.alerts_db import (
     add_alert as db_add_alert,
     clear_triggered_alerts as db_clear_triggered,
-    get_active_alerts as db_get_active_alerts,
+    get_alert_index as db_get_alert_index,
     get_all_alerts as db_get_all_alerts,
-    mark_triggered as db_mark_triggered,
+    mark_triggered_many as db_mark_triggered_many,
     remove_alert as db_remove_alert,
 )
 from crypto_price_tracker.api import get_candles
-from crypto_price_tracker.exchange import get_top_coins_with_fallback
-from crypto_price_tracker.models import Candle, CoinData  # noqa: F401 – re-exported for type hints
-from crypto_price_tracker.portfolio import aggregate_portfolio
+from crypto_price_tracker.exchange import (
+    ALL_EXCHANGES,
+    client_registry,
+    exchange_health,
+    flush_tick_recorder,
+    get_consolidated_coins,
+    get_top_coins_with_fallback,
+)
+from crypto_price_tracker.feed import FEED_KEYFRAME_EVERY, PriceFeed, PriceTick
+from crypto_price_tracker.indicators import compute_indicators
+from crypto_price_tracker.models import Candle, CoinData, HoldingRollup  # noqa: F401 – re-exported for type hints
+from crypto_price_tracker.portfolio import (
+    IMPORT_BATCH_SIZE,
+    PortfolioSummary,
+    PortfolioValuation,
+    aggregate_rollups,
+    import_holdings,
+    iter_export,
+)
 from crypto_price_tracker.portfolio_db import (
     add_holding as db_add_holding,
-    get_all_holdings as db_get_all_holdings,
+    add_holdings as db_add_holdings,
+    get_holding_rollups as db_get_holding_rollups,
     get_holdings_by_symbol as db_get_holdings_by_symbol,
+    iter_holdings as db_iter_holdings,
     remove_holding as db_remove_holding,
     update_holding as db_update_holding,
 )
+from crypto_price_tracker.tick_archive import compact_periodically, get_history
+from crypto_price_tracker.ticks_db import get_ticks as db_get_ticks
 from crypto_price_tracker.watchlist_db import (
     add_watchlist_entry as db_add_watchlist,
     get_all_watchlist_entries as db_get_watchlist,
@@ -56,6 +90,23 @@ from crypto_price_tracker.watchlist_db import (
 )
 
 STATIC_DIR = Path(__file__).parent / "static"
+UPLOAD_SPOOL_SIZE = 1024 * 1024  # request bodies larger than this are spooled to disk
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def _portfolio_payload(summary: PortfolioSummary) -> dict:
+    """Return the JSON body for a portfolio summary."""
+    return {
+        "rows": [dataclasses.asdict(r) for r in summary.rows],
+        "total_value": summary.total_value,
+        "total_cost": summary.total_cost,
+        "total_pnl_eur": summary.total_pnl_eur,
+        "total_pnl_pct": summary.total_pnl_pct,
+    }
 
 
 class HoldingCreate(BaseModel):
@@ -96,23 +147,62 @@ class WatchlistTagUpdate(BaseModel):
     tags: list[str]
 
 
-def create_app() -> FastAPI:
-    """Create and return a configured FastAPI application instance."""
-    app = FastAPI(title="Crypto Price Tracker", version="0.1.0")
+def create_app(price_feed: PriceFeed | None = None) -> FastAPI:
+    """Create and return a configured FastAPI application instance.
+
+    *price_feed* replaces the default ``PriceFeed`` (tests pass a stub).
+    """
+    price_feed = PriceFeed() if price_feed is None else price_feed
+    rollup_reads: dict[str, tuple[int, asyncio.Future]] = {}  # exchange -> (tick seq, rollups read)
+
+    async def rollups_for_tick(tick: PriceTick) -> list[HoldingRollup]:
+        """Return the holding rollups for *tick*, read once and shared by every stream."""
+        read = rollup_reads.get(tick.exchange)
+        if read is None or read[0] != tick.seq:
+            read = (tick.seq, asyncio.ensure_future(run_in_threadpool(db_get_holding_rollups)))
+            rollup_reads[tick.exchange] = read
+        # shield: one client disconnecting must not cancel the read for the others
+        return await asyncio.shield(read[1])
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        db.migrate()
+        await price_feed.start()
+        compaction = asyncio.create_task(compact_periodically())
+        try:
+            yield
+        finally:
+            compaction.cancel()
+            with suppress(asyncio.CancelledError):
+                await compaction  # returns once a running compaction thread is done
+            await price_feed.stop()
+            await client_registry.aclose()
+            await asyncio.to_thread(flush_tick_recorder)
+            db.close_all()
+
+    app = FastAPI(title="Crypto Price Tracker", version="0.1.0", lifespan=lifespan)
     app.state.default_exchange = "bitvavo"
+    app.state.price_feed = price_feed
+    app.state.clients = client_registry
 
     @app.get("/api/prices")
     def api_prices(
         top: int = Query(default=20, ge=1, le=100),
-        exchange: str = Query(default=None, pattern="^(bitvavo|binance)$"),
+        exchange: str = Query(default=None, pattern="^(bitvavo|binance|all)$"),
     ):
-        """Return top N coins with triggered alerts flagged."""
+        """Return top N coins with triggered alerts flagged.
+
+        ``exchange=all`` fetches every exchange concurrently and returns
+        consolidated coins with per-exchange ``prices`` and ``spread_pct``.
+        """
         effective_exchange = exchange or getattr(app.state, "default_exchange", "bitvavo")
-        coins, source = get_top_coins_with_fallback(exchange=effective_exchange, top_n=top)
-        active = db_get_active_alerts()
-        triggered_alerts = check_alerts(coins, active)
-        for alert in triggered_alerts:
-            db_mark_triggered(alert.id)
+        if effective_exchange == ALL_EXCHANGES:
+            coins, source = get_consolidated_coins(top_n=top)
+        else:
+            coins, source = get_top_coins_with_fallback(exchange=effective_exchange, top_n=top)
+        triggered_alerts = check_alerts(coins, db_get_alert_index())
+        flipped = db_mark_triggered_many([a.id for a in triggered_alerts])
+        triggered_alerts = [a for a in triggered_alerts if a.id in flipped]
         return {
             "coins": [dataclasses.asdict(c) for c in coins],
             "triggered_alerts": [dataclasses.asdict(a) for a in triggered_alerts],
@@ -143,21 +233,14 @@ def create_app() -> FastAPI:
     @app.get("/api/portfolio")
     def api_portfolio_list():
         """Return aggregated portfolio with live prices."""
-        holdings = db_get_all_holdings()
+        rollups = db_get_holding_rollups()
         prices: dict = {}
         try:
             coins, _ = get_top_coins_with_fallback(top_n=100)
             prices = {c.symbol: c for c in coins}
         except (httpx.HTTPStatusError, httpx.ConnectError, httpx.TimeoutException):
             pass  # best-effort pricing
-        summary = aggregate_portfolio(holdings, prices)
-        return {
-            "rows": [dataclasses.asdict(r) for r in summary.rows],
-            "total_value": summary.total_value,
-            "total_cost": summary.total_cost,
-            "total_pnl_eur": summary.total_pnl_eur,
-            "total_pnl_pct": summary.total_pnl_pct,
-        }
+        return _portfolio_payload(aggregate_rollups(rollups, prices))
 
     @app.get("/api/portfolio/lots/{symbol}")
     def api_portfolio_lots(symbol: str):
@@ -165,6 +248,16 @@ def create_app() -> FastAPI:
         lots = db_get_holdings_by_symbol(symbol.upper())
         return [dataclasses.asdict(h) for h in lots]
 
+    @app.get("/api/portfolio/export")
+    def api_portfolio_export(format: str = Query(default="csv", pattern="^(csv|json|ndjson)$")):
+        """Stream all holdings as a CSV, JSON or NDJSON download."""
+        headers = {"Content-Disposition": f'attachment; filename="portfolio.{format}"'}
+        return StreamingResponse(
+            iter_export(db_iter_holdings(), format),
+            media_type=EXPORT_MEDIA_TYPES[format],
+            headers=headers,
+        )
+
     @app.post("/api/portfolio", status_code=201)
     def api_portfolio_add(body: HoldingCreate):
         """Add a new holding to the portfolio."""
@@ -174,6 +267,34 @@ def create_app() -> FastAPI:
             raise HTTPException(status_code=400, detail=str(e))
         return {"id": row_id, "status": "created"}
 
+    @app.post("/api/portfolio/bulk")
+    async def api_portfolio_bulk(
+        request: Request,
+        format: str | None = Query(default=None, pattern="^(csv|json)$"),
+        batch_size: int = Query(default=IMPORT_BATCH_SIZE, ge=1),
+    ):
+        """Bulk-import holdings from a CSV or JSON/NDJSON request body.
+
+        The format comes from ``?format=`` or else the Content-Type.  The body
+        is spooled (to disk when large) and parsed as a stream in a worker
+        thread; valid rows are inserted in batches and invalid ones reported.
+        """
+        fmt = format or ("csv" if "csv" in request.headers.get("content-type", "") else "json")
+        with tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_SIZE) as spool:
+            async for chunk in request.stream():
+                spool.write(chunk)
+            spool.seek(0)
+            text = io.TextIOWrapper(spool, encoding="utf-8", newline="")
+            report = await run_in_threadpool(
+                import_holdings, text, fmt, db_add_holdings, batch_size=batch_size,
+            )
+        return {
+            "rows": report.rows,
+            "imported": report.imported,
+            "failed": report.failed,
+            "errors": [dataclasses.asdict(e) for e in report.errors],
+        }
+
     @app.put("/api/portfolio/{holding_id}")
     def api_portfolio_update(holding_id: int, body: HoldingUpdate):
         """Update fields of an existing holding."""
@@ -317,8 +438,8 @@ def create_app() -> FastAPI:
         from crypto_price_tracker.alerts_db import get_all_alerts
         from crypto_price_tracker.report import generate_report_html, html_to_pdf
 
-        # Gather data
-        holdings = db_get_all_holdings()
+        # Gather data (per-symbol rollups: the report never needs individual lots)
+        rollups = db_get_holding_rollups()
         prices: dict = {}
         coins: list = []
         try:
@@ -326,7 +447,7 @@ def create_app() -> FastAPI:
             prices = {c.symbol: c for c in coins}
         except (httpx.HTTPStatusError, httpx.ConnectError, httpx.TimeoutException):
             pass
-        portfolio = aggregate_portfolio(holdings, prices)
+        portfolio = aggregate_rollups(rollups, prices)
         watchlist = get_all_watchlist_entries()
         alerts = get_all_alerts()
 
@@ -365,37 +486,158 @@ def create_app() -> FastAPI:
                     detail=f"No candle data for '{symbol}'",
                 )
             raise
-        return [dataclasses.asdict(c) for c in candles]
+        return candles.to_records()
+
+    @app.get("/api/indicators/{symbol}")
+    def api_indicators(
+        symbol: str,
+        interval: str = Query(default="4h", pattern="^(1m|5m|15m|30m|1h|2h|4h|6h|8h|12h|1d)$"),
+        limit: int = Query(default=200, ge=1, le=1440),
+        series: bool = Query(default=False),
+    ):
+        """Return technical indicators computed over a market's candle history.
+
+        The newest value of each indicator is always included; ``series=true``
+        adds the full indicator columns aligned with the candles.
+        """
+        symbol = symbol.upper()
+        market = f"{symbol}-EUR"
+        try:
+            candles = get_candles(market, interval=interval, limit=limit)
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 400:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"No candle data for '{symbol}'",
+                )
+            raise
+        indicators = compute_indicators(candles, interval)
+        result = {
+            "symbol": symbol,
+            "interval": interval,
+            "candles": len(candles),
+            "latest": indicators.latest(),
+        }
+        if series:
+            result["series"] = indicators.to_dict()
+        return result
 
-    # --- SSE endpoint ---
+    @app.get("/api/history/{symbol}")
+    def api_history(
+        symbol: str,
+        interval: str = Query(default="1h", pattern="^(tick|1m|1h|1d)$"),
+        exchange: str = Query(default=None, pattern="^(bitvavo|binance)$"),
+        start: int | None = Query(default=None, ge=0),
+        end: int | None = Query(default=None, ge=0),
+        limit: int = Query(default=500, ge=1, le=10000),
+    ):
+        """Return recorded price history from the local tick store (never upstream).
+
+        ``interval=tick`` returns raw ticks; otherwise OHLC buckets, read
+        from the memory-mapped archive plus the newer buckets in SQLite.
+        Buckets carry ``volume_eur_24h`` (the rolling 24h volume at the
+        bucket's close) instead of a per-interval candle ``volume``.
+        *start*/*end* are Unix milliseconds; the newest *limit* entries in
+        the range are returned, oldest first.
+        """
+        symbol = symbol.upper()
+        effective_exchange = exchange or getattr(app.state, "default_exchange", "bitvavo")
+        if interval == "tick":
+            ticks = db_get_ticks(symbol, effective_exchange, start=start, end=end, limit=limit)
+            return [dataclasses.asdict(t) for t in ticks]
+        if not symbol.isalnum():
+            raise HTTPException(status_code=404, detail=f"No history for '{symbol}'")
+        buckets = get_history(symbol, effective_exchange, interval, start=start, end=end, limit=limit)
+        records = buckets.to_records()
+        for record in records:
+            # Rolling 24h volume at the bucket's close, not volume within the bucket
+            record["volume_eur_24h"] = record.pop("volume")
+        return records
+
+    @app.get("/api/metrics")
+    def api_metrics():
+        """Return per-exchange latency stats and circuit breaker state/transitions."""
+        return {"exchanges": exchange_health.metrics()}
+
+    # --- SSE endpoints ---
 
     @app.get("/api/prices/stream", response_class=EventSourceResponse)
     async def stream_prices(
         top: int = Query(default=20, ge=1, le=100),
         exchange: str = Query(default=None, pattern="^(bitvavo|binance)$"),
+        delta: bool = Query(default=False),
     ) -> AsyncIterable[ServerSentEvent]:
-        """Push price updates every 10 seconds via SSE."""
+        """Push price updates from the shared price feed via SSE.
+
+        Every event's id is its tick's ``seq``.  With ``delta=true`` the first
+        event and every ``FEED_KEYFRAME_EVERY``-th one after it is a full
+        ``prices`` keyframe; the rest are ``delta`` events relative to the
+        previous event (see ``PriceTick.delta_frame``).  A client whose last
+        id differs from a delta's ``base`` has missed an event and should
+        reconnect, which always starts with a keyframe.
+        """
         effective_exchange = exchange or getattr(app.state, "default_exchange", "bitvavo")
-        event_id = 0
-        while True:
-            coins, source = get_top_coins_with_fallback(exchange=effective_exchange, top_n=top)
-            active = db_get_active_alerts()
-            triggered_alerts = check_alerts(coins, active)
-            for alert in triggered_alerts:
-                db_mark_triggered(alert.id)
-            data = {
-                "coins": [dataclasses.asdict(c) for c in coins],
-                "triggered_alerts": [dataclasses.asdict(a) for a in triggered_alerts],
-                "exchange": source,
-            }
-            yield ServerSentEvent(
-                data=data,
-                event="prices",
-                id=str(event_id),
-                retry=10000,
-            )
-            event_id += 1
-            await asyncio.sleep(10)
+        subscription = price_feed.subscribe(effective_exchange)
+        base = None
+        since_keyframe = 0
+        try:
+            async for tick in subscription:
+                if delta and base is not None and since_keyframe < FEED_KEYFRAME_EVERY:
+                    event, raw = "delta", tick.delta_frame(base, top)
+                else:
+                    event, raw = "prices", tick.frame(top)
+                    since_keyframe = 0
+                base = tick
+                since_keyframe += 1
+                yield ServerSentEvent(
+                    raw_data=raw,
+                    event=event,
+                    id=str(tick.seq),
+                    retry=10000,
+                )
+        finally:
+            price_feed.unsubscribe(subscription)
+
+    @app.get("/api/portfolio/stream", response_class=EventSourceResponse)
+    async def stream_portfolio(
+        exchange: str = Query(default=None, pattern="^(bitvavo|binance)$"),
+    ) -> AsyncIterable[ServerSentEvent]:
+        """Push live portfolio valuations from the shared price feed via SSE.
+
+        Every connection, including a reconnect carrying ``Last-Event-ID``,
+        starts with a full ``snapshot`` event: deltas are relative to what the
+        connection has already been sent.  Later ticks yield ``delta`` events
+        with the totals and only the rows that moved (see
+        ``PortfolioValuation.delta``).  The per-symbol rollups are read once
+        per tick for all connections, and a changed holdings set yields a new
+        snapshot.
+        """
+        effective_exchange = exchange or getattr(app.state, "default_exchange", "bitvavo")
+        subscription = price_feed.subscribe(effective_exchange)
+        rollups = None
+        valuation = None
+        try:
+            async for tick in subscription:
+                prices = {c.symbol: c for c in tick.coins}
+                latest = await rollups_for_tick(tick)
+                if latest != rollups:
+                    rollups = latest
+                    valuation = PortfolioValuation(rollups, prices)
+                    event, summary = "snapshot", valuation.snapshot()
+                elif valuation.update_prices(prices):
+                    event, summary = "delta", valuation.delta()
+                    if not summary.rows:
+                        continue
+                else:
+                    continue
+                yield ServerSentEvent(
+                    raw_data=json.dumps(_portfolio_payload(summary)),
+                    event=event,
+                    id=str(tick.seq),
+                    retry=10000,
+                )
+        finally:
+            price_feed.unsubscribe(subscription)
 
     # --- SPA catch-all (must be LAST route) ---
 
@@ -6,9 +6,36 @@ from pathlib import Path
 
 import pytest
 
+from crypto_price_tracker import alerts_db, db, exchange
 from crypto_price_tracker.models import CoinData, Holding, PriceAlert
 
 
+@pytest.fixture(autouse=True)
+def _reset_ticker_cache(_isolate_default_db):
+    """Start every test with empty ticker/alert caches, client registry, exchange stats and DB pool.
+
+    Depends on ``_isolate_default_db`` so queued tick writes are flushed
+    while the default database still points into tmp_path.
+    """
+    exchange.clear_ticker_cache()
+    exchange.client_registry.close()
+    exchange.exchange_health.reset()
+    alerts_db.clear_alert_indexes()
+    yield
+    exchange.clear_ticker_cache()
+    exchange.client_registry.close()
+    exchange.exchange_health.reset()
+    alerts_db.clear_alert_indexes()
+    exchange.flush_tick_recorder()
+    db.close_all()
+
+
+@pytest.fixture(autouse=True)
+def _isolate_default_db(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Point the default database path into tmp_path (``main()`` migrates it on startup)."""
+    monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path / "xdg"))
+
+
 @pytest.fixture
 def tmp_db_path(tmp_path: Path) -> Path:
     """Return a temporary SQLite database file path inside pytest's tmp_path."""
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import pytest
 
-from crypto_price_tracker.alerts import check_alerts
+from crypto_price_tracker.alerts import AlertIndex, check_alerts
 from crypto_price_tracker.models import CoinData, PriceAlert
 
 
@@ -109,3 +109,69 @@ def test_check_alerts_only_checks_active_status():
     coins = [_coin("BTC", 60000.0)]
     result = check_alerts(coins, [alert])
     assert len(result) == 1
+
+
+def test_alert_index_matches_threshold_prefixes():
+    """Above alerts trigger at or below the price, below alerts at or above it."""
+    index = AlertIndex([
+        _alert(id=1, target_price=100.0, direction="above"),
+        _alert(id=2, target_price=200.0, direction="above"),
+        _alert(id=3, target_price=300.0, direction="above"),
+        _alert(id=4, target_price=150.0, direction="below"),
+        _alert(id=5, target_price=250.0, direction="below"),
+        _alert(id=6, symbol="ETH", target_price=1.0, direction="above"),
+    ])
+
+    assert [a.id for a in index.match([_coin("BTC", 200.0)])] == [1, 2, 5]
+    assert [a.id for a in index.match([_coin("BTC", 99.0)])] == [4, 5]
+    assert [a.id for a in index.match([_coin("BTC", 300.0)])] == [1, 2, 3]
+
+
+def test_alert_index_add_and_discard():
+    index = AlertIndex()
+    index.add(_alert(id=1, target_price=100.0, direction="above"))
+    index.add(_alert(id=2, target_price=100.0, direction="above"))
+
+    assert index.discard(1).id == 1
+    assert index.discard(1) is None
+    assert [a.id for a in index.match([_coin("BTC", 100.0)])] == [2]
+    assert index.fingerprint() == (1, 2)
+
+    index.discard(2)
+    assert len(index) == 0
+    assert index.match([_coin("BTC", 100.0)]) == []
+
+
+def test_check_alerts_accepts_index_and_dedupes_repeated_symbols():
+    index = AlertIndex([_alert(id=1, target_price=100.0, direction="above")])
+    coins = [_coin("BTC", 150.0), _coin("BTC", 160.0)]
+
+    assert [a.id for a in check_alerts(coins, index)] == [1]
+
+
+def test_alert_index_match_is_consistent_during_concurrent_adds():
+    """A match running while another thread adds alerts only returns alerts the price triggers."""
+    import sys
+    import threading
+
+    index = AlertIndex([_alert(id=i, target_price=100.0 + i) for i in range(1, 200)])
+    done = threading.Event()
+    wrong: list[PriceAlert] = []
+
+    def writer():
+        for i in range(200, 5200):
+            index.add(_alert(id=i, target_price=149.0 - i * 0.01))  # shifts every key below the price
+        done.set()
+
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        thread = threading.Thread(target=writer)
+        thread.start()
+        while not done.is_set():
+            wrong.extend(a for a in index.match([_coin("BTC", 150.0)]) if a.target_price > 150.0)
+        thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+    assert wrong == []
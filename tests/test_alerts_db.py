@@ -12,8 +12,10 @@ from crypto_price_tracker.alerts_db import (
     clear_triggered_alerts,
     get_active_alerts,
     get_alert_connection,
+    get_alert_index,
     get_all_alerts,
     mark_triggered,
+    mark_triggered_many,
     remove_alert,
 )
 
@@ -131,6 +133,29 @@ def test_mark_triggered_not_found(tmp_db_path):
     assert mark_triggered(999, db_path=tmp_db_path) is False
 
 
+def test_mark_triggered_many_returns_flipped_ids(tmp_db_path):
+    """Only active alerts flip; already-triggered and unknown IDs are left out."""
+    id1 = add_alert("BTC", 50000.0, db_path=tmp_db_path)
+    id2 = add_alert("ETH", 3000.0, db_path=tmp_db_path)
+    id3 = add_alert("SOL", 100.0, db_path=tmp_db_path)
+    mark_triggered(id1, db_path=tmp_db_path)
+
+    flipped = mark_triggered_many([id1, id2, id3, id2, 999], db_path=tmp_db_path)
+
+    assert flipped == {id2, id3}
+    assert get_active_alerts(db_path=tmp_db_path) == []
+    statuses = {a.id: (a.status, a.triggered_at) for a in get_all_alerts(db_path=tmp_db_path)}
+    assert statuses[id2][0] == "triggered"
+    assert statuses[id2][1] == statuses[id3][1]  # one transaction, one timestamp
+
+
+def test_mark_triggered_many_chunks_large_batches(tmp_db_path):
+    ids = [add_alert("BTC", 1000.0 + i, db_path=tmp_db_path) for i in range(1200)]
+
+    assert mark_triggered_many(ids, db_path=tmp_db_path) == set(ids)
+    assert mark_triggered_many([], db_path=tmp_db_path) == set()
+
+
 def test_clear_triggered_alerts(tmp_db_path):
     id1 = add_alert("BTC", 100000.0, "above", db_path=tmp_db_path)
     id2 = add_alert("ETH", 1500.0, "below", db_path=tmp_db_path)
@@ -184,3 +209,39 @@ def test_both_tables_coexist_in_same_db(tmp_db_path):
     finally:
         conn_portfolio.close()
         conn_alerts.close()
+
+
+def test_alert_index_loaded_once_and_updated_incrementally(tmp_db_path):
+    """Adds, removes and triggers through alerts_db update the cached index in place."""
+    first = add_alert("BTC", 50000.0, "above", db_path=tmp_db_path)
+    index = get_alert_index(db_path=tmp_db_path)
+    assert first in index
+
+    second = add_alert("ETH", 1000.0, "below", db_path=tmp_db_path)
+    third = add_alert("SOL", 10.0, "below", db_path=tmp_db_path)
+    mark_triggered(first, db_path=tmp_db_path)
+    remove_alert(third, db_path=tmp_db_path)
+
+    assert get_alert_index(db_path=tmp_db_path) is index
+    assert first not in index
+    assert second in index
+    assert third not in index
+    assert len(index) == 1
+
+
+def test_alert_index_reloads_after_external_write(tmp_db_path):
+    """Writes from another connection (e.g. another process) are picked up."""
+    add_alert("BTC", 50000.0, "above", db_path=tmp_db_path)
+    index = get_alert_index(db_path=tmp_db_path)
+
+    conn = get_alert_connection(tmp_db_path)
+    with conn:
+        conn.execute(
+            "INSERT INTO alerts (symbol, target_price, direction, status, created_at) "
+            "VALUES ('ETH', 1000.0, 'below', 'active', '2026-03-01T10:00:00')"
+        )
+    conn.close()
+
+    reloaded = get_alert_index(db_path=tmp_db_path)
+    assert reloaded is not index
+    assert len(reloaded) == 2
@@ -1,11 +1,20 @@
 """Unit tests for the Bitvavo API client using mocked HTTP responses."""
 
+import asyncio
+import time
+
 import pytest
 from pytest_httpx import HTTPXMock
 
 import httpx
 
-from crypto_price_tracker.api import BitvavoClient
+from crypto_price_tracker.api import (
+    AsyncBitvavoClient,
+    BitvavoClient,
+    RateLimitGate,
+    fetch_candles_batch,
+    get_candles_batch,
+)
 from crypto_price_tracker.models import Candle, CoinData
 
 # ---------------------------------------------------------------------------
@@ -44,6 +53,11 @@ def make_candle(ts: int, open_: str, high: str, low: str, close: str, vol: str)
     return [ts, open_, high, low, close, vol]
 
 
+H4 = 4 * 3_600_000
+D1 = 86_400_000
+NOW_4H = int(time.time() * 1000) // H4 * H4  # start of the current 4h bucket, so stored tails are fresh
+NOW_1D = int(time.time() * 1000) // D1 * D1
+
 BITVAVO_TICKER_URL = "https://api.bitvavo.com/v2/ticker/24h"
 BITVAVO_ASSETS_URL = "https://api.bitvavo.com/v2/assets"
 
@@ -234,3 +248,341 @@ def test_get_candles_raises_on_invalid_market(httpx_mock: HTTPXMock) -> None:
     with BitvavoClient() as client:
         with pytest.raises(httpx.HTTPStatusError):
             client.get_candles("INVALID-EUR")
+
+
+# ---------------------------------------------------------------------------
+# Async client tests
+# ---------------------------------------------------------------------------
+
+
+def test_async_get_top_coins_matches_sync_parsing(httpx_mock: HTTPXMock) -> None:
+    """AsyncBitvavoClient returns the same sorted, EUR-only coins as the sync client."""
+    ticker = [
+        make_ticker("AAA-EUR", last="100", open_="90", volume="1000", volume_quote="50000"),
+        make_ticker("BBB-EUR", last="200", open_="210", volume="500", volume_quote="100000"),
+        make_ticker("BTC-USDT", last="50000", open_="49000", volume="10", volume_quote="500000"),
+    ]
+    httpx_mock.add_response(url=BITVAVO_TICKER_URL, json=ticker)
+    httpx_mock.add_response(url=BITVAVO_ASSETS_URL, json=make_assets(("AAA", "AlphaCoin")))
+
+    async def fetch() -> list[CoinData]:
+        async with AsyncBitvavoClient(top_n=10) as client:
+            return await client.get_top_coins()
+
+    results = asyncio.run(fetch())
+
+    assert [c.symbol for c in results] == ["BBB", "AAA"]
+    assert results[1].name == "AlphaCoin"
+    assert results[1].change_24h == pytest.approx(11.11, abs=0.01)
+
+
+def test_async_get_top_coins_none_returns_all(httpx_mock: HTTPXMock) -> None:
+    """top_n=None returns every EUR market."""
+    ticker = [
+        make_ticker(f"C{i}-EUR", last="1", open_="1", volume="1", volume_quote=str(i))
+        for i in range(1, 31)
+    ]
+    httpx_mock.add_response(url=BITVAVO_TICKER_URL, json=ticker)
+    httpx_mock.add_response(url=BITVAVO_ASSETS_URL, json=[])
+
+    async def fetch() -> list[CoinData]:
+        async with AsyncBitvavoClient(top_n=None) as client:
+            return await client.get_top_coins()
+
+    assert len(asyncio.run(fetch())) == 30
+
+
+def test_async_get_candles_returns_chronological(httpx_mock: HTTPXMock) -> None:
+    """AsyncBitvavoClient.get_candles reverses the newest-first API order."""
+    raw = [
+        make_candle(2000, "101", "103", "100", "102", "20"),
+        make_candle(1000, "100", "102", "99", "101", "30"),
+    ]
+    httpx_mock.add_response(
+        url="https://api.bitvavo.com/v2/BTC-EUR/candles?interval=1d&limit=2",
+        json=raw,
+    )
+
+    async def fetch() -> list[Candle]:
+        async with AsyncBitvavoClient() as client:
+            return await client.get_candles("BTC-EUR", interval="1d", limit=2)
+
+    candles = asyncio.run(fetch())
+
+    assert [c.timestamp for c in candles] == [1000, 2000]
+    assert candles[0].close == 101.0
+
+
+def test_async_get_candles_raises_on_invalid_market(httpx_mock: HTTPXMock) -> None:
+    """Invalid market should raise HTTPStatusError on 400 response."""
+    httpx_mock.add_response(
+        url="https://api.bitvavo.com/v2/INVALID-EUR/candles?interval=4h&limit=42",
+        status_code=400,
+    )
+
+    async def fetch() -> list[Candle]:
+        async with AsyncBitvavoClient() as client:
+            return await client.get_candles("INVALID-EUR")
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(fetch())
+
+
+def test_module_get_candles_uses_pooled_client(httpx_mock: HTTPXMock, tmp_db_path) -> None:
+    """The module-level get_candles reuses the registry's Bitvavo client."""
+    from crypto_price_tracker.api import get_candles
+    from crypto_price_tracker.exchange import client_registry
+
+    httpx_mock.add_response(
+        url="https://api.bitvavo.com/v2/BTC-EUR/candles?interval=4h&limit=1",
+        json=[make_candle(NOW_4H, "1", "1", "1", "1", "1")],
+    )
+    httpx_mock.add_response(
+        url=f"https://api.bitvavo.com/v2/BTC-EUR/candles?interval=4h&limit=1&start={NOW_4H}",
+        json=[make_candle(NOW_4H, "1", "1", "1", "2", "1")],
+    )
+
+    client = client_registry.get("bitvavo")
+    first = get_candles("BTC-EUR", limit=1, db_path=tmp_db_path)
+    second = get_candles("BTC-EUR", limit=1, db_path=tmp_db_path)
+
+    assert client_registry.get("bitvavo") is client
+    assert (first[0].timestamp, first[0].close) == (NOW_4H, 1.0)
+    assert (second[0].timestamp, second[0].close) == (NOW_4H, 2.0)
+
+
+# ---------------------------------------------------------------------------
+# Candle store read-through tests
+# ---------------------------------------------------------------------------
+
+
+def test_get_candles_cold_cache_fetches_full_history(httpx_mock: HTTPXMock, tmp_db_path) -> None:
+    """With nothing stored, the full limit is downloaded and stored."""
+    from crypto_price_tracker.api import get_candles
+    from crypto_price_tracker.candles_db import get_stored_candles
+
+    httpx_mock.add_response(
+        url="https://api.bitvavo.com/v2/BTC-EUR/candles?interval=4h&limit=3",
+        json=[
+            make_candle(3000, "3", "3", "3", "3", "3"),
+            make_candle(2000, "2", "2", "2", "2", "2"),
+            make_candle(1000, "1", "1", "1", "1", "1"),
+        ],
+    )
+
+    candles = get_candles("BTC-EUR", limit=3, db_path=tmp_db_path)
+
+    assert [c.timestamp for c in candles] == [1000, 2000, 3000]
+    assert len(get_stored_candles("BTC-EUR", "4h", 10, db_path=tmp_db_path)) == 3
+
+
+def test_get_candles_warm_cache_fetches_only_tail(httpx_mock: HTTPXMock, tmp_db_path) -> None:
+    """With enough history stored, only candles from the newest bucket are fetched and merged."""
+    from crypto_price_tracker.api import get_candles
+    from crypto_price_tracker.candles_db import store_candles
+
+    store_candles(
+        "BTC-EUR",
+        "4h",
+        [Candle(NOW_4H - k * H4, 1.0, 1.0, 1.0, 1.0, 1.0) for k in (3, 2, 1)],
+        db_path=tmp_db_path,
+    )
+    httpx_mock.add_response(
+        url=f"https://api.bitvavo.com/v2/BTC-EUR/candles?interval=4h&limit=3&start={NOW_4H - H4}",
+        json=[
+            make_candle(NOW_4H, "4", "4", "4", "4", "4"),
+            make_candle(NOW_4H - H4, "1", "1", "1", "3.5", "1"),  # forming bucket updated
+        ],
+    )
+
+    candles = get_candles("BTC-EUR", limit=3, db_path=tmp_db_path)
+
+    assert [c.timestamp for c in candles] == [NOW_4H - 2 * H4, NOW_4H - H4, NOW_4H]
+    assert candles[1].close == 3.5
+
+
+def test_get_candles_refetches_history_after_a_stale_tail(httpx_mock: HTTPXMock, tmp_db_path) -> None:
+    """A tail older than *limit* intervals is not resumed from, so no gap is left behind it."""
+    from crypto_price_tracker.api import get_candles
+    from crypto_price_tracker.candles_db import store_candles
+
+    store_candles(
+        "BTC-EUR",
+        "4h",
+        [Candle(NOW_4H - k * H4, 1.0, 1.0, 1.0, 1.0, 1.0) for k in (12, 11, 10)],
+        db_path=tmp_db_path,
+    )
+    httpx_mock.add_response(
+        url="https://api.bitvavo.com/v2/BTC-EUR/candles?interval=4h&limit=3",
+        json=[make_candle(NOW_4H - k * H4, "2", "2", "2", "2", "2") for k in (0, 1, 2)],
+    )
+
+    candles = get_candles("BTC-EUR", limit=3, db_path=tmp_db_path)
+
+    assert [c.timestamp for c in candles] == [NOW_4H - 2 * H4, NOW_4H - H4, NOW_4H]
+
+
+def test_get_candles_serves_stored_history_when_offline(httpx_mock: HTTPXMock, tmp_db_path) -> None:
+    """A connection error during a tail refresh returns the stored candles."""
+    from crypto_price_tracker.api import get_candles
+    from crypto_price_tracker.candles_db import store_candles
+
+    store_candles("BTC-EUR", "4h", [Candle(NOW_4H, 1.0, 1.0, 1.0, 1.0, 1.0)], db_path=tmp_db_path)
+    httpx_mock.add_exception(httpx.ConnectError("Connection refused"))
+
+    candles = get_candles("BTC-EUR", limit=1, db_path=tmp_db_path)
+
+    assert [c.timestamp for c in candles] == [NOW_4H]
+
+
+# ---------------------------------------------------------------------------
+# Batched candle fetch tests
+# ---------------------------------------------------------------------------
+
+
+def test_get_candles_batch_keys_by_market_and_interval(httpx_mock: HTTPXMock, tmp_db_path) -> None:
+    """Every (market, interval) request gets its own entry."""
+    for market in ("BTC-EUR", "ETH-EUR"):
+        httpx_mock.add_response(
+            url=f"https://api.bitvavo.com/v2/{market}/candles?interval=4h&limit=42",
+            json=[make_candle(1000, "1", "1", "1", "1", "1")],
+        )
+        httpx_mock.add_response(
+            url=f"https://api.bitvavo.com/v2/{market}/candles?interval=1d&limit=30",
+            json=[make_candle(2000, "2", "2", "2", "2", "2"), make_candle(1000, "1", "1", "1", "1", "1")],
+        )
+
+    results = get_candles_batch(
+        [
+            ("BTC-EUR", "4h", 42),
+            ("BTC-EUR", "1d", 30),
+            ("ETH-EUR", "4h", 42),
+            ("ETH-EUR", "1d", 30),
+        ],
+        db_path=tmp_db_path,
+    )
+
+    assert set(results) == {
+        ("BTC-EUR", "4h"), ("BTC-EUR", "1d"), ("ETH-EUR", "4h"), ("ETH-EUR", "1d"),
+    }
+    assert [c.timestamp for c in results[("ETH-EUR", "1d")]] == [1000, 2000]
+
+
+def test_get_candles_batch_omits_failed_markets(httpx_mock: HTTPXMock, tmp_db_path) -> None:
+    """Invalid markets are left out instead of failing the whole batch."""
+    httpx_mock.add_response(
+        url="https://api.bitvavo.com/v2/BTC-EUR/candles?interval=4h&limit=42",
+        json=[make_candle(1000, "1", "1", "1", "1", "1")],
+    )
+    httpx_mock.add_response(
+        url="https://api.bitvavo.com/v2/BAD-EUR/candles?interval=4h&limit=42",
+        status_code=400,
+    )
+
+    results = get_candles_batch([("BTC-EUR", "4h", 42), ("BAD-EUR", "4h", 42)], db_path=tmp_db_path)
+
+    assert list(results) == [("BTC-EUR", "4h")]
+
+
+def test_get_candles_batch_retries_after_rate_limit(httpx_mock: HTTPXMock, tmp_db_path) -> None:
+    """A 429 response is retried once the rate-limit window allows it."""
+    url = "https://api.bitvavo.com/v2/BTC-EUR/candles?interval=4h&limit=42"
+    httpx_mock.add_response(url=url, status_code=429, headers={"Retry-After": "0"})
+    httpx_mock.add_response(url=url, json=[make_candle(1000, "1", "1", "1", "1", "1")])
+
+    results = get_candles_batch([("BTC-EUR", "4h", 42)], db_path=tmp_db_path)
+
+    assert len(results[("BTC-EUR", "4h")]) == 1
+    assert len(httpx_mock.get_requests()) == 2
+
+
+def test_fetch_candles_batch_respects_concurrency_limit() -> None:
+    """No more than *concurrency* requests are in flight at once."""
+    in_flight = 0
+    peak = 0
+
+    class SlowClient:
+        async def get_candles(
+            self, market: str, interval: str, limit: int, start: int | None = None,
+        ) -> list[Candle]:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return []
+
+    requests = [(f"C{i}-EUR", "4h", 42) for i in range(20)]
+    results = asyncio.run(fetch_candles_batch(requests, concurrency=3, client=SlowClient()))
+
+    assert len(results) == 20
+    assert peak == 3
+
+
+def test_rate_limit_gate_pauses_when_budget_low() -> None:
+    """Low remaining weight pauses until the reported reset time."""
+    gate = RateLimitGate(reserve=10)
+    request = httpx.Request("GET", "https://api.bitvavo.com/v2/time")
+
+    gate.observe(httpx.Response(200, headers={"bitvavo-ratelimit-remaining": "500"}, request=request))
+    assert gate.delay == 0.0
+
+    reset_at = int((time.time() + 5) * 1000)
+    gate.observe(
+        httpx.Response(
+            200,
+            headers={"bitvavo-ratelimit-remaining": "5", "bitvavo-ratelimit-resetat": str(reset_at)},
+            request=request,
+        )
+    )
+    assert 4.0 < gate.delay <= 5.0
+
+
+def test_get_candles_batch_fetches_tails_for_stored_series(httpx_mock: HTTPXMock, tmp_db_path) -> None:
+    """Series with enough stored history only download their tail."""
+    from crypto_price_tracker.candles_db import store_candles
+
+    store_candles("BTC-EUR", "1d", [Candle(NOW_1D, 1.0, 1.0, 1.0, 1.0, 1.0)], db_path=tmp_db_path)
+    httpx_mock.add_response(
+        url=f"https://api.bitvavo.com/v2/BTC-EUR/candles?interval=1d&limit=1&start={NOW_1D}",
+        json=[make_candle(NOW_1D, "2", "2", "2", "2", "2")],
+    )
+
+    results = get_candles_batch([("BTC-EUR", "1d", 1)], db_path=tmp_db_path)
+
+    assert [(c.timestamp, c.close) for c in results[("BTC-EUR", "1d")]] == [(NOW_1D, 2.0)]
+
+
+def test_rate_limit_gate_tolerates_malformed_headers() -> None:
+    """Non-numeric rate-limit headers never raise; a 429 without a usable reset pauses 1s."""
+    gate = RateLimitGate(reserve=10)
+    request = httpx.Request("GET", "https://api.bitvavo.com/v2/time")
+
+    gate.observe(httpx.Response(200, headers={"bitvavo-ratelimit-remaining": "n/a"}, request=request))
+    assert gate.delay == 0.0
+
+    gate.observe(
+        httpx.Response(
+            200,
+            headers={"bitvavo-ratelimit-remaining": "5", "bitvavo-ratelimit-resetat": "soon"},
+            request=request,
+        )
+    )
+    assert 0.0 < gate.delay <= 1.0
+
+    gate = RateLimitGate()
+    gate.observe(httpx.Response(429, headers={"retry-after": "later"}, request=request))
+    assert 0.0 < gate.delay <= 1.0
+
+
+def test_get_candles_batch_survives_malformed_rate_limit_header(httpx_mock: HTTPXMock, tmp_db_path) -> None:
+    """A malformed rate-limit header on one response does not fail the batch."""
+    httpx_mock.add_response(
+        url="https://api.bitvavo.com/v2/BTC-EUR/candles?interval=1d&limit=1",
+        json=[make_candle(NOW_1D, "1", "1", "1", "1", "1")],
+        headers={"bitvavo-ratelimit-remaining": "n/a", "bitvavo-ratelimit-resetat": "soon"},
+    )
+
+    results = get_candles_batch([("BTC-EUR", "1d", 1)], db_path=tmp_db_path)
+
+    assert [c.timestamp for c in results[("BTC-EUR", "1d")]] == [NOW_1D]
@@ -0,0 +1,92 @@
+"""Unit tests for the SQLite candle history storage layer."""
+
+from __future__ import annotations
+
+from crypto_price_tracker.models import Candle
+from crypto_price_tracker.candles_db import (
+    get_candle_connection,
+    get_refresh_start,
+    get_stored_candles,
+    store_candles,
+)
+
+
+H4 = 4 * 3_600_000
+NOW = 1_000 * H4 + 1
+
+
+def make_candles(*timestamps: int, close: float = 1.0) -> list[Candle]:
+    return [Candle(ts, 1.0, 2.0, 0.5, close, 10.0) for ts in timestamps]
+
+
+def test_candle_schema_created_on_connect(tmp_db_path):
+    conn = get_candle_connection(tmp_db_path)
+    try:
+        conn.row_factory = None
+        cursor = conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name='candles'"
+        )
+        assert cursor.fetchone() is not None
+    finally:
+        conn.close()
+
+
+def test_store_and_get_candles_chronological(tmp_db_path):
+    store_candles("BTC-EUR", "4h", make_candles(3000, 1000, 2000), db_path=tmp_db_path)
+    candles = get_stored_candles("BTC-EUR", "4h", 10, db_path=tmp_db_path)
+    assert [c.timestamp for c in candles] == [1000, 2000, 3000]
+    assert isinstance(candles[0], Candle)
+
+
+def test_get_stored_candles_returns_newest_limit(tmp_db_path):
+    store_candles("BTC-EUR", "4h", make_candles(1000, 2000, 3000, 4000), db_path=tmp_db_path)
+    candles = get_stored_candles("BTC-EUR", "4h", 2, db_path=tmp_db_path)
+    assert [c.timestamp for c in candles] == [3000, 4000]
+
+
+def test_store_candles_deduplicates_by_timestamp(tmp_db_path):
+    store_candles("BTC-EUR", "4h", make_candles(1000, 2000), db_path=tmp_db_path)
+    store_candles("BTC-EUR", "4h", make_candles(2000, 3000, close=9.0), db_path=tmp_db_path)
+    candles = get_stored_candles("BTC-EUR", "4h", 10, db_path=tmp_db_path)
+    assert [c.timestamp for c in candles] == [1000, 2000, 3000]
+    assert candles[1].close == 9.0
+
+
+def test_series_are_isolated_by_market_and_interval(tmp_db_path):
+    store_candles("BTC-EUR", "4h", make_candles(1000), db_path=tmp_db_path)
+    store_candles("BTC-EUR", "1d", make_candles(2000), db_path=tmp_db_path)
+    store_candles("ETH-EUR", "4h", make_candles(3000), db_path=tmp_db_path)
+    assert [c.timestamp for c in get_stored_candles("BTC-EUR", "4h", 10, db_path=tmp_db_path)] == [1000]
+    assert [c.timestamp for c in get_stored_candles("BTC-EUR", "1d", 10, db_path=tmp_db_path)] == [2000]
+
+
+def test_store_empty_list_is_noop(tmp_db_path):
+    assert store_candles("BTC-EUR", "4h", [], db_path=tmp_db_path) == 0
+
+
+def test_refresh_start_none_when_empty(tmp_db_path):
+    assert get_refresh_start("BTC-EUR", "4h", 42, db_path=tmp_db_path) is None
+
+
+def test_refresh_start_none_when_history_too_short(tmp_db_path):
+    store_candles("BTC-EUR", "4h", make_candles(998 * H4, 999 * H4), db_path=tmp_db_path)
+    assert get_refresh_start("BTC-EUR", "4h", 3, now=NOW, db_path=tmp_db_path) is None
+
+
+def test_refresh_start_is_latest_timestamp(tmp_db_path):
+    store_candles("BTC-EUR", "4h", make_candles(997 * H4, 998 * H4, 999 * H4), db_path=tmp_db_path)
+    assert get_refresh_start("BTC-EUR", "4h", 3, now=NOW, db_path=tmp_db_path) == 999 * H4
+
+
+def test_refresh_start_none_when_tail_is_stale(tmp_db_path):
+    """After more than *limit* intervals offline, a tail fetch could not reach the stored history."""
+    store_candles("BTC-EUR", "4h", make_candles(*(k * H4 for k in range(990, 996))), db_path=tmp_db_path)
+    assert get_refresh_start("BTC-EUR", "4h", 3, now=NOW, db_path=tmp_db_path) is None
+    assert get_refresh_start("BTC-EUR", "4h", 6, now=NOW, db_path=tmp_db_path) == 995 * H4
+
+
+def test_refresh_start_none_when_newest_buckets_have_a_hole(tmp_db_path):
+    store_candles("BTC-EUR", "4h", make_candles(*(k * H4 for k in range(990, 994))), db_path=tmp_db_path)
+    store_candles("BTC-EUR", "4h", make_candles(998 * H4, 999 * H4), db_path=tmp_db_path)
+    assert get_refresh_start("BTC-EUR", "4h", 2, now=NOW, db_path=tmp_db_path) == 999 * H4
+    assert get_refresh_start("BTC-EUR", "4h", 4, now=NOW, db_path=tmp_db_path) is None
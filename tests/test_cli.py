@@ -6,6 +6,7 @@ HTTP calls are made.  Each test verifies a distinct CLI behaviour.
 
 from __future__ import annotations
 
+import json
 import sys
 from pathlib import Path
 from unittest.mock import MagicMock, patch
@@ -13,7 +14,16 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 from crypto_price_tracker.cli import main
-from crypto_price_tracker.models import Candle, CoinData, Holding, PriceAlert, WatchlistEntry
+from crypto_price_tracker.models import (
+    Candle,
+    CandleSeries,
+    CoinData,
+    ConsolidatedCoin,
+    Holding,
+    HoldingRollup,
+    PriceAlert,
+    WatchlistEntry,
+)
 
 
 @pytest.fixture
@@ -132,7 +142,7 @@ def test_watch_command_parses_interval(mock_coins):
     """watch --interval 10 should call get_top_coins_with_fallback and render, then exit on KeyboardInterrupt."""
     with (
         patch("crypto_price_tracker.cli.get_top_coins_with_fallback", return_value=(mock_coins, "Bitvavo")) as mock_api,
-        patch("crypto_price_tracker.cli.get_active_alerts", return_value=[]),
+        patch("crypto_price_tracker.cli.get_alert_index"),
         patch("crypto_price_tracker.cli.check_alerts", return_value=[]),
         patch("crypto_price_tracker.cli.render_price_table") as mock_render,
         patch("time.sleep", side_effect=KeyboardInterrupt),
@@ -167,9 +177,9 @@ def test_portfolio_remove_command():
 
 def test_portfolio_list_command(mock_coins):
     """portfolio list should aggregate holdings and render the portfolio table."""
-    holdings = [Holding(1, "BTC", 0.5, 45000.0, "2026-01-15")]
+    rollups = [HoldingRollup("BTC", 1, 0.5, 22500.0)]
     with (
-        patch("crypto_price_tracker.cli.get_all_holdings", return_value=holdings),
+        patch("crypto_price_tracker.cli.get_holding_rollups", return_value=rollups),
         patch("crypto_price_tracker.cli.get_top_coins_with_fallback", return_value=(mock_coins, "Bitvavo")),
         patch("crypto_price_tracker.cli.render_portfolio_table") as mock_render,
     ):
@@ -177,6 +187,9 @@ def test_portfolio_list_command(mock_coins):
         main()
 
     mock_render.assert_called_once()
+    summary = mock_render.call_args.args[0]
+    assert summary.rows[0].symbol == "BTC"
+    assert summary.rows[0].current_value == round(0.5 * 56754.0, 2)
 
 
 def test_portfolio_lots_command():
@@ -195,17 +208,51 @@ def test_portfolio_lots_command():
 def test_portfolio_export_csv(capsys):
     """portfolio export --format csv should print CSV output to stdout."""
     holdings = [Holding(1, "BTC", 0.5, 45000.0, "2026-01-15")]
-    csv_output = "id,symbol,amount,buy_price,buy_date\r\n1,BTC,0.5,45000.0,2026-01-15\r\n"
-    with (
-        patch("crypto_price_tracker.cli.get_all_holdings", return_value=holdings),
-        patch("crypto_price_tracker.cli.export_csv", return_value=csv_output),
-    ):
+    with patch("crypto_price_tracker.cli.iter_holdings", return_value=iter(holdings)):
         sys.argv = ["crypto", "portfolio", "export", "--format", "csv"]
         main()
 
     captured = capsys.readouterr()
-    assert "BTC" in captured.out
-    assert "symbol" in captured.out
+    assert captured.out == "id,symbol,amount,buy_price,buy_date\r\n1,BTC,0.5,45000.0,2026-01-15\r\n"
+
+
+def test_portfolio_export_ndjson_to_file(tmp_path, capsys):
+    """portfolio export --format ndjson -o FILE should write one object per line."""
+    holdings = [Holding(1, "BTC", 0.5, 45000.0, "2026-01-15"), Holding(2, "ETH", 2.0, 2000.0, "2026-01-10")]
+    output = tmp_path / "lots.ndjson"
+    with patch("crypto_price_tracker.cli.iter_holdings", return_value=iter(holdings)):
+        sys.argv = ["crypto", "portfolio", "export", "--format", "ndjson", "-o", str(output)]
+        main()
+
+    lines = output.read_text().splitlines()
+    assert [json.loads(line)["symbol"] for line in lines] == ["BTC", "ETH"]
+    assert "Exported to" in capsys.readouterr().out
+
+
+def test_portfolio_import_csv(tmp_path, capsys):
+    """portfolio import should insert valid rows in batches and report rejected ones."""
+    path = tmp_path / "lots.csv"
+    path.write_text("symbol,amount,buy_price,buy_date\nbtc,0.5,45000,2026-01-15\nETH,-1,2000,2026-01-10\n")
+    with patch("crypto_price_tracker.cli.add_holdings", side_effect=len) as mock_add:
+        sys.argv = ["crypto", "portfolio", "import", str(path)]
+        with pytest.raises(SystemExit) as exc_info:
+            main()
+
+    assert exc_info.value.code == 1
+    mock_add.assert_called_once_with([("BTC", 0.5, 45000.0, "2026-01-15")])
+    captured = capsys.readouterr()
+    assert "Imported 1 holdings (1 rows rejected)" in captured.out
+    assert "Row 2: amount must be positive" in captured.err
+
+
+def test_portfolio_import_unknown_format(tmp_path, capsys):
+    """portfolio import without a recognizable extension or --format should exit 1."""
+    sys.argv = ["crypto", "portfolio", "import", str(tmp_path / "lots.txt")]
+    with pytest.raises(SystemExit) as exc_info:
+        main()
+
+    assert exc_info.value.code == 1
+    assert "--format" in capsys.readouterr().err
 
 
 def test_portfolio_no_subcommand(capsys):
@@ -281,7 +328,7 @@ def test_alert_check_with_triggers(mock_coins):
     with (
         patch("crypto_price_tracker.cli.get_top_coins_with_fallback", return_value=(mock_coins, "Bitvavo")),
         patch("crypto_price_tracker.cli.get_active_alerts", return_value=[alert]),
-        patch("crypto_price_tracker.cli.mark_triggered") as mock_mark,
+        patch("crypto_price_tracker.cli.mark_triggered_many", return_value={1}) as mock_mark,
         patch("crypto_price_tracker.cli.render_alert_banner") as mock_banner,
         pytest.raises(SystemExit) as exc_info,
     ):
@@ -289,7 +336,7 @@ def test_alert_check_with_triggers(mock_coins):
         main()
 
     assert exc_info.value.code == 1
-    mock_mark.assert_called_once_with(1)
+    mock_mark.assert_called_once_with([1])
     mock_banner.assert_called_once()
 
 
@@ -303,6 +350,22 @@ def test_alert_no_subcommand(capsys):
     assert "alert" in output.lower() or "add" in output.lower()
 
 
+def test_prices_command_all_exchanges():
+    """prices --exchange all renders the consolidated view."""
+    merged = [ConsolidatedCoin("BTC", "Bitcoin", 50250.0, 1.0, 2.0, 200.0, {"binance": 50500.0, "bitvavo": 50000.0}, 1.0)]
+    with (
+        patch("crypto_price_tracker.cli.get_consolidated_coins", return_value=(merged, "Binance + Bitvavo")) as mock_api,
+        patch("crypto_price_tracker.cli.get_active_alerts", return_value=[]),
+        patch("crypto_price_tracker.cli.check_alerts", return_value=[]),
+        patch("crypto_price_tracker.cli.render_consolidated_table") as mock_render,
+    ):
+        sys.argv = ["crypto", "prices", "--exchange", "all", "-n", "5"]
+        main()
+
+    mock_api.assert_called_once_with(top_n=5)
+    mock_render.assert_called_once_with(merged, triggered_symbols=set(), source="Binance + Bitvavo")
+
+
 def test_prices_command_with_alert_checking(mock_coins):
     """prices command should check alerts and pass triggered_symbols."""
     with (
@@ -324,7 +387,7 @@ def test_chart_command_all_coins(mock_coins):
     """chart with no symbol should fetch candles for all coins and render chart table."""
     with (
         patch("crypto_price_tracker.cli.get_top_coins_with_fallback", return_value=(mock_coins, "Bitvavo")),
-        patch("crypto_price_tracker.cli.get_candles", return_value=[]),
+        patch("crypto_price_tracker.cli.get_candles_batch", return_value={}),
         patch("crypto_price_tracker.cli.render_chart_table") as mock_render,
     ):
         sys.argv = ["crypto", "chart"]
@@ -334,6 +397,36 @@ def test_chart_command_all_coins(mock_coins):
     assert mock_render.call_args[0][0] == mock_coins
 
 
+def test_chart_command_all_coins_fetches_in_one_batch(mock_coins):
+    """chart overview requests 4h and 1d candles for every coin in a single batch."""
+    candles = {
+        ("BTC-EUR", "4h"): CandleSeries.from_candles(
+            [Candle(1, 1.0, 1.0, 1.0, 1.0, 1.0), Candle(2, 2.0, 2.0, 2.0, 2.0, 1.0)]
+        ),
+    }
+    with (
+        patch("crypto_price_tracker.cli.get_top_coins_with_fallback", return_value=(mock_coins, "Bitvavo")),
+        patch("crypto_price_tracker.cli.get_candles_batch", return_value=candles) as mock_batch,
+        patch("crypto_price_tracker.cli.render_chart_table") as mock_render,
+    ):
+        sys.argv = ["crypto", "chart", "--concurrency", "4"]
+        main()
+
+    mock_batch.assert_called_once_with(
+        [
+            ("BTC-EUR", "4h", 42),
+            ("BTC-EUR", "1d", 30),
+            ("ETH-EUR", "4h", 42),
+            ("ETH-EUR", "1d", 30),
+        ],
+        concurrency=4,
+    )
+    sparklines_7d, sparklines_30d = mock_render.call_args[0][1:3]
+    assert len(sparklines_7d["BTC"]) == 2
+    assert sparklines_7d["ETH"] == ""
+    assert sparklines_30d["BTC"] == ""
+
+
 def test_chart_command_single_coin(mock_coins):
     """chart BTC should show detailed view for BTC."""
     with (
@@ -378,7 +471,7 @@ def test_chart_command_respects_top_n(mock_coins):
     """chart -n 10 should call get_top_coins_with_fallback with top_n=10."""
     with (
         patch("crypto_price_tracker.cli.get_top_coins_with_fallback", return_value=(mock_coins, "Bitvavo")) as mock_api,
-        patch("crypto_price_tracker.cli.get_candles", return_value=[]),
+        patch("crypto_price_tracker.cli.get_candles_batch", return_value={}),
         patch("crypto_price_tracker.cli.render_chart_table"),
     ):
         sys.argv = ["crypto", "chart", "-n", "10"]
@@ -387,6 +480,89 @@ def test_chart_command_respects_top_n(mock_coins):
     mock_api.assert_called_once_with(exchange="bitvavo", top_n=10)
 
 
+# ---- Indicators subcommand tests ----
+
+
+def make_rising_series(n: int = 40) -> CandleSeries:
+    return CandleSeries.from_rows(
+        [[1000 * i, 100.0 + i, 101.0 + i, 99.0 + i, 100.5 + i, 10.0] for i in range(n)]
+    )
+
+
+def test_indicators_command_all_coins_batch(mock_coins):
+    """indicators with no symbol fetches every top coin's candles in one batch."""
+    candles = {("BTC-EUR", "1d"): make_rising_series()}
+    with (
+        patch("crypto_price_tracker.cli.get_top_coins_with_fallback", return_value=(mock_coins, "Bitvavo")),
+        patch("crypto_price_tracker.cli.get_candles_batch", return_value=candles) as mock_batch,
+        patch("crypto_price_tracker.cli.render_indicator_table") as mock_render,
+    ):
+        sys.argv = ["crypto", "indicators", "--interval", "1d", "--limit", "40"]
+        main()
+
+    mock_batch.assert_called_once_with(
+        [("BTC-EUR", "1d", 40), ("ETH-EUR", "1d", 40)], concurrency=8,
+    )
+    indicators, interval = mock_render.call_args[0]
+    assert list(indicators) == ["BTC"]
+    assert interval == "1d"
+    assert indicators["BTC"].latest()["rsi"] == 100.0
+
+
+def test_indicators_command_single_symbol_skips_ranking():
+    """indicators eth only fetches ETH candles, without ranking top coins."""
+    with (
+        patch("crypto_price_tracker.cli.get_top_coins_with_fallback") as mock_api,
+        patch(
+            "crypto_price_tracker.cli.get_candles_batch",
+            return_value={("ETH-EUR", "4h"): make_rising_series()},
+        ) as mock_batch,
+        patch("crypto_price_tracker.cli.render_indicator_table") as mock_render,
+    ):
+        sys.argv = ["crypto", "indicators", "eth"]
+        main()
+
+    mock_api.assert_not_called()
+    assert mock_batch.call_args[0][0] == [("ETH-EUR", "4h", 200)]
+    assert list(mock_render.call_args[0][0]) == ["ETH"]
+
+
+def test_indicators_command_no_data_exits():
+    """indicators exits with code 1 when no candle history is available."""
+    with (
+        patch("crypto_price_tracker.cli.get_candles_batch", return_value={}),
+        pytest.raises(SystemExit) as exc_info,
+    ):
+        sys.argv = ["crypto", "indicators", "BTC"]
+        main()
+
+    assert exc_info.value.code == 1
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["crypto", "chart", "--concurrency", "0"],
+        ["crypto", "indicators", "BTC", "--concurrency", "-2"],
+        ["crypto", "indicators", "BTC", "--limit", "1441"],
+        ["crypto", "indicators", "BTC", "--limit", "0"],
+        ["crypto", "portfolio", "import", "holdings.csv", "--batch-size", "0"],
+    ],
+)
+def test_out_of_range_int_options_are_rejected(argv, capsys):
+    """--concurrency/--batch-size below 1 and --limit outside 1..1440 are usage errors."""
+    with (
+        patch("crypto_price_tracker.cli.get_candles_batch") as mock_batch,
+        pytest.raises(SystemExit) as exc_info,
+    ):
+        sys.argv = argv
+        main()
+
+    assert exc_info.value.code == 2
+    assert "must be" in capsys.readouterr().err
+    mock_batch.assert_not_called()
+
+
 # ---- Watchlist subcommand tests ----
 
 
@@ -512,8 +688,8 @@ def test_export_command_generates_pdf(mock_coins, tmp_path):
     output_file = str(tmp_path / "report.pdf")
     with (
         patch("crypto_price_tracker.cli.get_top_coins_with_fallback", return_value=(mock_coins, "Bitvavo")),
-        patch("crypto_price_tracker.cli.get_all_holdings", return_value=[]),
-        patch("crypto_price_tracker.cli.aggregate_portfolio") as mock_agg,
+        patch("crypto_price_tracker.cli.get_holding_rollups", return_value=[]),
+        patch("crypto_price_tracker.cli.aggregate_rollups") as mock_agg,
         patch("crypto_price_tracker.cli.get_all_watchlist_entries", return_value=[]),
         patch("crypto_price_tracker.cli.get_all_alerts", return_value=[]),
         patch("crypto_price_tracker.cli.generate_report_html", return_value="<html>test</html>"),
@@ -532,8 +708,8 @@ def test_export_command_auto_names_file(mock_coins, tmp_path, monkeypatch):
     monkeypatch.chdir(tmp_path)
     with (
         patch("crypto_price_tracker.cli.get_top_coins_with_fallback", return_value=(mock_coins, "Bitvavo")),
-        patch("crypto_price_tracker.cli.get_all_holdings", return_value=[]),
-        patch("crypto_price_tracker.cli.aggregate_portfolio") as mock_agg,
+        patch("crypto_price_tracker.cli.get_holding_rollups", return_value=[]),
+        patch("crypto_price_tracker.cli.aggregate_rollups") as mock_agg,
         patch("crypto_price_tracker.cli.get_all_watchlist_entries", return_value=[]),
         patch("crypto_price_tracker.cli.get_all_alerts", return_value=[]),
         patch("crypto_price_tracker.cli.generate_report_html", return_value="<html>test</html>"),
@@ -555,8 +731,8 @@ def test_summary_send_command(mock_coins):
     """crypto summary send should build summary and call send_summary."""
     with (
         patch("crypto_price_tracker.cli.get_top_coins_with_fallback", return_value=(mock_coins, "Bitvavo")),
-        patch("crypto_price_tracker.cli.get_all_holdings", return_value=[]),
-        patch("crypto_price_tracker.cli.aggregate_portfolio") as mock_agg,
+        patch("crypto_price_tracker.cli.get_holding_rollups", return_value=[]),
+        patch("crypto_price_tracker.cli.aggregate_rollups") as mock_agg,
         patch("crypto_price_tracker.cli.build_summary_text", return_value="text summary"),
         patch("crypto_price_tracker.cli.build_summary_html", return_value="<html>summary</html>"),
         patch("crypto_price_tracker.cli.send_summary", return_value=["telegram"]) as mock_send,
@@ -568,6 +744,26 @@ def test_summary_send_command(mock_coins):
     mock_send.assert_called_once_with("text summary", "<html>summary</html>")
 
 
+def test_summary_send_uses_holding_rollups(mock_coins):
+    """crypto summary send builds its totals from per-symbol rollups, never from individual lots."""
+    from crypto_price_tracker.portfolio_db import add_holding
+
+    add_holding("BTC", 0.5, 40000.0, "2026-01-01")
+    add_holding("BTC", 0.25, 44000.0, "2026-01-02")
+    with (
+        patch("crypto_price_tracker.cli.get_top_coins_with_fallback", return_value=(mock_coins, "Bitvavo")),
+        patch("crypto_price_tracker.portfolio_db.get_all_holdings", side_effect=AssertionError("lots read")),
+        patch("crypto_price_tracker.cli.build_summary_text", return_value="text") as mock_text,
+        patch("crypto_price_tracker.cli.build_summary_html", return_value="<html></html>"),
+        patch("crypto_price_tracker.cli.send_summary", return_value=[]),
+    ):
+        sys.argv = ["crypto", "summary", "send"]
+        main()
+
+    portfolio = mock_text.call_args.args[0]
+    assert [(r.symbol, r.num_lots, r.total_amount) for r in portfolio.rows] == [("BTC", 2, 0.75)]
+
+
 def test_summary_no_subcommand(capsys):
     """crypto summary with no subcommand should print help."""
     sys.argv = ["crypto", "summary"]
@@ -575,3 +771,13 @@ def test_summary_no_subcommand(capsys):
     captured = capsys.readouterr()
     output = captured.out + captured.err
     assert "summary" in output.lower() or "send" in output.lower()
+
+
+def test_compact_command(capsys):
+    """crypto compact runs the archive compaction and reports the rows written."""
+    with patch("crypto_price_tracker.cli.compact", return_value=12) as mock_compact:
+        sys.argv = ["crypto", "compact"]
+        main()
+
+    mock_compact.assert_called_once_with()
+    assert "Archived 12 bucket(s)" in capsys.readouterr().out
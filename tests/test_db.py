@@ -0,0 +1,91 @@
+"""Unit tests for the shared SQLite connection pool."""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+
+import pytest
+
+from crypto_price_tracker import db, migrations
+from crypto_price_tracker.alerts_db import add_alert, get_active_alerts
+
+
+def test_connection_is_reused_within_a_thread(tmp_db_path):
+    with db.connection(tmp_db_path) as first:
+        pass
+    with db.connection(tmp_db_path) as second:
+        pass
+
+    assert first is second
+    assert second.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert second.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+
+
+def test_each_thread_gets_its_own_connection(tmp_db_path):
+    with db.connection(tmp_db_path) as main_conn:
+        pass
+    other: list[sqlite3.Connection] = []
+
+    def worker() -> None:
+        with db.connection(tmp_db_path) as conn:
+            other.append(conn)
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+
+    assert other[0] is not main_conn
+
+
+def test_migrations_run_on_first_use(tmp_db_path):
+    with db.connection(tmp_db_path) as conn:
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        version = migrations.get_schema_version(conn)
+
+    assert {"holdings", "alerts", "watchlist", "candles"} <= tables
+    assert version == migrations.SCHEMA_VERSION
+
+
+def test_migrate_runs_once_per_database(tmp_db_path, monkeypatch):
+    calls: list[sqlite3.Connection] = []
+    real_migrate = migrations.migrate
+    monkeypatch.setattr(migrations, "migrate", lambda conn: calls.append(conn) or real_migrate(conn))
+
+    assert db.migrate(tmp_db_path) == migrations.SCHEMA_VERSION
+    with db.connection(tmp_db_path):
+        pass
+    db.connect(tmp_db_path).close()
+
+    assert len(calls) == 1
+
+
+def test_row_factory_is_scoped_to_the_block(tmp_db_path):
+    add_alert("BTC", 50000.0, db_path=tmp_db_path)
+
+    with db.connection(tmp_db_path) as conn:
+        assert conn.execute("SELECT symbol FROM alerts").fetchone() == ("BTC",)
+        assert get_active_alerts(db_path=tmp_db_path)[0].symbol == "BTC"
+        assert conn.row_factory is None
+
+
+def test_uncommitted_transaction_is_rolled_back(tmp_db_path):
+    with pytest.raises(RuntimeError):
+        with db.connection(tmp_db_path) as conn:
+            conn.execute("INSERT INTO watchlist (symbol, tags, added_at) VALUES ('ETH', '', 'now')")
+            raise RuntimeError("boom")
+
+    with db.connection(tmp_db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM watchlist").fetchone()[0] == 0
+
+
+def test_close_all_closes_pooled_connections(tmp_db_path):
+    with db.connection(tmp_db_path) as old:
+        pass
+
+    db.close_all()
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        old.execute("SELECT 1")
+    with db.connection(tmp_db_path) as new:
+        assert new is not old
@@ -14,10 +14,13 @@ from crypto_price_tracker.display import (
     render_chart_detail,
     render_chart_table,
     render_coin_detail,
+    render_consolidated_table,
+    render_indicator_table,
     render_price_table,
     sparkline,
 )
-from crypto_price_tracker.models import Candle, CoinData, PriceAlert
+from crypto_price_tracker.indicators import compute_indicators
+from crypto_price_tracker.models import Candle, CandleSeries, CoinData, ConsolidatedCoin, PriceAlert
 
 
 @pytest.fixture
@@ -118,6 +121,22 @@ class TestRenderPriceTable:
         assert "120,339,407" in output
 
 
+class TestRenderConsolidatedTable:
+    def test_render_consolidated_table_shows_exchanges_and_spread(self) -> None:
+        console, buf = _make_console()
+        coins = [
+            ConsolidatedCoin("BTC", "Bitcoin", 50250.0, 1.0, 2.0, 200.0, {"binance": 50500.0, "bitvavo": 50000.0}, 1.0),
+            ConsolidatedCoin("SOL", "SOL", 100.0, -2.0, 1.0, 50.0, {"binance": 100.0}, 0.0),
+        ]
+        render_consolidated_table(coins, console=console, source="Binance + Bitvavo")
+        output = buf.getvalue()
+
+        assert "Consolidated Crypto Prices (EUR)" in output
+        assert "Binance" in output and "Bitvavo" in output
+        assert "50,250.00" in output
+        assert "1.00%" in output
+
+
 class TestRenderCoinDetail:
     def test_render_coin_detail_shows_all_fields(self, sample_coins: list[CoinData]) -> None:
         console, buf = _make_console()
@@ -277,6 +296,26 @@ class TestRenderChartTable:
         assert "Price Charts (EUR)" in output
 
 
+class TestRenderIndicatorTable:
+    def test_render_indicator_table_shows_values_and_gaps(self) -> None:
+        console, buf = _make_console()
+        long_history = CandleSeries.from_rows(
+            [[1000 * i, 100.0 + i, 101.0 + i, 99.0 + i, 100.5 + i, 10.0] for i in range(40)]
+        )
+        indicators = {
+            "BTC": compute_indicators(long_history),
+            "ETH": compute_indicators(long_history[:3]),
+        }
+        render_indicator_table(indicators, "4h", console=console)
+        output = buf.getvalue()
+
+        assert "Technical Indicators (4h candles, EUR)" in output
+        assert "BTC" in output
+        assert "ETH" in output
+        assert "100.0" in output  # RSI of a steadily rising series
+        assert "-" in output  # ETH lacks history for most indicators
+
+
 class TestRenderChartDetail:
     def test_render_chart_detail_shows_stats(
         self, sample_coins: list[CoinData], sample_candles_7d: list[Candle], sample_candles_30d: list[Candle]
@@ -2,18 +2,38 @@
 
 from __future__ import annotations
 
+import asyncio
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
 import pytest
 from pytest_httpx import HTTPXMock
 
 from crypto_price_tracker.exchange import (
+    AsyncBinanceClient,
     BinanceClient,
+    CircuitBreaker,
+    CircuitOpenError,
+    ClientRegistry,
+    ExchangeHealth,
+    ExchangeStats,
+    TickerSnapshot,
+    TickerSnapshotCache,
+    clear_ticker_cache,
+    consolidate_snapshots,
+    exchange_health,
+    flush_tick_recorder,
+    get_async_exchange_client,
+    get_consolidated_coins,
+    get_consolidated_coins_async,
     get_exchange_client,
+    get_ticker_snapshot,
     get_top_coins_with_fallback,
+    get_top_coins_with_fallback_async,
 )
 from crypto_price_tracker.models import CoinData
 
@@ -337,3 +357,643 @@ def test_fallback_raises_if_both_fail() -> None:
         pytest.raises(httpx.ConnectError),
     ):
         get_top_coins_with_fallback("bitvavo", top_n=20)
+
+
+# ---------------------------------------------------------------------------
+# Snapshot cache tests
+# ---------------------------------------------------------------------------
+
+
+def test_upstream_snapshot_is_recorded_once() -> None:
+    """Each upstream fetch is appended to the tick history; cache hits are not."""
+    from crypto_price_tracker.ticks_db import get_ticks
+
+    coins = [CoinData("BTC", "Bitcoin", 50000.0, 1.5, 100.0, 5000000.0)]
+    with patch(
+        "crypto_price_tracker.exchange.get_exchange_client",
+        return_value=_make_mock_client("Bitvavo", coins),
+    ):
+        get_top_coins_with_fallback("bitvavo", top_n=20)
+        get_top_coins_with_fallback("bitvavo", top_n=5)
+    flush_tick_recorder()
+
+    ticks = get_ticks("BTC", "bitvavo")
+    assert [(t.symbol, t.exchange, t.price) for t in ticks] == [("BTC", "bitvavo", 50000.0)]
+
+
+def test_async_upstream_snapshot_is_recorded() -> None:
+    """Async fetches record their snapshot too."""
+    from crypto_price_tracker.ticks_db import get_ticks
+
+    client = _make_async_mock_client("Binance", [CoinData("ETH", "Ethereum", 2000.0, -1.0, 50.0, 1000000.0)])
+    with patch("crypto_price_tracker.exchange.get_async_exchange_client", return_value=client):
+        asyncio.run(get_top_coins_with_fallback_async("binance", top_n=20))
+    flush_tick_recorder()
+
+    assert [t.price for t in get_ticks("ETH", "binance")] == [2000.0]
+
+
+def test_recording_does_not_delay_the_fetch() -> None:
+    """A slow tick history write neither blocks the caller nor counts as fetch latency."""
+    release = threading.Event()
+    coins = [CoinData("BTC", "Bitcoin", 50000.0, 1.5, 100.0, 5000000.0)]
+    with (
+        patch(
+            "crypto_price_tracker.exchange.get_exchange_client",
+            return_value=_make_mock_client("Bitvavo", coins),
+        ),
+        patch("crypto_price_tracker.exchange.append_ticks", side_effect=lambda *a, **k: release.wait(5)),
+    ):
+        start = time.perf_counter()
+        result, source = get_top_coins_with_fallback("bitvavo", top_n=20)
+        elapsed = time.perf_counter() - start
+        release.set()
+        flush_tick_recorder()
+
+    assert (result, source) == (coins, "Bitvavo")
+    assert elapsed < 1.0
+    assert exchange_health.stats("bitvavo").ewma_latency < 1.0
+
+
+def test_fallback_serves_repeat_calls_from_cache() -> None:
+    """A second call within the TTL reuses the snapshot without a new client."""
+    coins = [
+        CoinData("BTC", "Bitcoin", 50000.0, 1.5, 100.0, 5000000.0),
+        CoinData("ETH", "Ethereum", 2000.0, -1.0, 50.0, 1000000.0),
+    ]
+    client = _make_mock_client("Bitvavo", coins)
+
+    with patch(
+        "crypto_price_tracker.exchange.get_exchange_client",
+        return_value=client,
+    ) as mock_factory:
+        first, _ = get_top_coins_with_fallback("bitvavo", top_n=20)
+        second, name = get_top_coins_with_fallback("bitvavo", top_n=1)
+
+    assert mock_factory.call_count == 1
+    assert len(first) == 2
+    assert [c.symbol for c in second] == ["BTC"]
+    assert name == "Bitvavo"
+
+
+def test_fallback_fetches_full_list_once() -> None:
+    """The snapshot is built from an unbounded client, not from the caller's top_n."""
+    client = _make_mock_client("Bitvavo", [])
+
+    with patch(
+        "crypto_price_tracker.exchange.get_exchange_client",
+        return_value=client,
+    ) as mock_factory:
+        get_top_coins_with_fallback("bitvavo", top_n=5)
+
+    mock_factory.assert_called_once_with("bitvavo", top_n=None)
+
+
+def test_snapshot_cache_expires_after_ttl() -> None:
+    """A snapshot older than the TTL is refetched."""
+    cache = TickerSnapshotCache(ttl=10.0)
+    fetch = MagicMock(side_effect=lambda: TickerSnapshot([], "Bitvavo", time.monotonic()))
+
+    first = cache.get("bitvavo", fetch)
+    first.fetched_at -= 11.0
+    cache.get("bitvavo", fetch)
+
+    assert fetch.call_count == 2
+
+
+def test_snapshot_cache_keyed_by_exchange() -> None:
+    """Each exchange has its own snapshot."""
+    cache = TickerSnapshotCache()
+    bitvavo = cache.get("bitvavo", lambda: TickerSnapshot([], "Bitvavo", time.monotonic()))
+    binance = cache.get("binance", lambda: TickerSnapshot([], "Binance", time.monotonic()))
+
+    assert bitvavo.source == "Bitvavo"
+    assert binance.source == "Binance"
+
+
+def test_snapshot_cache_coalesces_concurrent_fetches() -> None:
+    """Concurrent misses for the same exchange share a single upstream fetch."""
+    cache = TickerSnapshotCache()
+    calls = 0
+    release = threading.Event()
+
+    def slow_fetch() -> TickerSnapshot:
+        nonlocal calls
+        calls += 1
+        release.wait(timeout=5)
+        return TickerSnapshot([], "Bitvavo", time.monotonic())
+
+    with ThreadPoolExecutor(max_workers=50) as pool:
+        futures = [pool.submit(cache.get, "bitvavo", slow_fetch) for _ in range(50)]
+        time.sleep(0.05)
+        release.set()
+        results = [f.result() for f in futures]
+
+    assert calls == 1
+    assert all(r is results[0] for r in results)
+
+
+def test_snapshot_cache_does_not_cache_errors() -> None:
+    """A failed fetch propagates and the next call retries upstream."""
+    cache = TickerSnapshotCache()
+    fetch = MagicMock(
+        side_effect=[
+            httpx.ConnectError("Connection refused"),
+            TickerSnapshot([], "Bitvavo", time.monotonic()),
+        ]
+    )
+
+    with pytest.raises(httpx.ConnectError):
+        cache.get("bitvavo", fetch)
+    snapshot = cache.get("bitvavo", fetch)
+
+    assert snapshot.source == "Bitvavo"
+    assert fetch.call_count == 2
+
+
+# ---------------------------------------------------------------------------
+# Async client and fallback tests
+# ---------------------------------------------------------------------------
+
+
+def test_async_binance_get_top_coins_converts_to_eur(httpx_mock: HTTPXMock) -> None:
+    """AsyncBinanceClient converts USDT prices to EUR and skips stablecoins."""
+    httpx_mock.add_response(url=BINANCE_FX_URL, json=FX_RESPONSE)
+    httpx_mock.add_response(
+        url=BINANCE_TICKER_URL,
+        json=[
+            make_binance_ticker("BTCUSDT", last="55000", open_="50000", volume="100", quote_volume="5500000"),
+            make_binance_ticker("USDCUSDT", last="1.00", open_="1.00", volume="1000000", quote_volume="1000000"),
+        ],
+    )
+
+    async def fetch() -> list[CoinData]:
+        async with AsyncBinanceClient(top_n=10) as client:
+            return await client.get_top_coins()
+
+    coins = asyncio.run(fetch())
+
+    assert [c.symbol for c in coins] == ["BTC"]
+    assert coins[0].price == pytest.approx(55000 * FX_RATE, rel=1e-4)
+
+
+def test_get_async_exchange_client() -> None:
+    """Async factory returns the matching async client."""
+    from crypto_price_tracker.api import AsyncBitvavoClient
+
+    assert isinstance(get_async_exchange_client("bitvavo"), AsyncBitvavoClient)
+    assert isinstance(get_async_exchange_client("binance"), AsyncBinanceClient)
+
+
+def _make_async_mock_client(name: str, coins: list[CoinData], should_fail: bool = False):
+    """Create a mock async exchange client for fallback testing."""
+    mock = MagicMock()
+    mock.name = name
+    mock.__aenter__ = AsyncMock(return_value=mock)
+    mock.__aexit__ = AsyncMock(return_value=False)
+    if should_fail:
+        mock.get_top_coins = AsyncMock(side_effect=httpx.ConnectError("Connection refused"))
+    else:
+        mock.get_top_coins = AsyncMock(return_value=coins)
+    return mock
+
+
+def test_async_fallback_uses_secondary_on_primary_failure() -> None:
+    """When the primary fails, the async fallback returns the secondary's coins."""
+    fallback_coins = [CoinData("ETH", "Ethereum", 2000.0, -1.0, 50.0, 1000000.0)]
+    clients = {
+        "bitvavo": _make_async_mock_client("Bitvavo", [], should_fail=True),
+        "binance": _make_async_mock_client("Binance", fallback_coins),
+    }
+
+    with patch(
+        "crypto_price_tracker.exchange.get_async_exchange_client",
+        side_effect=lambda exchange, top_n=20: clients[exchange],
+    ):
+        coins, name = asyncio.run(get_top_coins_with_fallback_async("bitvavo", top_n=20))
+
+    assert name == "Binance"
+    assert [c.symbol for c in coins] == ["ETH"]
+
+
+def test_async_fallback_shares_snapshot_cache() -> None:
+    """Async and sync fallbacks read the same per-exchange snapshot."""
+    coins = [CoinData("BTC", "Bitcoin", 50000.0, 1.5, 100.0, 5000000.0)]
+    client = _make_async_mock_client("Bitvavo", coins)
+
+    with patch(
+        "crypto_price_tracker.exchange.get_async_exchange_client",
+        return_value=client,
+    ):
+        asyncio.run(get_top_coins_with_fallback_async("bitvavo", top_n=20))
+    with patch("crypto_price_tracker.exchange.get_exchange_client") as sync_factory:
+        cached, name = get_top_coins_with_fallback("bitvavo", top_n=20)
+
+    sync_factory.assert_not_called()
+    assert name == "Bitvavo"
+    assert cached[0].symbol == "BTC"
+
+
+def test_snapshot_cache_coalesces_async_fetches() -> None:
+    """Concurrent async misses share one fetch."""
+    cache = TickerSnapshotCache()
+    calls = 0
+
+    async def slow_fetch() -> TickerSnapshot:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return TickerSnapshot([], "Bitvavo", time.monotonic())
+
+    async def scenario() -> list[TickerSnapshot]:
+        return await asyncio.gather(*(cache.aget("bitvavo", slow_fetch) for _ in range(20)))
+
+    results = asyncio.run(scenario())
+
+    assert calls == 1
+    assert all(r is results[0] for r in results)
+
+
+# ---------------------------------------------------------------------------
+# Client registry tests
+# ---------------------------------------------------------------------------
+
+
+def test_client_registry_reuses_client() -> None:
+    """The registry hands out one long-lived client per exchange."""
+    registry = ClientRegistry()
+    try:
+        first = registry.get("bitvavo")
+        assert registry.get("bitvavo") is first
+        assert registry.get("binance") is not first
+        assert first.top_n is None
+    finally:
+        registry.close()
+
+
+def test_client_registry_close_closes_clients() -> None:
+    """close() closes every sync client and the next get() builds a new one."""
+    registry = ClientRegistry()
+    mock = MagicMock()
+    with patch("crypto_price_tracker.exchange.get_exchange_client", return_value=mock):
+        registry.get("bitvavo")
+        registry.close()
+        mock.close.assert_called_once()
+        registry.get("bitvavo")
+
+    assert mock.close.call_count == 1
+
+
+def test_client_registry_async_clients_bound_to_loop() -> None:
+    """Async clients are reused within a loop and rebuilt for a new loop."""
+    registry = ClientRegistry()
+
+    async def get_twice():
+        first = registry.get_async("bitvavo")
+        assert registry.get_async("bitvavo") is first
+        return first
+
+    first = asyncio.run(get_twice())
+    second = asyncio.run(get_twice())
+
+    assert first is not second
+    asyncio.run(registry.aclose())
+
+
+def test_fallback_reuses_pooled_client_across_refreshes() -> None:
+    """After the snapshot expires, the refetch reuses the same client."""
+    coins = [CoinData("BTC", "Bitcoin", 50000.0, 1.5, 100.0, 5000000.0)]
+    client = _make_mock_client("Bitvavo", coins)
+
+    with patch(
+        "crypto_price_tracker.exchange.get_exchange_client",
+        return_value=client,
+    ) as mock_factory:
+        get_top_coins_with_fallback("bitvavo", top_n=20)
+        clear_ticker_cache()
+        get_top_coins_with_fallback("bitvavo", top_n=20)
+
+    assert mock_factory.call_count == 1
+    assert client.get_top_coins.call_count == 2
+
+
+# ---------------------------------------------------------------------------
+# Exchange health and hedging tests
+# ---------------------------------------------------------------------------
+
+
+def test_exchange_stats_track_ewma_and_p95() -> None:
+    """Successes feed the latency EWMA and p95; failures only the error rate."""
+    stats = ExchangeStats()
+    for latency in [0.1] * 19 + [1.0]:
+        stats.record(latency, ok=True)
+    stats.record(5.0, ok=False)
+
+    assert stats.fetches == 21 and stats.errors == 1
+    assert stats.ewma_latency == pytest.approx(0.28, abs=0.01)
+    assert stats.p95() == 0.1
+    assert stats.hedge_delay() == 0.1
+    assert stats.error_rate == pytest.approx(0.2)
+
+
+def test_exchange_stats_hedge_delay_defaults_until_measured() -> None:
+    """Too few samples hedge after the default delay; the p95 is floored."""
+    stats = ExchangeStats()
+    stats.record(0.001, ok=True)
+    assert stats.hedge_delay() == 1.0
+    for _ in range(10):
+        stats.record(0.001, ok=True)
+    assert stats.hedge_delay() == 0.05
+
+
+def test_exchange_health_rank_demotes_failing_exchange() -> None:
+    """A preferred exchange that keeps failing becomes the secondary."""
+    health = ExchangeHealth()
+    assert health.rank("bitvavo") == ("bitvavo", "binance")
+
+    for _ in range(10):
+        health.record("bitvavo", 0.1, ok=False)
+        health.record("binance", 0.1, ok=True)
+    assert health.rank("bitvavo") == ("binance", "bitvavo")
+    assert health.rank("binance") == ("binance", "bitvavo")
+
+
+def test_exchange_health_rank_ignores_stale_stats() -> None:
+    """Once its stats age out, a demoted exchange is tried as primary again."""
+    health = ExchangeHealth(failure_threshold=100)
+    for _ in range(10):
+        health.record("bitvavo", 0.1, ok=False)
+        health.record("binance", 0.1, ok=True)
+
+    health.stats("bitvavo").updated_at -= 120
+    assert health.rank("bitvavo") == ("bitvavo", "binance")
+
+
+def test_fetch_records_exchange_stats() -> None:
+    """Upstream fetches record their latency and outcome per exchange."""
+    clients = {
+        "bitvavo": _make_mock_client("Bitvavo", [], should_fail=True),
+        "binance": _make_mock_client("Binance", []),
+    }
+    with patch(
+        "crypto_price_tracker.exchange.get_exchange_client",
+        side_effect=lambda exchange, top_n=20: clients[exchange],
+    ):
+        get_top_coins_with_fallback("bitvavo", top_n=20)
+
+    assert (exchange_health.stats("bitvavo").fetches, exchange_health.stats("bitvavo").errors) == (1, 1)
+    assert (exchange_health.stats("binance").fetches, exchange_health.stats("binance").errors) == (1, 0)
+    assert exchange_health.stats("binance").ewma_latency is not None
+
+
+def _train(exchange: str, latency: float, samples: int = 10) -> None:
+    for _ in range(samples):
+        exchange_health.record(exchange, latency, ok=True)
+
+
+def test_fallback_hedges_slow_primary() -> None:
+    """A primary slower than its p95 is raced; the faster secondary wins."""
+    _train("bitvavo", 0.05)
+    _train("binance", 0.05)
+    slow = _make_mock_client("Bitvavo", [CoinData("BTC", "Bitcoin", 50000.0, 1.5, 100.0, 5000000.0)])
+    slow.get_top_coins.side_effect = lambda: time.sleep(0.5) or []
+    fast = _make_mock_client("Binance", [CoinData("ETH", "Ethereum", 2000.0, -1.0, 50.0, 1000000.0)])
+
+    with patch(
+        "crypto_price_tracker.exchange.get_exchange_client",
+        side_effect=lambda exchange, top_n=20: slow if exchange == "bitvavo" else fast,
+    ):
+        start = time.perf_counter()
+        coins, name = get_top_coins_with_fallback("bitvavo", top_n=20)
+        elapsed = time.perf_counter() - start
+        # The losing fetch is not interrupted; it still completes into the cache
+        loser = get_ticker_snapshot("bitvavo")
+
+    assert name == "Binance"
+    assert [c.symbol for c in coins] == ["ETH"]
+    assert elapsed < 0.3
+    assert loser.source == "Bitvavo"
+    assert slow.get_top_coins.call_count == 1
+
+
+def test_fallback_hedge_keeps_primary_if_secondary_fails() -> None:
+    """A failing hedge does not cut the wait for a slow but healthy primary."""
+    _train("bitvavo", 0.01)
+    coins = [CoinData("BTC", "Bitcoin", 50000.0, 1.5, 100.0, 5000000.0)]
+    slow = _make_mock_client("Bitvavo", coins)
+    slow.get_top_coins.side_effect = lambda: time.sleep(0.2) or coins
+    failing = _make_mock_client("Binance", [], should_fail=True)
+
+    with patch(
+        "crypto_price_tracker.exchange.get_exchange_client",
+        side_effect=lambda exchange, top_n=20: slow if exchange == "bitvavo" else failing,
+    ):
+        result, name = get_top_coins_with_fallback("bitvavo", top_n=20)
+
+    assert name == "Bitvavo"
+    assert result == coins
+    assert failing.get_top_coins.call_count == 1
+
+
+def test_async_fallback_hedges_slow_primary() -> None:
+    """The async fallback races a slow primary and cancels the losing wait."""
+    _train("bitvavo", 0.05)
+
+    async def slow_fetch():
+        await asyncio.sleep(0.5)
+        return []
+
+    slow = _make_async_mock_client("Bitvavo", [])
+    slow.get_top_coins = AsyncMock(side_effect=slow_fetch)
+    clients = {
+        "bitvavo": slow,
+        "binance": _make_async_mock_client("Binance", [CoinData("ETH", "Ethereum", 2000.0, -1.0, 50.0, 1000000.0)]),
+    }
+
+    async def scenario():
+        start = time.perf_counter()
+        result = await get_top_coins_with_fallback_async("bitvavo", top_n=20)
+        return result, time.perf_counter() - start
+
+    with patch(
+        "crypto_price_tracker.exchange.get_async_exchange_client",
+        side_effect=lambda exchange, top_n=20: clients[exchange],
+    ):
+        (coins, name), elapsed = asyncio.run(scenario())
+
+    assert name == "Binance"
+    assert [c.symbol for c in coins] == ["ETH"]
+    assert elapsed < 0.3
+
+
+def test_circuit_breaker_opens_and_half_opens() -> None:
+    """Consecutive failures open the breaker; after the cooldown one probe is let through."""
+    breaker = CircuitBreaker(failure_threshold=2, cooldown=0.05)
+    breaker.record_failure()
+    assert breaker.state == "closed" and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()  # only one probe at a time
+    breaker.record_success()
+
+    metrics = breaker.metrics()
+    assert metrics["state"] == "closed"
+    assert metrics["rejected"] == 2
+    assert [(t["from"], t["to"]) for t in metrics["transitions"]] == [
+        ("closed", "open"),
+        ("open", "half_open"),
+        ("half_open", "closed"),
+    ]
+
+
+def test_circuit_breaker_failed_probe_reopens() -> None:
+    """A failing half-open probe opens the breaker for another cooldown."""
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+
+@pytest.mark.parametrize("raw", ["five", "0", "-3", "nan"])
+def test_malformed_breaker_env_falls_back_to_default(raw, monkeypatch, caplog) -> None:
+    """A bad CRYPTO_BREAKER_* value logs a warning instead of failing the import."""
+    from crypto_price_tracker.exchange import _env_number
+
+    monkeypatch.setenv("CRYPTO_BREAKER_COOLDOWN", raw)
+    assert _env_number("CRYPTO_BREAKER_COOLDOWN", 30.0, float) == 30.0
+    assert "CRYPTO_BREAKER_COOLDOWN" in caplog.text
+
+    monkeypatch.setenv("CRYPTO_BREAKER_COOLDOWN", "2.5")
+    assert _env_number("CRYPTO_BREAKER_COOLDOWN", 30.0, float) == 2.5
+
+
+def test_fallback_skips_exchange_with_open_breaker() -> None:
+    """While an exchange's breaker is open, requests go straight to the other one."""
+    coins = [CoinData("ETH", "Ethereum", 2000.0, -1.0, 50.0, 1000000.0)]
+    clients = {
+        "bitvavo": _make_mock_client("Bitvavo", [], should_fail=True),
+        "binance": _make_mock_client("Binance", coins),
+    }
+    for _ in range(exchange_health.failure_threshold):
+        exchange_health.breaker("bitvavo").record_failure()
+    assert exchange_health.rank("bitvavo") == ("binance", "bitvavo")
+
+    with patch(
+        "crypto_price_tracker.exchange.get_exchange_client",
+        side_effect=lambda exchange, top_n=20: clients[exchange],
+    ):
+        result, name = get_top_coins_with_fallback("bitvavo", top_n=20)
+        with pytest.raises(CircuitOpenError):
+            get_ticker_snapshot("bitvavo")
+
+    assert (result, name) == (coins, "Binance")
+    clients["bitvavo"].get_top_coins.assert_not_called()
+
+
+# ---------------------------------------------------------------------------
+# Consolidated view tests
+# ---------------------------------------------------------------------------
+
+
+def _snapshot(source: str, *coins: CoinData) -> TickerSnapshot:
+    return TickerSnapshot(coins=list(coins), source=source, fetched_at=time.monotonic())
+
+
+def test_consolidate_snapshots_weights_by_volume() -> None:
+    """Prices and changes are EUR-volume weighted; spreads compare exchanges."""
+    merged = consolidate_snapshots({
+        "bitvavo": _snapshot("Bitvavo", CoinData("BTC", "Bitcoin", 50000.0, 1.0, 10.0, 1000.0)),
+        "binance": _snapshot(
+            "Binance",
+            CoinData("BTC", "BTC", 50500.0, 3.0, 30.0, 3000.0),
+            CoinData("SOL", "SOL", 100.0, 2.0, 5.0, 500.0),
+        ),
+    })
+
+    btc, sol = merged
+    assert btc.symbol == "BTC" and btc.name == "Bitcoin"
+    assert btc.price == pytest.approx(50375.0)  # 0.25 * 50000 + 0.75 * 50500
+    assert btc.change_24h == pytest.approx(2.5)
+    assert (btc.volume, btc.volume_eur) == (40.0, 4000.0)
+    assert btc.prices == {"binance": 50500.0, "bitvavo": 50000.0}
+    assert btc.spread_pct == pytest.approx(1.0)
+    assert (sol.prices, sol.spread_pct) == ({"binance": 100.0}, 0.0)
+
+
+def test_consolidated_fetches_exchanges_concurrently() -> None:
+    """The consolidated fetch waits for the slowest exchange, not the sum."""
+    coins = [CoinData("BTC", "Bitcoin", 50000.0, 1.5, 100.0, 5000000.0)]
+
+    def slow_client(exchange: str, top_n: int = 20):
+        client = _make_mock_client(exchange.capitalize(), coins)
+        client.get_top_coins.side_effect = lambda: time.sleep(0.2) or coins
+        return client
+
+    with patch("crypto_price_tracker.exchange.get_exchange_client", side_effect=slow_client):
+        start = time.perf_counter()
+        merged, source = get_consolidated_coins(top_n=20)
+        elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.35
+    assert source == "Binance + Bitvavo"
+    assert merged[0].prices == {"binance": 50000.0, "bitvavo": 50000.0}
+
+
+def test_consolidated_skips_failed_exchange() -> None:
+    """A failing exchange is left out of the consolidated view."""
+    coins = [CoinData("ETH", "Ethereum", 2000.0, -1.0, 50.0, 1000000.0)]
+    clients = {
+        "bitvavo": _make_mock_client("Bitvavo", [], should_fail=True),
+        "binance": _make_mock_client("Binance", coins),
+    }
+
+    with patch(
+        "crypto_price_tracker.exchange.get_exchange_client",
+        side_effect=lambda exchange, top_n=20: clients[exchange],
+    ):
+        merged, source = get_consolidated_coins(top_n=20)
+
+    assert source == "Binance"
+    assert [c.symbol for c in merged] == ["ETH"]
+
+
+def test_consolidated_raises_if_all_fail() -> None:
+    """When every exchange fails, the first error propagates."""
+    clients = {
+        "bitvavo": _make_mock_client("Bitvavo", [], should_fail=True),
+        "binance": _make_mock_client("Binance", [], should_fail=True),
+    }
+
+    with (
+        patch(
+            "crypto_price_tracker.exchange.get_exchange_client",
+            side_effect=lambda exchange, top_n=20: clients[exchange],
+        ),
+        pytest.raises(httpx.ConnectError),
+    ):
+        get_consolidated_coins(top_n=20)
+
+
+def test_async_consolidated_merges_exchanges() -> None:
+    """The async consolidated fetch gathers both exchanges."""
+    clients = {
+        "bitvavo": _make_async_mock_client("Bitvavo", [CoinData("BTC", "Bitcoin", 50000.0, 1.0, 1.0, 100.0)]),
+        "binance": _make_async_mock_client("Binance", [CoinData("BTC", "BTC", 51000.0, 1.0, 1.0, 100.0)]),
+    }
+
+    with patch(
+        "crypto_price_tracker.exchange.get_async_exchange_client",
+        side_effect=lambda exchange, top_n=20: clients[exchange],
+    ):
+        merged, source = asyncio.run(get_consolidated_coins_async(top_n=20))
+
+    assert source == "Binance + Bitvavo"
+    assert merged[0].price == pytest.approx(50500.0)
@@ -0,0 +1,243 @@
+"""Unit tests for the shared background price feed.
+
+The poll function is injected, so no HTTP calls or database access happen.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import json
+
+import httpx
+
+from crypto_price_tracker.feed import PriceFeed, PriceTick, Subscription
+from crypto_price_tracker.models import CoinData, PriceAlert
+
+
+def make_coins() -> list[CoinData]:
+    return [
+        CoinData("BTC", "Bitcoin", 50000.0, 1.5, 100.0, 5000000.0),
+        CoinData("ETH", "Ethereum", 2000.0, -1.0, 50.0, 1000000.0),
+    ]
+
+
+def make_alert() -> PriceAlert:
+    return PriceAlert(
+        id=1,
+        symbol="BTC",
+        target_price=40000.0,
+        direction="above",
+        status="active",
+        created_at="2026-03-01T10:00:00",
+        triggered_at=None,
+    )
+
+
+def make_tick(seq: int) -> PriceTick:
+    return PriceTick(
+        seq=seq,
+        exchange="bitvavo",
+        source="Bitvavo",
+        coins=make_coins(),
+        triggered_alerts=[],
+        created_at=0.0,
+    )
+
+
+class CountingPoll:
+    """Poll function stub that records every call."""
+
+    def __init__(self, triggered: list[PriceAlert] | None = None) -> None:
+        self.calls: list[tuple[str, int]] = []
+        self.triggered = triggered or []
+
+    async def __call__(self, exchange: str, top_n: int):
+        self.calls.append((exchange, top_n))
+        return make_coins(), exchange.capitalize(), self.triggered
+
+
+def test_tick_frame_is_serialized_once_per_top() -> None:
+    """frame() memoizes the JSON payload for each distinct top value."""
+    tick = make_tick(1)
+
+    first = tick.frame(1)
+    assert tick.frame(1) is first
+    data = json.loads(first)
+    assert [c["symbol"] for c in data["coins"]] == ["BTC"]
+    assert data["exchange"] == "Bitvavo"
+    assert data["triggered_alerts"] == []
+    assert len(json.loads(tick.frame(20))["coins"]) == 2
+
+
+def test_tick_delta_frame_carries_changed_fields() -> None:
+    """delta_frame() sends only changed fields, keyed by symbol, and is memoized."""
+    base = make_tick(1)
+    tick = make_tick(2)
+    tick.coins[1] = dataclasses.replace(tick.coins[1], price=2100.0, change_24h=4.0)
+
+    raw = tick.delta_frame(base, 20)
+    assert tick.delta_frame(base, 20) is raw
+    data = json.loads(raw)
+    assert data["base"] == 1
+    assert data["coins"] == {"ETH": {"price": 2100.0, "change_24h": 4.0}}
+    assert "order" not in data and "removed" not in data
+    assert json.loads(make_tick(3).delta_frame(make_tick(2), 20))["coins"] == {}
+
+
+def test_tick_delta_frame_reports_membership_and_order() -> None:
+    """New coins are sent in full; removals and reordering are listed."""
+    base = make_tick(1)
+    sol = CoinData("SOL", "Solana", 100.0, 3.0, 10.0, 9000000.0)
+    tick = make_tick(2)
+    tick.coins = [sol, tick.coins[0]]
+
+    data = json.loads(tick.delta_frame(base, 20))
+    assert data["coins"] == {"SOL": dataclasses.asdict(sol)}
+    assert data["removed"] == ["ETH"]
+    assert data["order"] == ["SOL", "BTC"]
+
+
+def test_subscription_drops_oldest_when_full() -> None:
+    """A slow consumer keeps only the newest ticks."""
+
+    async def scenario() -> list[int]:
+        sub = Subscription("bitvavo", maxsize=2)
+        for seq in range(1, 6):
+            sub.offer(make_tick(seq))
+        assert sub.dropped == 3
+        return [(await sub.get()).seq, (await sub.get()).seq]
+
+    assert asyncio.run(scenario()) == [4, 5]
+
+
+def test_poll_once_fans_out_single_fetch() -> None:
+    """Many subscribers on one exchange cost one poll per tick."""
+    poll = CountingPoll()
+
+    async def scenario() -> list[PriceTick]:
+        feed = PriceFeed(poll=poll)
+        subs = [feed.subscribe("bitvavo") for _ in range(50)]
+        await feed.poll_once()
+        return [await sub.get() for sub in subs]
+
+    ticks = asyncio.run(scenario())
+
+    assert poll.calls == [("bitvavo", 100)]
+    assert all(t is ticks[0] for t in ticks)
+
+
+def test_poll_once_polls_each_subscribed_exchange() -> None:
+    """Exchanges without subscribers are not polled."""
+    poll = CountingPoll()
+
+    async def scenario() -> None:
+        feed = PriceFeed(poll=poll)
+        feed.subscribe("bitvavo")
+        sub = feed.subscribe("binance")
+        feed.unsubscribe(sub)
+        await feed.poll_once()
+
+    asyncio.run(scenario())
+
+    assert poll.calls == [("bitvavo", 100)]
+
+
+def test_poll_once_skips_failed_fetch(caplog) -> None:
+    """A failed upstream fetch is logged, publishes nothing and does not raise."""
+
+    async def failing_poll(exchange: str, top_n: int):
+        raise httpx.ConnectError("Connection refused")
+
+    async def scenario() -> list[PriceTick]:
+        feed = PriceFeed(poll=failing_poll)
+        feed.subscribe("bitvavo")
+        return await feed.poll_once()
+
+    assert asyncio.run(scenario()) == []
+    assert "Price feed poll for bitvavo failed: Connection refused" in caplog.text
+
+
+def test_poll_error_does_not_stop_feed() -> None:
+    """An unexpected poll error is skipped; the poller keeps delivering ticks."""
+    poll = CountingPoll()
+    calls = 0
+
+    async def flaky_poll(exchange: str, top_n: int):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise RuntimeError("database is locked")
+        return await poll(exchange, top_n)
+
+    async def scenario() -> tuple[PriceTick, bool]:
+        feed = PriceFeed(interval=0.01, poll=flaky_poll)
+        await feed.start()
+        try:
+            sub = feed.subscribe("bitvavo")
+            tick = await asyncio.wait_for(sub.get(), timeout=2.0)
+            return tick, feed.running
+        finally:
+            await feed.stop()
+
+    tick, running = asyncio.run(scenario())
+
+    assert running
+    assert tick.seq == 1
+    assert calls >= 2
+
+
+def test_late_subscriber_gets_latest_tick_without_alerts() -> None:
+    """A new subscriber is primed with the latest tick minus already-announced alerts."""
+    poll = CountingPoll(triggered=[make_alert()])
+
+    async def scenario() -> tuple[PriceTick, PriceTick]:
+        feed = PriceFeed(poll=poll)
+        early = feed.subscribe("bitvavo")
+        await feed.poll_once()
+        late = feed.subscribe("bitvavo")
+        return await early.get(), await late.get()
+
+    early_tick, late_tick = asyncio.run(scenario())
+
+    assert json.loads(early_tick.frame(20))["triggered_alerts"]
+    assert json.loads(late_tick.frame(20))["triggered_alerts"] == []
+    assert len(early_tick.triggered_alerts) == 1
+    assert late_tick.triggered_alerts == []
+    assert late_tick.seq == early_tick.seq
+    assert len(poll.calls) == 1
+
+
+def test_background_task_delivers_ticks() -> None:
+    """start() runs the poller, which wakes up for a new subscriber."""
+    poll = CountingPoll()
+
+    async def scenario() -> PriceTick:
+        feed = PriceFeed(interval=60.0, poll=poll)
+        await feed.start()
+        try:
+            sub = feed.subscribe("bitvavo")
+            return await asyncio.wait_for(sub.get(), timeout=2.0)
+        finally:
+            await feed.stop()
+
+    tick = asyncio.run(scenario())
+
+    assert tick.source == "Bitvavo"
+    assert tick.seq == 1
+
+
+def test_stop_closes_subscriptions() -> None:
+    """Iterating a subscription ends after the feed stops."""
+    poll = CountingPoll()
+
+    async def scenario() -> list[PriceTick]:
+        feed = PriceFeed(poll=poll)
+        sub = feed.subscribe("bitvavo")
+        await feed.poll_once()
+        await feed.stop()
+        return [tick async for tick in sub]
+
+    ticks = asyncio.run(scenario())
+
+    assert [t.seq for t in ticks] == [1]
@@ -0,0 +1,135 @@
+"""Unit tests for the technical indicator engine.
+
+Expected values are computed with straightforward Python loops so the
+vectorized implementations are checked against a plain reference.
+"""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import pytest
+
+from crypto_price_tracker.indicators import (
+    atr,
+    bollinger_bands,
+    compute_indicators,
+    compute_indicators_batch,
+    ema,
+    macd,
+    rsi,
+    sma,
+    volatility,
+    vwap,
+)
+from crypto_price_tracker.models import CandleSeries
+
+
+def make_series(n: int = 60) -> CandleSeries:
+    """Deterministic zig-zag uptrend with varying volume."""
+    rows = []
+    for i in range(n):
+        close = 100.0 + i + (3.0 if i % 2 else -3.0)
+        rows.append([1000 * i, close - 1.0, close + 2.0, close - 2.0, close, 10.0 + i % 5])
+    return CandleSeries.from_rows(rows)
+
+
+def test_sma_matches_window_means() -> None:
+    values = np.arange(1.0, 11.0)
+    result = sma(values, 3)
+
+    assert np.isnan(result[:2]).all()
+    assert result[2:].tolist() == pytest.approx([2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0, 9.0])
+
+
+def test_ema_is_sma_seeded_recurrence() -> None:
+    values = make_series().close
+    result = ema(values, 10)
+
+    expected = values[:10].mean()
+    alpha = 2 / 11
+    for v in values[10:]:
+        expected += alpha * (v - expected)
+    assert np.isnan(result[:9]).all()
+    assert result[-1] == pytest.approx(expected)
+
+
+def test_rsi_bounds_and_monotonic_series() -> None:
+    rising = np.arange(1.0, 31.0)
+    assert rsi(rising, 14)[-1] == 100.0
+    assert np.isnan(rsi(rising, 14)[:14]).all()
+
+    values = rsi(make_series().close, 14)
+    valid = values[~np.isnan(values)]
+    assert ((valid >= 0) & (valid <= 100)).all()
+
+
+def test_macd_histogram_is_line_minus_signal() -> None:
+    line, signal, hist = macd(make_series().close)
+
+    assert np.isnan(signal[:33]).all()
+    assert not np.isnan(signal[33])
+    np.testing.assert_allclose(hist[33:], line[33:] - signal[33:])
+
+
+def test_bollinger_bands_use_population_std() -> None:
+    close = make_series().close
+    upper, middle, lower = bollinger_bands(close, 20, 2.0)
+
+    window = close[-20:]
+    assert middle[-1] == pytest.approx(window.mean())
+    assert upper[-1] - middle[-1] == pytest.approx(2.0 * window.std())
+    assert middle[-1] - lower[-1] == pytest.approx(2.0 * window.std())
+
+
+def test_atr_uses_previous_close_in_true_range() -> None:
+    high = np.array([10.0, 12.0, 11.0])
+    low = np.array([9.0, 11.0, 7.0])
+    close = np.array([9.5, 11.5, 8.0])
+
+    # True ranges: 1.0, 12-9.5=2.5, 11.5-7=4.5
+    result = atr(high, low, close, 2)
+    assert np.isnan(result[0])
+    assert result[1] == pytest.approx(1.75)
+    assert result[2] == pytest.approx(1.75 + 0.5 * (4.5 - 1.75))
+
+
+def test_vwap_is_cumulative_volume_weighted_typical_price() -> None:
+    series = make_series(5)
+    result = vwap(series.high, series.low, series.close, series.volume)
+
+    typical = (series.high + series.low + series.close) / 3
+    expected = (typical * series.volume).sum() / series.volume.sum()
+    assert result[-1] == pytest.approx(expected)
+
+
+def test_volatility_annualizes_by_interval() -> None:
+    close = make_series().close
+    raw = volatility(close, 20)
+    daily = volatility(close, 20, interval="1d")
+
+    returns = np.diff(np.log(close))[-20:]
+    assert raw[-1] == pytest.approx(returns.std(ddof=1))
+    assert daily[-1] == pytest.approx(raw[-1] * math.sqrt(365))
+
+
+def test_compute_indicators_latest_and_short_history() -> None:
+    """Indicators lacking history report None; aligned columns match the candle count."""
+    full = compute_indicators(make_series(), "4h")
+    assert len(full.rsi) == 60
+    assert all(v is not None for v in full.latest().values())
+
+    short = compute_indicators(make_series(5)).latest()
+    assert short["timestamp"] == 4000
+    assert short["rsi"] is None
+    assert short["vwap"] is not None
+
+    assert compute_indicators(CandleSeries.empty()).latest()["close"] is None
+
+
+def test_compute_indicators_batch_keeps_keys() -> None:
+    batch = compute_indicators_batch({("BTC-EUR", "4h"): make_series(), ("ETH-EUR", "4h"): make_series(10)})
+
+    assert set(batch) == {("BTC-EUR", "4h"), ("ETH-EUR", "4h")}
+    assert batch[("ETH-EUR", "4h")].to_dict()["sma"] == [None] * 10
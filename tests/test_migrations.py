@@ -0,0 +1,133 @@
+"""Unit tests for the versioned schema migrations."""
+
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+from crypto_price_tracker import migrations
+
+
+@pytest.fixture
+def conn(tmp_db_path):
+    connection = sqlite3.connect(str(tmp_db_path))
+    yield connection
+    connection.close()
+
+
+def _indexes(conn: sqlite3.Connection) -> set[str]:
+    return {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+
+
+def test_fresh_database_is_migrated_to_latest(conn):
+    assert migrations.get_schema_version(conn) == 0
+
+    assert migrations.migrate(conn) == migrations.SCHEMA_VERSION
+    assert migrations.get_schema_version(conn) == migrations.SCHEMA_VERSION
+    assert {
+        "idx_alerts_status_created",
+        "idx_holdings_symbol_date",
+        "idx_watchlist_added",
+    } <= _indexes(conn)
+
+
+def test_migrate_is_a_no_op_when_up_to_date(conn, monkeypatch):
+    migrations.migrate(conn)
+    monkeypatch.setattr(migrations, "MIGRATIONS", ())  # any re-run would now fail
+
+    assert migrations.migrate(conn) == migrations.SCHEMA_VERSION
+
+
+def test_unversioned_database_is_adopted(conn):
+    """Databases created before versioning keep their rows and gain the indexes."""
+    conn.execute(
+        "CREATE TABLE holdings (id INTEGER PRIMARY KEY AUTOINCREMENT, symbol TEXT NOT NULL, "
+        "amount REAL NOT NULL CHECK(amount > 0), buy_price REAL NOT NULL CHECK(buy_price > 0), "
+        "buy_date TEXT NOT NULL)"
+    )
+    conn.execute("INSERT INTO holdings (symbol, amount, buy_price, buy_date) VALUES ('BTC', 1, 50000, '2026-01-01')")
+    conn.commit()
+
+    migrations.migrate(conn)
+
+    assert conn.execute("SELECT symbol FROM holdings").fetchall() == [("BTC",)]
+    assert "idx_holdings_symbol_date" in _indexes(conn)
+
+
+def test_only_pending_migrations_are_applied(conn, monkeypatch):
+    applied: list[str] = []
+    steps = tuple(
+        (lambda name: lambda c: applied.append(name))(name) for name in ("one", "two", "three")
+    )
+    monkeypatch.setattr(migrations, "MIGRATIONS", steps)
+    monkeypatch.setattr(migrations, "SCHEMA_VERSION", 3)
+    conn.execute("PRAGMA user_version = 1")
+
+    assert migrations.migrate(conn) == 3
+    assert applied == ["two", "three"]
+
+
+def test_failed_migration_rolls_back(conn, monkeypatch):
+    def broken(c: sqlite3.Connection) -> None:
+        c.execute("CREATE TABLE partial (id INTEGER)")
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(migrations, "MIGRATIONS", (broken,))
+    monkeypatch.setattr(migrations, "SCHEMA_VERSION", 1)
+
+    with pytest.raises(RuntimeError):
+        migrations.migrate(conn)
+
+    assert migrations.get_schema_version(conn) == 0
+    assert conn.execute("SELECT name FROM sqlite_master WHERE name = 'partial'").fetchone() is None
+
+
+def test_newer_database_is_left_untouched(conn):
+    conn.execute(f"PRAGMA user_version = {migrations.SCHEMA_VERSION + 1}")
+
+    assert migrations.migrate(conn) == migrations.SCHEMA_VERSION + 1
+    assert conn.execute("SELECT name FROM sqlite_master").fetchall() == []
+
+
+def test_active_alert_query_uses_index(conn):
+    migrations.migrate(conn)
+
+    plan = conn.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM alerts WHERE status = 'active' ORDER BY created_at"
+    ).fetchall()
+
+    details = " ".join(row[-1] for row in plan)
+    assert "idx_alerts_status_created" in details
+    assert "TEMP B-TREE" not in details
+
+
+def test_watchlist_tags_are_backfilled(conn):
+    conn.execute(
+        "CREATE TABLE watchlist (id INTEGER PRIMARY KEY AUTOINCREMENT, symbol TEXT NOT NULL UNIQUE, "
+        "tags TEXT NOT NULL DEFAULT '', added_at TEXT NOT NULL)"
+    )
+    conn.executemany(
+        "INSERT INTO watchlist (symbol, tags, added_at) VALUES (?, ?, 'now')",
+        [("ETH", "DeFi,Layer1"), ("DOGE", "")],
+    )
+    conn.commit()
+
+    migrations.migrate(conn)
+
+    rows = conn.execute("SELECT symbol, tag FROM watchlist_tags ORDER BY symbol, tag").fetchall()
+    assert rows == [("ETH", "DeFi"), ("ETH", "Layer1")]
+
+
+def test_holding_rollups_are_backfilled(conn):
+    migrations.MIGRATIONS[0](conn)
+    conn.executemany(
+        "INSERT INTO holdings (symbol, amount, buy_price, buy_date) VALUES (?, ?, ?, '2026-01-01')",
+        [("BTC", 0.5, 40000.0), ("BTC", 0.5, 50000.0), ("ETH", 2.0, 2000.0)],
+    )
+    conn.commit()
+
+    migrations.migrate(conn)
+
+    rows = conn.execute("SELECT * FROM holding_rollups ORDER BY symbol").fetchall()
+    assert rows == [("BTC", 2, 1.0, 45000.0), ("ETH", 1, 2.0, 4000.0)]
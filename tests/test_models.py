@@ -0,0 +1,76 @@
+"""Unit tests for the columnar CandleSeries and HoldingColumns models."""
+
+from __future__ import annotations
+
+import numpy as np
+
+from crypto_price_tracker.models import Candle, CandleSeries, Holding, HoldingColumns
+
+
+RAW_NEWEST_FIRST = [
+    [3000, "110.0", "120.0", "105.0", "108.0", "45.0"],
+    [2000, "105.0", "115.0", "100.0", "110.0", "60.0"],
+    [1000, "100.0", "110.0", "95.0", "105.0", "50.0"],
+]
+
+
+def test_from_rows_parses_json_arrays_into_columns() -> None:
+    """String prices become float64 columns; reverse=True yields chronological order."""
+    series = CandleSeries.from_rows(RAW_NEWEST_FIRST, reverse=True)
+
+    assert series.timestamp.dtype == np.int64
+    assert series.close.dtype == np.float64
+    assert series.timestamp.tolist() == [1000, 2000, 3000]
+    assert series.close.tolist() == [105.0, 110.0, 108.0]
+    assert all(col.flags["C_CONTIGUOUS"] for col in series.columns())
+
+
+def test_indexing_returns_candles_and_slices_share_buffers() -> None:
+    """Integer indexing builds a Candle; slicing is a view on the same columns."""
+    series = CandleSeries.from_rows(RAW_NEWEST_FIRST, reverse=True)
+
+    assert series[-1] == Candle(3000, 110.0, 120.0, 105.0, 108.0, 45.0)
+    assert isinstance(series[0].timestamp, int)
+    tail = series[1:]
+    assert len(tail) == 2
+    assert np.shares_memory(tail.close, series.close)
+
+
+def test_list_compatibility_round_trip() -> None:
+    """from_candles/to_candles round-trip and iteration yields Candle objects."""
+    candles = [Candle(1000, 1.0, 2.0, 0.5, 1.5, 10.0), Candle(2000, 1.5, 2.5, 1.0, 2.0, 20.0)]
+    series = CandleSeries.from_candles(candles)
+
+    assert series.to_candles() == candles
+    assert list(series) == candles
+    assert CandleSeries.from_candles(series) is series
+
+
+def test_to_records_matches_candle_dict_shape() -> None:
+    """to_records emits plain-Python dicts keyed like dataclasses.asdict(Candle)."""
+    series = CandleSeries.from_candles([Candle(1000, 1.0, 2.0, 0.5, 1.5, 10.0)])
+
+    assert series.to_records() == [
+        {"timestamp": 1000, "open": 1.0, "high": 2.0, "low": 0.5, "close": 1.5, "volume": 10.0}
+    ]
+
+
+def test_empty_series() -> None:
+    """An empty series is falsy and serializes to an empty list."""
+    series = CandleSeries.empty()
+
+    assert len(series) == 0
+    assert not series
+    assert series.to_records() == []
+
+
+def test_holding_columns_factorize_symbols_in_first_seen_order(sample_holdings) -> None:
+    """Symbols map to codes by first appearance; amounts and prices stay per lot."""
+    lots = sample_holdings + [Holding(4, "BTC", 0.1, 40000.0, "2026-03-01")]
+    columns = HoldingColumns.from_holdings(lots)
+
+    assert len(columns) == 4
+    assert columns.symbols == ["BTC", "ETH"]
+    assert columns.codes.tolist() == [0, 0, 1, 0]
+    assert columns.amount.tolist() == [0.5, 0.3, 10.0, 0.1]
+    assert columns.buy_price.dtype == np.float64
@@ -5,16 +5,26 @@ from __future__ import annotations
 import csv
 import io
 import json
+from dataclasses import replace
 
 import pytest
 
-from crypto_price_tracker.models import CoinData, Holding
+from crypto_price_tracker.models import CoinData, Holding, HoldingColumns, HoldingRollup
 from crypto_price_tracker.portfolio import (
     PortfolioRow,
     PortfolioSummary,
+    PortfolioValuation,
     aggregate_portfolio,
+    aggregate_portfolio_columns,
+    aggregate_rollups,
     export_csv,
     export_json,
+    import_holdings,
+    iter_export_csv,
+    iter_export_json,
+    iter_export_ndjson,
+    iter_holding_records,
+    validate_holding_record,
 )
 
 
@@ -113,3 +123,190 @@ def test_summary_totals(sample_holdings, sample_prices):
     assert summary.total_pnl_eur == 15500.0
     expected_pct = (15500.0 / 57500.0) * 100
     assert abs(summary.total_pnl_pct - expected_pct) < 0.01
+
+
+def test_aggregate_columns_matches_aggregate(sample_holdings, sample_prices):
+    doge = Holding(id=4, symbol="DOGE", amount=1000.0, buy_price=0.1, buy_date="2026-01-01")
+    holdings = sample_holdings + [doge]
+
+    expected = aggregate_portfolio(holdings, sample_prices)
+    actual = aggregate_portfolio_columns(HoldingColumns.from_holdings(holdings), sample_prices)
+
+    assert actual == expected
+
+
+def test_aggregate_rollups_matches_aggregate(sample_holdings, sample_prices):
+    rollups = [
+        HoldingRollup("BTC", 2, 0.8, 0.5 * 45000.0 + 0.3 * 50000.0),
+        HoldingRollup("ETH", 1, 10.0, 20000.0),
+    ]
+
+    assert aggregate_rollups(rollups, sample_prices) == aggregate_portfolio(sample_holdings, sample_prices)
+    assert aggregate_rollups([], sample_prices).rows == []
+
+
+def _sample_rollups():
+    return [
+        HoldingRollup("BTC", 2, 0.8, 0.5 * 45000.0 + 0.3 * 50000.0),
+        HoldingRollup("ETH", 1, 10.0, 20000.0),
+        HoldingRollup("DOGE", 1, 1000.0, 100.0),
+    ]
+
+
+def test_valuation_matches_aggregate_rollups(sample_prices):
+    rollups = _sample_rollups()
+
+    assert PortfolioValuation(rollups, sample_prices).summary() == aggregate_rollups(rollups, sample_prices)
+    assert PortfolioValuation(rollups).summary() == aggregate_rollups(rollups, {})
+    assert PortfolioValuation([]).summary().rows == []
+
+
+def test_valuation_updates_only_changed_symbols(sample_prices):
+    rollups = _sample_rollups()
+    valuation = PortfolioValuation(rollups, sample_prices)
+    btc = sample_prices["BTC"]
+    new_prices = {
+        **sample_prices,
+        "BTC": replace(btc, price=62000.0),
+        "DOGE": CoinData("DOGE", "Dogecoin", 0.2, 5.0, 1e6, 2e5),
+        "XRP": CoinData("XRP", "XRP", 0.5, 0.0, 1e6, 5e5),  # not held
+    }
+
+    assert valuation.update_prices(sample_prices) == set()
+    assert valuation.update_prices(new_prices) == {"BTC", "DOGE"}
+    assert valuation.row("BTC").current_value == 49600.0
+    assert valuation.summary() == aggregate_rollups(rollups, new_prices)
+
+
+def test_valuation_summary_rows_are_copies(sample_prices):
+    valuation = PortfolioValuation(_sample_rollups(), sample_prices)
+    summary = valuation.summary()
+    summary.rows[0].current_value = 0.0
+
+    assert valuation.summary().rows[0].current_value == 48000.0
+    assert valuation.row("ETH").allocation_pct is None
+
+
+def test_valuation_delta_reports_rows_that_moved(sample_prices):
+    valuation = PortfolioValuation(_sample_rollups(), sample_prices)
+    snapshot = valuation.snapshot()
+    assert [r.symbol for r in snapshot.rows] == ["BTC", "ETH", "DOGE"]
+
+    btc, eth = sample_prices["BTC"], sample_prices["ETH"]
+    valuation.update_prices({"BTC": replace(btc, price=60010.0), "ETH": replace(eth, price=2600.0)})
+    delta = valuation.delta(threshold=0.001)
+    assert [r.symbol for r in delta.rows] == ["ETH"]  # BTC moved < 0.1%
+    assert delta.total_value == valuation.summary().total_value
+
+    valuation.update_prices({"BTC": replace(btc, price=60100.0)})  # cumulative move > 0.1%
+    valuation.update_prices({"DOGE": CoinData("DOGE", "Dogecoin", 0.2, 5.0, 1e6, 2e5)})
+    assert {r.symbol for r in valuation.delta(threshold=0.001).rows} == {"BTC", "DOGE"}
+    assert valuation.delta().rows == []
+
+
+def test_aggregate_columns_empty(sample_prices):
+    summary = aggregate_portfolio_columns(HoldingColumns.from_holdings([]), sample_prices)
+    assert summary.rows == []
+    assert summary.total_value == 0
+
+
+def test_iter_export_chunks(sample_holdings):
+    csv_chunks = list(iter_export_csv(sample_holdings, chunk_rows=2))
+    json_chunks = list(iter_export_json(sample_holdings, chunk_rows=2))
+    ndjson_chunks = list(iter_export_ndjson(sample_holdings, chunk_rows=2))
+
+    assert len(csv_chunks) == 3  # header + 2 + 1
+    assert "".join(csv_chunks) == export_csv(sample_holdings)
+    assert json.loads("".join(json_chunks)) == json.loads(export_json(sample_holdings))
+    assert len(ndjson_chunks) == 2
+    records = [json.loads(line) for line in "".join(ndjson_chunks).splitlines()]
+    assert [r["id"] for r in records] == [1, 2, 3]
+
+
+def test_iter_export_consumes_holdings_lazily(sample_holdings):
+    consumed: list[int] = []
+
+    def source():
+        for h in sample_holdings:
+            consumed.append(h.id)
+            yield h
+
+    chunks = iter_export_ndjson(source(), chunk_rows=1)
+    next(chunks)
+
+    assert consumed == [1]
+
+
+# ---- Import ----
+
+
+class _SmallReads(io.StringIO):
+    """StringIO that returns at most 7 characters per read, to split JSON objects."""
+
+    def read(self, size=-1):
+        return super().read(7)
+
+
+def test_iter_holding_records_json_array_and_ndjson():
+    array = '[{"symbol": "BTC", "amount": 1}, {"symbol": "ETH", "amount": 2}]'
+    ndjson = '{"symbol": "BTC", "amount": 1}\n{"symbol": "ETH", "amount": 2}\n'
+
+    for text in (array, ndjson):
+        records = list(iter_holding_records(_SmallReads(text), "json"))
+        assert [r["symbol"] for r in records] == ["BTC", "ETH"]
+
+
+def test_iter_holding_records_rejects_malformed_json():
+    with pytest.raises(ValueError, match="malformed JSON"):
+        list(iter_holding_records(io.StringIO('[{"symbol": "BTC"}, {"symbol": '), "json"))
+
+
+def test_validate_holding_record():
+    record = {"id": 9, "symbol": " btc ", "amount": "0.5", "buy_price": 45000, "buy_date": "2026-01-15"}
+    assert validate_holding_record(record) == ("BTC", 0.5, 45000.0, "2026-01-15")
+    assert validate_holding_record({"symbol": "ETH", "amount": 1, "buy_price": 2}, today="2026-03-01")[3] == "2026-03-01"
+
+    for bad, message in [
+        ({"amount": 1, "buy_price": 2}, "missing symbol"),
+        ({"symbol": "BTC", "amount": -1, "buy_price": 2}, "amount must be positive"),
+        ({"symbol": "BTC", "amount": "x", "buy_price": 2}, "amount must be a number"),
+        ({"symbol": "BTC", "amount": 1, "buy_price": 2, "buy_date": "15/01/2026"}, "buy_date"),
+    ]:
+        with pytest.raises(ValueError, match=message):
+            validate_holding_record(bad)
+
+
+def test_import_holdings_batches_and_reports_errors(sample_holdings):
+    text = export_csv(sample_holdings) + "4,DOGE,-5,0.1,2026-01-01\r\n"
+    batches: list[list] = []
+    progress: list[int] = []
+
+    report = import_holdings(
+        io.StringIO(text),
+        "csv",
+        lambda rows: batches.append(rows) or len(rows),
+        batch_size=2,
+        on_progress=lambda r: progress.append(r.rows),
+    )
+
+    assert [len(b) for b in batches] == [2, 1]
+    assert batches[0][0] == ("BTC", 0.5, 45000.0, "2026-01-15")
+    assert progress == [2, 4]
+    assert (report.rows, report.imported, report.failed) == (4, 3, 1)
+    assert report.errors[0].row == 4
+    assert "amount" in report.errors[0].message
+
+
+def test_import_holdings_rejects_non_positive_batch_size():
+    with pytest.raises(ValueError, match="batch_size"):
+        import_holdings(io.StringIO("[]"), "json", lambda rows: len(rows), batch_size=0)
+
+
+def test_import_holdings_keeps_rows_before_unreadable_input():
+    text = '[{"symbol": "BTC", "amount": 1, "buy_price": 2}, {"symbol": '
+
+    report = import_holdings(io.StringIO(text), "json", lambda rows: len(rows))
+
+    assert (report.rows, report.imported, report.failed) == (1, 1, 1)
+    assert report.errors[0].row == 2
+    assert "unreadable input" in report.errors[0].message
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import sqlite3
 from datetime import date
 from pathlib import Path
 
@@ -11,9 +12,13 @@ from crypto_price_tracker.models import Holding
 from crypto_price_tracker.portfolio_db import (
     _get_default_db_path,
     add_holding,
+    add_holdings,
     get_all_holdings,
     get_connection,
+    get_holding_columns,
+    get_holding_rollups,
     get_holdings_by_symbol,
+    iter_holdings,
     remove_holding,
     update_holding,
 )
@@ -132,3 +137,68 @@ def test_xdg_path_default(monkeypatch, tmp_path):
     result = _get_default_db_path()
     assert result == tmp_path / "crypto-tracker" / "portfolio.db"
     assert result.parent.exists()
+
+
+def test_add_holdings_inserts_batch(tmp_db_path):
+    rows = [("BTC", 0.5, 45000.0, "2026-01-15"), ("ETH", 10.0, 2000.0, "2026-01-10")]
+    assert add_holdings(rows, db_path=tmp_db_path) == 2
+    assert [h.symbol for h in get_all_holdings(db_path=tmp_db_path)] == ["BTC", "ETH"]
+
+
+def test_add_holdings_rolls_back_batch_on_constraint_error(tmp_db_path):
+    rows = [("BTC", 0.5, 45000.0, "2026-01-15"), ("ETH", -1.0, 2000.0, "2026-01-10")]
+    with pytest.raises(sqlite3.IntegrityError):
+        add_holdings(rows, db_path=tmp_db_path)
+    assert get_all_holdings(db_path=tmp_db_path) == []
+
+
+def test_iter_holdings_streams_in_order(tmp_db_path):
+    add_holding("ETH", 1.0, 2000.0, "2026-01-10", db_path=tmp_db_path)
+    add_holding("BTC", 0.5, 50000.0, "2026-02-20", db_path=tmp_db_path)
+    add_holding("BTC", 0.3, 45000.0, "2026-01-15", db_path=tmp_db_path)
+
+    holdings = list(iter_holdings(fetch_size=2, db_path=tmp_db_path))
+
+    assert [(h.symbol, h.buy_date) for h in holdings] == [
+        ("BTC", "2026-01-15"),
+        ("BTC", "2026-02-20"),
+        ("ETH", "2026-01-10"),
+    ]
+    assert holdings == get_all_holdings(db_path=tmp_db_path)
+
+
+def test_get_holding_columns(tmp_db_path):
+    add_holding("ETH", 1.0, 2000.0, "2026-01-10", db_path=tmp_db_path)
+    add_holding("BTC", 0.5, 50000.0, "2026-02-20", db_path=tmp_db_path)
+    add_holding("BTC", 0.3, 45000.0, "2026-01-15", db_path=tmp_db_path)
+
+    columns = get_holding_columns(db_path=tmp_db_path)
+
+    assert columns.symbols == ["BTC", "ETH"]
+    assert columns.codes.tolist() == [0, 0, 1]
+    assert columns.amount.tolist() == [0.3, 0.5, 1.0]
+
+
+def test_holding_rollups_follow_lot_changes(tmp_db_path):
+    first = add_holding("BTC", 0.5, 40000.0, "2026-01-15", db_path=tmp_db_path)
+    add_holding("BTC", 0.25, 48000.0, "2026-02-20", db_path=tmp_db_path)
+    eth = add_holding("ETH", 2.0, 2000.0, "2026-01-10", db_path=tmp_db_path)
+    add_holdings([("SOL", 10.0, 100.0, "2026-01-01")], db_path=tmp_db_path)
+
+    rollups = {r.symbol: r for r in get_holding_rollups(db_path=tmp_db_path)}
+    assert (rollups["BTC"].num_lots, rollups["BTC"].total_amount, rollups["BTC"].total_cost) == (2, 0.75, 32000.0)
+    assert list(rollups) == ["BTC", "ETH", "SOL"]
+
+    update_holding(first, amount=1.0, db_path=tmp_db_path)
+    remove_holding(eth, db_path=tmp_db_path)
+
+    rollups = {r.symbol: r for r in get_holding_rollups(db_path=tmp_db_path)}
+    assert (rollups["BTC"].num_lots, rollups["BTC"].total_amount, rollups["BTC"].total_cost) == (2, 1.25, 52000.0)
+    assert "ETH" not in rollups
+
+
+def test_holding_rollups_unchanged_by_date_edit(tmp_db_path):
+    lot = add_holding("BTC", 0.5, 40000.0, "2026-01-15", db_path=tmp_db_path)
+    update_holding(lot, buy_date="2026-01-20", db_path=tmp_db_path)
+
+    assert [(r.num_lots, r.total_cost) for r in get_holding_rollups(db_path=tmp_db_path)] == [(1, 20000.0)]
@@ -0,0 +1,128 @@
+"""Unit tests for the memory-mapped tick history archive."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from unittest.mock import patch
+
+import numpy as np
+
+from crypto_price_tracker.models import CoinData
+from crypto_price_tracker.tick_archive import (
+    archive_root,
+    archived_until,
+    compact,
+    compact_if_due,
+    compact_periodically,
+    get_history,
+    read_archive,
+)
+from crypto_price_tracker.ticks_db import append_ticks, get_tick_buckets
+
+HOUR = 3_600_000
+DAY = 86_400_000
+T0 = 100 * DAY
+
+
+def record_days(db_path, days: int, per_day: int = 4) -> None:
+    """Append *per_day* evenly spaced BTC ticks per day, priced by tick index."""
+    for i in range(days * per_day):
+        coin = CoinData("BTC", "Bitcoin", 1000.0 + i, 0.0, 1.0, 5000.0 + i)
+        append_ticks([coin], "bitvavo", timestamp=T0 + i * (DAY // per_day), db_path=db_path)
+
+
+def test_compact_archives_completed_buckets_only(tmp_db_path):
+    record_days(tmp_db_path, 3)
+
+    written = compact(now=T0 + 2 * DAY + HOUR, db_path=tmp_db_path)
+
+    days = read_archive("BTC", "bitvavo", "1d", db_path=tmp_db_path)
+    assert days.timestamp.tolist() == [T0, T0 + DAY]  # today's bucket is still forming
+    assert (days[0].open, days[0].close) == (1000.0, 1003.0)
+    assert len(read_archive("BTC", "bitvavo", "1h", db_path=tmp_db_path)) == 8
+    assert written == 2 + 8 + 8
+    assert compact(now=T0 + 2 * DAY + HOUR, db_path=tmp_db_path) == 0
+
+
+def test_read_archive_slices_memory_mapped_columns(tmp_db_path):
+    record_days(tmp_db_path, 3)
+    compact(now=T0 + 3 * DAY, db_path=tmp_db_path)
+
+    series = read_archive("BTC", "bitvavo", "1h", start=T0 + DAY, end=T0 + 2 * DAY - 1, db_path=tmp_db_path)
+
+    assert isinstance(series.close, np.memmap)
+    assert series.timestamp.tolist() == [T0 + DAY + k * 6 * HOUR for k in range(4)]
+    assert series.close.tolist() == [1004.0, 1005.0, 1006.0, 1007.0]
+    assert archived_until("BTC", "bitvavo", "1h", db_path=tmp_db_path) == T0 + 2 * DAY + 18 * HOUR
+    assert len(read_archive("ETH", "bitvavo", "1h", db_path=tmp_db_path)) == 0
+
+
+def test_get_history_joins_archive_and_recent_buckets(tmp_db_path):
+    record_days(tmp_db_path, 3)
+    compact(now=T0 + 2 * DAY, db_path=tmp_db_path)
+
+    history = get_history("BTC", "bitvavo", "1h", end=T0 + 3 * DAY, db_path=tmp_db_path)
+    expected = get_tick_buckets("BTC", "bitvavo", "1h", end=T0 + 3 * DAY, limit=None, db_path=tmp_db_path)
+
+    assert history.timestamp.tolist() == expected.timestamp.tolist()
+    assert history.close.tolist() == expected.close.tolist()
+    newest = get_history("BTC", "bitvavo", "1h", end=T0 + 3 * DAY, limit=6, db_path=tmp_db_path)
+    assert newest.timestamp.tolist() == expected.timestamp.tolist()[-6:]
+
+
+def test_compact_trims_torn_columns(tmp_db_path):
+    record_days(tmp_db_path, 2)
+    compact(now=T0 + DAY, db_path=tmp_db_path)
+    close_file = archive_root(tmp_db_path) / "bitvavo" / "BTC" / "1d" / "close.f8"
+    with open(close_file, "ab") as f:
+        f.write(b"\x00" * 8)  # as if a crash left one column longer
+
+    assert len(read_archive("BTC", "bitvavo", "1d", db_path=tmp_db_path)) == 1
+    compact(now=T0 + 2 * DAY, db_path=tmp_db_path)
+    days = read_archive("BTC", "bitvavo", "1d", db_path=tmp_db_path)
+    assert days.close.tolist() == [1003.0, 1007.0]
+
+
+def test_compact_if_due_runs_once_per_day(tmp_db_path):
+    record_days(tmp_db_path, 2)
+
+    assert compact_if_due(now=T0 + DAY, db_path=tmp_db_path) > 0
+    assert compact_if_due(now=T0 + DAY + HOUR, db_path=tmp_db_path) == 0
+    assert compact_if_due(now=T0 + 2 * DAY, db_path=tmp_db_path) > 0
+
+
+def test_compacted_day_survives_a_new_process(tmp_db_path):
+    record_days(tmp_db_path, 2)
+    compact(now=T0 + DAY, db_path=tmp_db_path)
+
+    assert (archive_root(tmp_db_path) / "compacted-day").read_text() == str((T0 + DAY) // DAY)
+    with patch("crypto_price_tracker.tick_archive._compact_locked") as rescan:
+        assert compact_if_due(now=T0 + DAY + HOUR, db_path=tmp_db_path) == 0
+    rescan.assert_not_called()
+
+
+def test_cancelling_compact_periodically_waits_for_running_compaction(tmp_db_path):
+    started, release = threading.Event(), threading.Event()
+    finished: list[bool] = []
+
+    def slow_compaction(**kwargs):
+        started.set()
+        release.wait(5)
+        finished.append(True)
+
+    async def scenario():
+        task = asyncio.create_task(compact_periodically(db_path=tmp_db_path))
+        await asyncio.to_thread(started.wait, 5)
+        task.cancel()
+        await asyncio.sleep(0.05)
+        assert not task.done()  # still waiting for the compaction thread
+        release.set()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        assert finished == [True]
+
+    with patch("crypto_price_tracker.tick_archive.compact_if_due", side_effect=slow_compaction):
+        asyncio.run(scenario())
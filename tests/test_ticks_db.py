@@ -0,0 +1,91 @@
+"""Unit tests for the SQLite price tick history storage layer."""
+
+from __future__ import annotations
+
+from crypto_price_tracker.models import CoinData, Tick
+from crypto_price_tracker.ticks_db import (
+    TICK_RETENTION,
+    append_ticks,
+    get_tick_buckets,
+    get_tick_connection,
+    get_ticks,
+    prune_ticks,
+)
+
+MINUTE = 60_000
+DAY = 86_400_000
+
+
+def make_coins(btc: float, eth: float = 2000.0) -> list[CoinData]:
+    return [
+        CoinData("BTC", "Bitcoin", btc, 1.5, 100.0, 5000000.0),
+        CoinData("ETH", "Ethereum", eth, -1.0, 50.0, 1000000.0),
+    ]
+
+
+def test_tick_schema_created_on_connect(tmp_db_path):
+    conn = get_tick_connection(tmp_db_path)
+    try:
+        names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        assert {"ticks", "tick_buckets"} <= names
+    finally:
+        conn.close()
+
+
+def test_append_and_get_ticks(tmp_db_path):
+    t0 = 100 * DAY
+    for i, price in enumerate([50000.0, 50100.0, 49900.0]):
+        assert append_ticks(make_coins(price), "bitvavo", timestamp=t0 + i * 1000, db_path=tmp_db_path) == 2
+
+    ticks = get_ticks("BTC", "bitvavo", end=t0 + DAY, db_path=tmp_db_path)
+    assert ticks[0] == Tick(t0, "BTC", "bitvavo", 50000.0, 5000000.0, 1.5)
+    assert [t.price for t in ticks] == [50000.0, 50100.0, 49900.0]
+    assert [t.timestamp for t in get_ticks("BTC", "bitvavo", end=t0 + DAY, limit=2, db_path=tmp_db_path)] == [
+        t0 + 1000,
+        t0 + 2000,
+    ]
+    assert get_ticks("BTC", "binance", end=t0 + DAY, db_path=tmp_db_path) == []
+
+
+def test_append_ticks_rolls_up_into_buckets(tmp_db_path):
+    t0 = 100 * DAY
+    for offset, price in [(0, 50000.0), (20_000, 51000.0), (40_000, 49000.0), (MINUTE, 50500.0)]:
+        append_ticks(make_coins(price), "bitvavo", timestamp=t0 + offset, db_path=tmp_db_path)
+
+    minutes = get_tick_buckets("BTC", "bitvavo", "1m", end=t0 + DAY, db_path=tmp_db_path)
+    assert minutes.timestamp.tolist() == [t0, t0 + MINUTE]
+    first = minutes[0]
+    assert (first.open, first.high, first.low, first.close) == (50000.0, 51000.0, 49000.0, 49000.0)
+    assert first.volume == 5000000.0
+
+    days = get_tick_buckets("BTC", "bitvavo", "1d", end=t0 + DAY, db_path=tmp_db_path)
+    assert len(days) == 1
+    assert (days[0].open, days[0].close) == (50000.0, 50500.0)
+
+
+def test_prune_ticks_applies_retention(tmp_db_path):
+    t0 = 100 * DAY
+    append_ticks(make_coins(50000.0), "bitvavo", timestamp=t0, db_path=tmp_db_path)
+
+    now = t0 + TICK_RETENTION["tick"] + DAY
+    assert prune_ticks(now=now, db_path=tmp_db_path) > 0
+    assert get_ticks("BTC", "bitvavo", end=now, db_path=tmp_db_path) == []
+    assert len(get_tick_buckets("BTC", "bitvavo", "1m", end=now, db_path=tmp_db_path)) == 1
+    assert len(get_tick_buckets("BTC", "bitvavo", "1d", end=now, db_path=tmp_db_path)) == 1
+
+
+def test_symbol_range_query_uses_index(tmp_db_path):
+    conn = get_tick_connection(tmp_db_path)
+    try:
+        plan = " ".join(
+            row[3]
+            for row in conn.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM ticks "
+                "WHERE symbol = 'BTC' AND exchange = 'bitvavo' AND timestamp BETWEEN 0 AND 1 "
+                "ORDER BY timestamp DESC"
+            )
+        )
+        assert "idx_ticks_symbol_time" in plan
+        assert "TEMP B-TREE" not in plan
+    finally:
+        conn.close()
@@ -212,3 +212,44 @@ def test_add_watchlist_entry_deduplicates_tags(tmp_db_path):
     add_watchlist_entry("ETH", ["DeFi", "defi", "DeFi"], db_path=tmp_db_path)
     entries = get_all_watchlist_entries(db_path=tmp_db_path)
     assert entries[0].tags == "DeFi"
+
+
+def _tag_rows(db_path) -> list[tuple[str, str]]:
+    conn = get_watchlist_connection(db_path)
+    conn.row_factory = None
+    try:
+        return conn.execute("SELECT symbol, tag FROM watchlist_tags ORDER BY symbol, tag").fetchall()
+    finally:
+        conn.close()
+
+
+def test_update_watchlist_tags_syncs_tag_table(tmp_db_path):
+    add_watchlist_entry("ETH", ["DeFi", "Layer1"], db_path=tmp_db_path)
+    update_watchlist_tags("ETH", ["Layer1", "Layer2"], db_path=tmp_db_path)
+
+    assert _tag_rows(tmp_db_path) == [("ETH", "Layer1"), ("ETH", "Layer2")]
+    assert get_all_watchlist_entries(tag="DeFi", db_path=tmp_db_path) == []
+    assert [e.symbol for e in get_all_watchlist_entries(tag="Layer2", db_path=tmp_db_path)] == ["ETH"]
+
+
+def test_remove_watchlist_entry_removes_tags(tmp_db_path):
+    add_watchlist_entry("ETH", ["DeFi"], db_path=tmp_db_path)
+    add_watchlist_entry("UNI", ["DeFi"], db_path=tmp_db_path)
+    remove_watchlist_entry("ETH", db_path=tmp_db_path)
+
+    assert _tag_rows(tmp_db_path) == [("UNI", "DeFi")]
+
+
+def test_filter_by_tag_uses_tag_index(tmp_db_path):
+    conn = get_watchlist_connection(tmp_db_path)
+    conn.row_factory = None
+    try:
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT w.* FROM watchlist_tags t JOIN watchlist w "
+            "ON w.symbol = t.symbol WHERE t.tag = ? ORDER BY w.added_at",
+            ("DeFi",),
+        ).fetchall()
+    finally:
+        conn.close()
+
+    assert "idx_watchlist_tags_tag" in " ".join(row[-1] for row in plan)
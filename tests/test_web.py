@@ -5,6 +5,9 @@ All tests mock ``get_top_coins_with_fallback`` so no real HTTP calls are made.
 
 from __future__ import annotations
 
+import dataclasses
+import json
+import time
 from unittest.mock import patch
 
 import pytest
@@ -12,7 +15,8 @@ from starlette.testclient import TestClient
 
 import httpx
 
-from crypto_price_tracker.models import Candle, CoinData
+from crypto_price_tracker.feed import PriceTick
+from crypto_price_tracker.models import Candle, CandleSeries, CoinData, ConsolidatedCoin
 from crypto_price_tracker.web import create_app
 
 
@@ -263,6 +267,57 @@ def test_api_portfolio_add_validation(client, portfolio_db):
     assert response.status_code == 422
 
 
+def test_api_portfolio_bulk_csv(client, portfolio_db):
+    """POST /api/portfolio/bulk imports CSV rows and reports invalid ones."""
+    body = "symbol,amount,buy_price,buy_date\nBTC,0.5,45000,2026-01-15\nETH,0,2000,2026-01-10\n"
+    response = client.post("/api/portfolio/bulk", content=body, headers={"Content-Type": "text/csv"})
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["rows"], data["imported"], data["failed"]) == (2, 1, 1)
+    assert data["errors"][0]["row"] == 2
+
+    lots = client.get("/api/portfolio/lots/BTC").json()
+    assert lots[0]["amount"] == 0.5
+
+
+def test_api_portfolio_bulk_ndjson(client, portfolio_db):
+    """POST /api/portfolio/bulk?format=json accepts newline-delimited objects."""
+    body = '{"symbol": "ETH", "amount": 2, "buy_price": 2000}\n{"symbol": "ETH", "amount": 1, "buy_price": 2100}\n'
+    response = client.post("/api/portfolio/bulk?format=json", content=body)
+    assert response.status_code == 200
+    assert response.json()["imported"] == 2
+
+
+def test_api_portfolio_bulk_batch_size(client, portfolio_db):
+    """POST /api/portfolio/bulk?batch_size= must be at least 1."""
+    body = '{"symbol": "ETH", "amount": 2, "buy_price": 2000}\n'
+    assert client.post("/api/portfolio/bulk?format=json&batch_size=0", content=body).status_code == 422
+    response = client.post("/api/portfolio/bulk?format=json&batch_size=1", content=body)
+    assert response.json()["imported"] == 1
+
+
+def test_api_portfolio_export_formats(client, portfolio_db):
+    """GET /api/portfolio/export streams holdings in each format."""
+    client.post("/api/portfolio", json={"symbol": "BTC", "amount": 0.5, "buy_price": 45000.0, "buy_date": "2026-01-15"})
+
+    response = client.get("/api/portfolio/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert 'filename="portfolio.csv"' in response.headers["content-disposition"]
+    assert response.text.splitlines()[1] == "1,BTC,0.5,45000.0,2026-01-15"
+
+    response = client.get("/api/portfolio/export?format=json")
+    assert response.json() == [
+        {"id": 1, "symbol": "BTC", "amount": 0.5, "buy_price": 45000.0, "buy_date": "2026-01-15"}
+    ]
+
+    response = client.get("/api/portfolio/export?format=ndjson")
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert response.text.count("\n") == 1
+
+    assert client.get("/api/portfolio/export?format=xml").status_code == 422
+
+
 def test_index_spa_catch_all(client):
     """GET /portfolio returns the React SPA (catch-all route for client-side routing)."""
     response = client.get("/portfolio")
@@ -401,13 +456,13 @@ def test_index_spa_alerts_route(client):
 # ---- Candle/Chart API tests ----
 
 
-def make_test_candles() -> list[Candle]:
-    """Return a small list of Candle objects for testing."""
-    return [
+def make_test_candles() -> CandleSeries:
+    """Return a small CandleSeries for testing."""
+    return CandleSeries.from_candles([
         Candle(timestamp=1000, open=100.0, high=110.0, low=95.0, close=105.0, volume=50.0),
         Candle(timestamp=2000, open=105.0, high=115.0, low=100.0, close=110.0, volume=60.0),
         Candle(timestamp=3000, open=110.0, high=120.0, low=105.0, close=108.0, volume=45.0),
-    ]
+    ])
 
 
 def test_api_candles_returns_json_list(client):
@@ -463,13 +518,91 @@ def test_api_candles_invalid_interval(client):
 
 def test_api_candles_empty_response(client):
     """GET /api/candles/BTC returns empty list when no candles available."""
-    with patch("crypto_price_tracker.web.get_candles", return_value=[]):
+    with patch("crypto_price_tracker.web.get_candles", return_value=CandleSeries.empty()):
         response = client.get("/api/candles/BTC")
 
     assert response.status_code == 200
     assert response.json() == []
 
 
+def make_indicator_candles(n: int = 40) -> CandleSeries:
+    return CandleSeries.from_rows(
+        [[1000 * i, 100.0 + i, 101.0 + i, 99.0 + i, 100.5 + i, 10.0] for i in range(n)]
+    )
+
+
+def test_api_indicators_returns_latest_values(client):
+    """GET /api/indicators/btc returns the newest value of each indicator."""
+    with patch("crypto_price_tracker.web.get_candles", return_value=make_indicator_candles()) as mock_fn:
+        response = client.get("/api/indicators/btc?interval=1d&limit=40")
+
+    assert response.status_code == 200
+    mock_fn.assert_called_once_with("BTC-EUR", interval="1d", limit=40)
+    data = response.json()
+    assert data["symbol"] == "BTC"
+    assert data["interval"] == "1d"
+    assert data["candles"] == 40
+    assert data["latest"]["close"] == 139.5
+    assert data["latest"]["rsi"] == 100.0
+    assert "series" not in data
+
+
+def test_api_indicators_series_param_includes_columns(client):
+    """GET /api/indicators/BTC?series=true adds aligned columns with nulls for warm-up."""
+    with patch("crypto_price_tracker.web.get_candles", return_value=make_indicator_candles()):
+        response = client.get("/api/indicators/BTC?series=true")
+
+    series = response.json()["series"]
+    assert len(series["sma"]) == 40
+    assert series["sma"][0] is None
+    assert series["timestamp"][-1] == 39000
+
+
+def test_api_indicators_invalid_market(client):
+    """GET /api/indicators/INVALID returns 404 when Bitvavo returns 400."""
+    mock_request = httpx.Request("GET", "https://api.bitvavo.com/v2/INVALID-EUR/candles")
+    mock_response = httpx.Response(400, request=mock_request)
+    with patch("crypto_price_tracker.web.get_candles") as mock_fn:
+        mock_fn.side_effect = httpx.HTTPStatusError("Bad Request", request=mock_request, response=mock_response)
+        response = client.get("/api/indicators/INVALID")
+
+    assert response.status_code == 404
+
+
+def test_api_history_serves_recorded_ticks(client, portfolio_db, mock_coins):
+    """GET /api/history/{symbol} reads the local tick store, not upstream."""
+    from crypto_price_tracker.ticks_db import append_ticks
+
+    append_ticks(mock_coins, "bitvavo", timestamp=1_200_000)
+    append_ticks(mock_coins[:1], "bitvavo", timestamp=1_230_000)
+
+    ticks = client.get("/api/history/btc?interval=tick").json()
+    assert [t["timestamp"] for t in ticks] == [1_200_000, 1_230_000]
+    assert ticks[0]["price"] == 56754.0
+
+    buckets = client.get("/api/history/BTC?interval=1m&start=0").json()
+    assert len(buckets) == 1
+    assert set(buckets[0]) == {"timestamp", "open", "high", "low", "close", "volume_eur_24h"}
+    assert client.get("/api/history/BTC?interval=5m").status_code == 422
+
+
+def test_api_metrics_reports_breaker_state(client):
+    """GET /api/metrics exposes per-exchange stats and breaker transitions."""
+    from crypto_price_tracker.exchange import exchange_health
+
+    exchange_health.record("binance", 0.2, ok=True)
+    for _ in range(exchange_health.failure_threshold):
+        exchange_health.record("bitvavo", 0.1, ok=False)
+
+    data = client.get("/api/metrics").json()["exchanges"]
+    assert data["binance"]["fetches"] == 1
+    assert data["binance"]["ewma_latency"] == 0.2
+    assert data["binance"]["breaker"]["state"] == "closed"
+    bitvavo = data["bitvavo"]["breaker"]
+    assert bitvavo["state"] == "open"
+    assert [(t["from"], t["to"]) for t in bitvavo["transitions"]] == [("closed", "open")]
+
+
 def test_index_serves_static_assets(client):
     """GET /assets/* serves Vite-built static files (JS/CSS chunks)."""
     # The SPA catch-all should serve static files that exist in the build output
@@ -492,6 +625,24 @@ def test_api_prices_with_exchange_param(client, portfolio_db, mock_coins):
     assert data["exchange"] == "Binance"
 
 
+def test_api_prices_all_exchanges(client, portfolio_db):
+    """GET /api/prices?exchange=all returns the consolidated view."""
+    merged = [ConsolidatedCoin("BTC", "Bitcoin", 50250.0, 1.0, 2.0, 200.0, {"binance": 50500.0, "bitvavo": 50000.0}, 1.0)]
+    with (
+        patch("crypto_price_tracker.web.get_consolidated_coins", return_value=(merged, "Binance + Bitvavo")) as mock_fn,
+        patch("crypto_price_tracker.web.get_top_coins_with_fallback") as single,
+    ):
+        response = client.get("/api/prices?exchange=all&top=5")
+
+    assert response.status_code == 200
+    mock_fn.assert_called_once_with(top_n=5)
+    single.assert_not_called()
+    data = response.json()
+    assert data["exchange"] == "Binance + Bitvavo"
+    assert data["coins"][0]["prices"] == {"binance": 50500.0, "bitvavo": 50000.0}
+    assert data["coins"][0]["spread_pct"] == 1.0
+
+
 def test_api_prices_default_exchange(client, portfolio_db, mock_coins):
     """GET /api/prices without exchange param uses default (bitvavo)."""
     with patch("crypto_price_tracker.web.get_top_coins_with_fallback", return_value=(mock_coins, "Bitvavo")) as mock_fn:
@@ -710,6 +861,24 @@ def test_api_export_pdf_with_portfolio_data(client, portfolio_db, mock_coins):
     assert len(response.content) > 200  # Should be larger with data
 
 
+def test_api_export_pdf_summarizes_rollups(client, portfolio_db, mock_coins):
+    """The PDF report's portfolio comes from the per-symbol rollups, not the lots."""
+    for amount in (0.5, 0.25):
+        client.post("/api/portfolio", json={"symbol": "BTC", "amount": amount, "buy_price": 40000.0})
+
+    with (
+        patch("crypto_price_tracker.web.get_top_coins_with_fallback", return_value=(mock_coins, "Bitvavo")),
+        patch("crypto_price_tracker.portfolio_db.get_all_holdings", side_effect=AssertionError("lots read")),
+        patch("crypto_price_tracker.report.generate_report_html", return_value="<html></html>") as mock_html,
+    ):
+        response = client.get("/api/export/pdf")
+
+    assert response.status_code == 200
+    portfolio = mock_html.call_args[0][0]
+    assert [(r.symbol, r.num_lots, r.total_amount) for r in portfolio.rows] == [("BTC", 2, 0.75)]
+    assert portfolio.total_cost == pytest.approx(30000.0)
+
+
 def test_api_export_pdf_with_empty_portfolio(client, portfolio_db):
     """GET /api/export/pdf with no data should still return a valid PDF."""
     with patch("crypto_price_tracker.web.get_top_coins_with_fallback", return_value=([], "Bitvavo")):
@@ -778,3 +947,141 @@ def test_index_html_contains_theme_color(client):
     assert response.status_code == 200
     content = response.text
     assert "theme-color" in content
+
+
+# ---- SSE stream tests ----
+
+
+class StubFeed:
+    """Price feed stand-in whose subscriptions replay a finite tick sequence.
+
+    *ticks* may contain callables, which run (e.g. to add a holding) when
+    the stream reaches them.
+    """
+
+    def __init__(self, ticks):
+        self.ticks = ticks
+        self.subscribed: list[str] = []
+
+    def subscribe(self, exchange):
+        self.subscribed.append(exchange)
+        return self._replay()
+
+    async def _replay(self):
+        for item in self.ticks:
+            if callable(item):
+                item()
+            else:
+                yield item
+
+    def unsubscribe(self, subscription):
+        pass
+
+
+def _tick(seq: int, coins: list[CoinData]) -> PriceTick:
+    return PriceTick(seq, "bitvavo", "Bitvavo", coins, [], time.monotonic())
+
+
+def _sse_events(text: str) -> list[dict]:
+    """Parse an SSE body into ``{"event", "id", "data"}`` dicts."""
+    events = []
+    for block in text.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if ": " in line)
+        if "data" in fields:
+            events.append({"event": fields.get("event"), "id": fields.get("id"), "data": json.loads(fields["data"])})
+    return events
+
+
+def test_prices_stream_sends_keyframes_and_deltas(mock_coins):
+    """In delta mode, keyframes open the stream and recur every FEED_KEYFRAME_EVERY events."""
+    ticks = [
+        _tick(seq, [dataclasses.replace(mock_coins[0], price=50000.0 + seq), *mock_coins[1:]])
+        for seq in range(1, 8)
+    ]
+    client = TestClient(create_app(price_feed=StubFeed(ticks)))
+
+    with patch("crypto_price_tracker.web.FEED_KEYFRAME_EVERY", 3):
+        events = _sse_events(client.get("/api/prices/stream?delta=true").text)
+
+    assert [e["event"] for e in events] == ["prices", "delta", "delta", "prices", "delta", "delta", "prices"]
+    assert [e["id"] for e in events] == [str(seq) for seq in range(1, 8)]
+    for previous, event in zip(events, events[1:]):
+        if event["event"] == "delta":
+            assert event["data"]["base"] == int(previous["id"])
+            assert event["data"]["coins"] == {"BTC": {"price": 50000.0 + int(event["id"])}}
+    assert len(events[0]["data"]["coins"]) == 3
+
+
+def test_prices_stream_without_delta_sends_only_prices(mock_coins):
+    """Without delta=true every event is a full prices frame."""
+    ticks = [_tick(seq, mock_coins) for seq in range(1, 5)]
+    client = TestClient(create_app(price_feed=StubFeed(ticks)))
+
+    events = _sse_events(client.get("/api/prices/stream?top=2").text)
+
+    assert [e["event"] for e in events] == ["prices"] * 4
+    assert all([c["symbol"] for c in e["data"]["coins"]] == ["BTC", "ETH"] for e in events)
+
+
+def _add_holding(symbol: str, amount: float, buy_price: float):
+    from crypto_price_tracker.portfolio_db import add_holding
+
+    return lambda: add_holding(symbol, amount, buy_price, "2026-01-15")
+
+
+def test_portfolio_stream_snapshot_then_deltas(portfolio_db, mock_coins):
+    """The stream opens with a snapshot, sends only moved rows, and re-snapshots on new holdings."""
+    btc, eth, xrp = mock_coins
+    ticks = [
+        _add_holding("BTC", 0.5, 45000.0),
+        _add_holding("ETH", 2.0, 2000.0),
+        _tick(1, mock_coins),
+        _tick(2, [dataclasses.replace(btc, price=btc.price * 1.01), eth, xrp]),
+        _tick(3, [dataclasses.replace(btc, price=btc.price * 1.01), eth, xrp]),  # nothing moved
+        _add_holding("XRP", 100.0, 0.5),
+        _tick(4, [dataclasses.replace(btc, price=btc.price * 1.01), eth, xrp]),
+    ]
+    client = TestClient(create_app(price_feed=StubFeed(ticks)))
+
+    events = _sse_events(client.get("/api/portfolio/stream").text)
+
+    assert [(e["event"], e["id"]) for e in events] == [("snapshot", "1"), ("delta", "2"), ("snapshot", "4")]
+    assert [r["symbol"] for r in events[0]["data"]["rows"]] == ["BTC", "ETH"]
+    delta = events[1]["data"]
+    assert [r["symbol"] for r in delta["rows"]] == ["BTC"]
+    assert delta["total_value"] == pytest.approx(0.5 * btc.price * 1.01 + 2.0 * eth.price)
+    assert sorted(r["symbol"] for r in events[2]["data"]["rows"]) == ["BTC", "ETH", "XRP"]
+
+
+def test_portfolio_stream_reconnect_starts_with_snapshot(portfolio_db, mock_coins):
+    """A reconnect carrying Last-Event-ID still starts with a full snapshot."""
+    ticks = [_add_holding("BTC", 0.5, 45000.0), _tick(7, mock_coins)]
+    client = TestClient(create_app(price_feed=StubFeed(ticks)))
+
+    events = _sse_events(client.get("/api/portfolio/stream", headers={"Last-Event-ID": "6"}).text)
+
+    assert [(e["event"], e["id"]) for e in events] == [("snapshot", "7")]
+    assert events[0]["data"]["rows"][0]["symbol"] == "BTC"
+
+
+def test_portfolio_stream_reads_rollups_once_per_tick(portfolio_db, mock_coins):
+    """Concurrent portfolio streams share one rollup read per tick."""
+    import asyncio
+
+    from crypto_price_tracker.portfolio_db import get_holding_rollups
+
+    ticks = [_tick(1, mock_coins), _tick(2, mock_coins)]
+    app = create_app(price_feed=StubFeed(ticks))
+    stream = next(r for r in app.routes if getattr(r, "path", None) == "/api/portfolio/stream").endpoint
+
+    async def consume():
+        return [event async for event in stream(exchange="bitvavo")]
+
+    async def scenario():
+        return await asyncio.gather(*(consume() for _ in range(5)))
+
+    with patch("crypto_price_tracker.web.db_get_holding_rollups", wraps=get_holding_rollups) as reads:
+        results = asyncio.run(scenario())
+
+    assert reads.call_count == 2
+    assert all(len(events) == 1 for events in results)